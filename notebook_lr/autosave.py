@@ -0,0 +1,69 @@
+"""Debounced notebook saving shared by the web and MCP servers."""
+
+import threading
+from typing import Callable, Optional
+
+
+class DebouncedSaver:
+    """
+    Run a write callback now, or once after a burst of save requests.
+
+    Immediate, debounced and flushed writes all run under ``lock``, so two
+    writes of the same file never overlap. Callers that write the file some
+    other way (e.g. an explicit save with session state) should hold it too.
+    """
+
+    def __init__(self, write: Callable[[], None]):
+        """
+        Initialize the saver.
+
+        Args:
+            write: Callback that writes the notebook to disk
+        """
+        self._write = write
+        self.lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether a debounced write is scheduled but has not run yet."""
+        return self._timer is not None
+
+    def request(self, delay: float) -> None:
+        """
+        Ask for a write.
+
+        Args:
+            delay: Seconds to wait after the last request before writing;
+                0 or less writes immediately
+        """
+        if delay <= 0:
+            self.write()
+            return
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def write(self) -> None:
+        """Write now, without touching a scheduled write."""
+        with self.lock:
+            self._write()
+
+    def flush(self) -> None:
+        """Run a scheduled write now, if one is pending."""
+        with self.lock:
+            timer, self._timer = self._timer, None
+            if timer is None:
+                return
+            timer.cancel()
+            self._write()
+
+    def cancel(self) -> None:
+        """Drop a scheduled write, e.g. when the in-memory notebook is replaced."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
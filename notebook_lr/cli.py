@@ -2,36 +2,160 @@
 CLI interface for notebook-lr with Rich TUI.
 """
 
+import re
+import reprlib
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import click
-from rich.console import Console
+from rich.console import Console, RenderableType
 from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.markdown import Markdown
-from rich.table import Table
 from rich.prompt import Prompt, Confirm
 from rich.text import Text
 from rich.rule import Rule
-from rich.status import Status
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
-from notebook_lr import NotebookKernel, Notebook, Cell, CellType, SessionManager
+from notebook_lr import NotebookKernel, ExecutionResult, Notebook, Cell, CellType, SessionManager
 from notebook_lr.file_watcher import FileWatcher
-from notebook_lr.utils import format_output, format_rich_output, get_cell_type_icon, get_cell_status
+
+# Heavier Rich renderables (rich.syntax pulls in Pygments, rich.markdown pulls
+# in markdown-it) and notebook_lr.utils are imported inside the functions that
+# need them, so short-lived commands like `new` and `--help` skip them.
 
 
 console = Console()
 
 
+@lru_cache(maxsize=512)
+def _render_syntax(source: str, theme: str = "monokai"):
+    """Build the Syntax renderable for a code cell, memoized by source."""
+    from notebook_lr.utils import make_syntax
+
+    return make_syntax(source, theme=theme, line_numbers=True, word_wrap=True)
+
+
+@lru_cache(maxsize=512)
+def _render_markdown(source: str):
+    """Build the Markdown renderable for a markdown cell, memoized by source."""
+    from rich.markdown import Markdown
+
+    return Markdown(source)
+
+
+# Bounded repr for the variables table: large containers and strings are
+# abbreviated while being formatted instead of after a full repr().
+_short_repr = reprlib.Repr()
+_short_repr.maxstring = 60
+_short_repr.maxother = 60
+_short_repr.maxlist = _short_repr.maxtuple = _short_repr.maxset = 4
+_short_repr.maxdict = 4
+
+# Only the tail of long text outputs is shown in the editor.
+_OUTPUT_MAX_LINES = 200
+
+
+def _tail_text(text: str) -> str:
+    """Keep the last _OUTPUT_MAX_LINES lines of text behind a truncation banner."""
+    lines = text.splitlines()
+    if len(lines) <= _OUTPUT_MAX_LINES:
+        return text
+    hidden = len(lines) - _OUTPUT_MAX_LINES
+    return f"... {hidden} lines truncated ...\n" + "\n".join(lines[-_OUTPUT_MAX_LINES:])
+
+
+def _tail_output(output: dict) -> dict:
+    """Return a copy of a text output cut down for display in the editor."""
+    if output.get("type") == "stream":
+        return {**output, "text": _tail_text(output.get("text", ""))}
+    data = output.get("data")
+    if output.get("type") in ("execute_result", "display_data") and data and list(data) == ["text/plain"]:
+        return {**output, "data": {"text/plain": _tail_text(data["text/plain"])}}
+    return output
+
+
+def _build_output_panel(output: dict, execution_count: Optional[int]) -> Panel:
+    """Build the Panel shown under a code cell for one output."""
+    from notebook_lr.utils import format_rich_output
+
+    rich_output = format_rich_output(_tail_output(output))
+    if output.get("type") == "error":
+        return Panel(
+            rich_output,
+            title="[red]Error[/red]",
+            title_align="left",
+            border_style="red",
+            padding=(0, 1),
+        )
+    out_label = f"Out [{execution_count or ''}]"
+    return Panel(
+        rich_output,
+        title=f"[blue]{out_label}[/blue]",
+        title_align="left",
+        border_style="blue",
+        padding=(0, 1),
+    )
+
+
+def _source_summary(source: str, width: int = 80) -> str:
+    """Return the first non-blank line of a cell, shortened to one log line."""
+    lines = [line for line in source.splitlines() if line.strip()]
+    first = lines[0] if lines else ""
+    if len(first) > width or len(lines) > 1:
+        return first[:width] + "..."
+    return first
+
+
+def _build_run_summary(rows: list[tuple[int, ExecutionResult, float]]):
+    """Build a summary table for a batch of executed cells.
+
+    Args:
+        rows: (cell index, execution result, elapsed milliseconds) per cell
+
+    Returns:
+        Rich Table with one row per executed cell
+    """
+    from rich.table import Table
+
+    table = Table(title="Execution summary", border_style="dim")
+    table.add_column("Cell", justify="right", style="cyan")
+    table.add_column("Status")
+    table.add_column("Time (ms)", justify="right")
+    for row in rows:
+        _add_run_summary_row(table, *row)
+    return table
+
+
+def _add_run_summary_row(table, index: int, result: ExecutionResult, elapsed_ms: float) -> None:
+    """Append one executed cell to a table from _build_run_summary."""
+    status = "[green]ok[/green]" if result.success else f"[red]{result.error or 'error'}[/red]"
+    table.add_row(str(index), status, f"{elapsed_ms:.1f}")
+
+
 class NotebookEditor:
     """Interactive notebook editor with Rich TUI."""
 
-    def __init__(self, notebook: Notebook, kernel: Optional[NotebookKernel] = None):
+    def __init__(
+        self,
+        notebook: Notebook,
+        kernel: Optional[NotebookKernel] = None,
+        simple_editor: bool = False,
+        delta_checkpoints: bool = False,
+    ):
         self.notebook = notebook
         self.kernel = kernel or NotebookKernel()
+        # Number of executed cells shown in the header; kept up to date by
+        # _set_exec_count and the insert/remove paths instead of rescanning.
+        self._executed_count = self._count_executed()
+        self.simple_editor = simple_editor
+        # Incremental checkpoints only rewrite changed variables, but objects
+        # shared through nested references are not shared after a restore,
+        # so the full checkpoint stays the default.
+        self.delta_checkpoints = delta_checkpoints
+        # Notebook and checkpoint writes are independent, so they run side by side
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notebook-lr-io")
         self.session_manager = SessionManager()
         self.current_cell_index = 0
         self.running = True
@@ -39,6 +163,27 @@ class NotebookEditor:
         self._deleted_cells: list[tuple[int, Cell]] = []
         self._status_message = ""
         self.file_watcher: Optional[FileWatcher] = None
+        # id(cell) -> (render key, rendered lines); see _cell_render_key
+        self._cell_lines: dict[int, tuple[tuple, list]] = {}
+        self._render_width = 0
+        self._first_visible = 0
+        # id(output) -> (output, execution_count, panel); the stored output is
+        # compared by identity so a recycled id never returns a stale panel.
+        self._output_cache: dict[int, tuple[dict, Optional[int], Panel]] = {}
+        self._bindings = self._build_bindings()
+        # The command bar never changes, so it is built once and its lines are
+        # rendered again only when the terminal width changes.
+        self._command_bar = self._build_command_bar()
+        self._command_bar_lines: Optional[list] = None
+
+    def _count_executed(self) -> int:
+        """Count cells with an execution count by scanning the notebook."""
+        return sum(1 for c in self.notebook.cells if c.execution_count is not None)
+
+    def _set_exec_count(self, cell: Cell, execution_count: Optional[int]) -> None:
+        """Set a cell's execution count and keep _executed_count in step."""
+        self._executed_count += (execution_count is not None) - (cell.execution_count is not None)
+        cell.execution_count = execution_count
 
     def _set_message(self, message: str):
         """Set a status message to display on next render."""
@@ -54,7 +199,11 @@ class NotebookEditor:
         if not path_obj.exists():
             return
         
-        self.file_watcher = FileWatcher(path_obj, poll_interval=1.0)
+        # Editors and formatters often write a file several times in a row;
+        # report the first write at once and batch the rest of the burst.
+        self.file_watcher = FileWatcher(
+            path_obj, poll_interval=0.25, debounce=0.2, max_wait=1.0, leading=True
+        )
         self.file_watcher.start()
 
     def _stop_file_watcher(self) -> None:
@@ -118,6 +267,8 @@ class NotebookEditor:
             
             # Update editor state
             self.notebook = new_notebook
+            self._executed_count = self._count_executed()
+            self._output_cache.clear()
             
             # Adjust current cell index if needed
             if self.current_cell_index >= len(self.notebook.cells):
@@ -163,8 +314,8 @@ class NotebookEditor:
         
         return True
 
-    def display_header(self):
-        """Display the header with notebook info."""
+    def _build_header(self):
+        """Build the header panel with notebook info."""
         name = self.notebook.metadata.get("name", "Untitled")
 
         parts = []
@@ -178,143 +329,254 @@ class NotebookEditor:
         else:
             parts.append("[dim]No cells[/dim]")
 
-        executed = sum(1 for c in self.notebook.cells if c.execution_count is not None)
+        executed = self._executed_count
         if executed > 0:
             parts.append(f"[dim]{executed} executed[/dim]")
 
         header_text = "  |  ".join(parts)
-        console.print(Panel(
+        return Panel(
             header_text,
             title="[bold blue]notebook-lr[/bold blue]",
             border_style="blue",
             padding=(0, 1),
-        ))
+        )
 
-    def display_cells(self):
-        """Display all cells with current cell highlighted."""
-        console.clear()
-        self.display_header()
+    def display_header(self):
+        """Display the header with notebook info."""
+        console.print(self._build_header())
 
-        if self._status_message:
-            console.print(f"  {self._status_message}")
-            self._status_message = ""
+    def _cell_content(self, cell: Cell) -> RenderableType:
+        """Return the source renderable for a cell.
 
-        if not self.notebook.cells:
-            console.print()
-            console.print(Panel(
-                "[bold]Welcome to notebook-lr![/bold]\n\n"
-                "This notebook is empty. Get started:\n"
-                "  • Press [bold cyan]a[/bold cyan] to add a code cell\n"
-                "  • Press [bold cyan]b[/bold cyan] to add a cell before\n"
-                "  • Press [bold cyan]m[/bold cyan] to toggle code/markdown\n"
-                "  • Press [bold cyan]h[/bold cyan] for all shortcuts\n\n"
-                "[dim]Tip: Variables persist across cell executions.[/dim]",
-                border_style="cyan",
-                title="[bold blue]Getting Started[/bold blue]",
-            ))
-            return
+        Syntax/Markdown renderables come from module-level caches keyed by
+        source, so an edited cell simply misses the cache.
+        """
+        if not cell.source.strip():
+            return Text("(empty)", style="dim italic")
+        try:
+            if cell.type == CellType.CODE:
+                return _render_syntax(cell.source)
+            return _render_markdown(cell.source)
+        except Exception:
+            return cell.source
 
-        console.print()
-        for i, cell in enumerate(self.notebook.cells):
-            is_current = i == self.current_cell_index
+    def _build_cell(self, index: int, cell: Cell):
+        """Build the renderable for one cell and its outputs."""
+        from rich.console import Group
+        from notebook_lr.utils import get_cell_status, get_cell_type_icon
 
-            status_char, status_style = get_cell_status(cell)
-            type_icon = get_cell_type_icon(cell.type)
+        is_current = index == self.current_cell_index
 
-            # Build cell title
-            cursor = " > " if is_current else "   "
+        status_char, status_style = get_cell_status(cell)
+        type_icon = get_cell_type_icon(cell.type)
 
-            if cell.type == CellType.CODE:
-                exec_num = cell.execution_count or " "
-                title_label = f"In [{exec_num}]"
-            else:
-                title_label = "Markdown"
-
-            # Styling based on state
-            if is_current:
-                border_style = "bright_green"
-                title_style = "bold bright_green"
-            elif status_char == "err":
-                border_style = "red"
-                title_style = "red"
-            elif status_char == "ok":
-                border_style = "dim green"
-                title_style = "dim green"
-            else:
-                border_style = "dim"
-                title_style = "dim"
-
-            # Status indicator
-            if status_char == "ok":
-                subtitle = "[green]ok[/green]"
-            elif status_char == "err":
-                subtitle = "[red]err[/red]"
+        # Build cell title
+        cursor = " > " if is_current else "   "
+
+        if cell.type == CellType.CODE:
+            exec_num = cell.execution_count or " "
+            title_label = f"In [{exec_num}]"
+        else:
+            title_label = "Markdown"
+
+        # Styling based on state
+        if is_current:
+            border_style = "bright_green"
+            title_style = "bold bright_green"
+        elif status_char == "err":
+            border_style = "red"
+            title_style = "red"
+        elif status_char == "ok":
+            border_style = "dim green"
+            title_style = "dim green"
+        else:
+            border_style = "dim"
+            title_style = "dim"
+
+        # Status indicator
+        if status_char == "ok":
+            subtitle = "[green]ok[/green]"
+        elif status_char == "err":
+            subtitle = "[red]err[/red]"
+        else:
+            subtitle = None
+
+        content = self._cell_content(cell)
+
+        full_title = f"[{title_style}]{cursor}{type_icon}  {title_label}[/{title_style}]"
+
+        renderables = [Panel(
+            content,
+            title=full_title,
+            title_align="left",
+            subtitle=subtitle,
+            subtitle_align="right",
+            border_style=border_style,
+            padding=(0, 1),
+        )]
+
+        # Display outputs for code cells
+        if cell.type == CellType.CODE and cell.outputs:
+            for output in cell.outputs:
+                renderables.append(self._output_panel(output, cell.execution_count))
+
+        return Group(*renderables)
+
+    def _output_panel(self, output: dict, execution_count: Optional[int]) -> Panel:
+        """Return the Panel for one cell output, reusing it while unchanged."""
+        cached = self._output_cache.get(id(output))
+        if cached is not None and cached[0] is output and cached[1] == execution_count:
+            return cached[2]
+        panel = _build_output_panel(output, execution_count)
+        self._output_cache[id(output)] = (output, execution_count, panel)
+        return panel
+
+    def _cell_render_key(self, index: int, cell: Cell) -> tuple:
+        """Everything a cell's rendering depends on; a changed key means re-render."""
+        return (
+            cell.type,
+            cell.source,
+            cell.execution_count,
+            tuple(id(output) for output in cell.outputs),
+            index == self.current_cell_index,
+        )
+
+    def _render_cell_lines(self, index: int, options) -> list:
+        """Return the rendered lines for a cell, re-rendering only when its key changed."""
+        cell = self.notebook.cells[index]
+        key = self._cell_render_key(index, cell)
+        cached = self._cell_lines.get(id(cell))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        lines = console.render_lines(self._build_cell(index, cell), options)
+        self._cell_lines[id(cell)] = (key, lines)
+        return lines
+
+    def _build_welcome(self):
+        """Build the panel shown for an empty notebook."""
+        return Panel(
+            "[bold]Welcome to notebook-lr![/bold]\n\n"
+            "This notebook is empty. Get started:\n"
+            "  • Press [bold cyan]a[/bold cyan] to add a code cell\n"
+            "  • Press [bold cyan]b[/bold cyan] to add a cell before\n"
+            "  • Press [bold cyan]m[/bold cyan] to toggle code/markdown\n"
+            "  • Press [bold cyan]h[/bold cyan] for all shortcuts\n\n"
+            "[dim]Tip: Variables persist across cell executions.[/dim]",
+            border_style="cyan",
+            title="[bold blue]Getting Started[/bold blue]",
+        )
+
+    def _visible_cell_lines(self, area: int, options) -> list:
+        """Render only the cells that fit in ``area`` rows around the cursor.
+
+        The window starts at the first visible cell of the previous redraw and
+        scrolls just far enough to keep the current cell on screen, so cells
+        outside the viewport are never rendered. Dim marker rows report how
+        many cells are hidden above and below.
+        """
+        from rich.segment import Segment
+
+        cells = self.notebook.cells
+        cur = self.current_cell_index
+        # Every cell panel is at least 3 rows tall, so no more than area // 3
+        # cells above the cursor can be on screen.
+        first = min(max(self._first_visible, cur - area // 3), cur)
+
+        # Scroll down until the current cell fits between the marker rows.
+        heights = [len(self._render_cell_lines(i, options)) for i in range(first, cur + 1)]
+        below = 1 if cur < len(cells) - 1 else 0
+        while first < cur and sum(heights) + (1 if first > 0 else 0) + below > area:
+            heights.pop(0)
+            first += 1
+        self._first_visible = first
+
+        def marker(text: str) -> list:
+            return console.render_lines(Text(f"  ... {text}", style="dim"), options)[0]
+
+        lines = [marker(f"{first} cells above")] if first > 0 else []
+        ends = []
+        for i in range(first, len(cells)):
+            if len(lines) >= area:
+                break
+            lines.extend(self._render_cell_lines(i, options))
+            ends.append(len(lines))
+
+        if len(lines) > area or first + len(ends) < len(cells):
+            # Reserve the last row for the "below" marker; a cell cut off by
+            # the viewport edge counts as hidden.
+            cut = max(area - 1, 1 if first > 0 else 0)
+            shown = sum(1 for end in ends if end <= cut)
+            hidden = len(cells) - first - shown
+            if hidden and cut < area:
+                lines = lines[:cut] + [marker(f"{hidden} more cells below")]
             else:
-                subtitle = None
+                lines = lines[:area]
 
-            # Cell content
-            if cell.type == CellType.CODE:
-                if cell.source.strip():
-                    try:
-                        content = Syntax(
-                            cell.source,
-                            "python",
-                            theme="monokai",
-                            line_numbers=True,
-                            word_wrap=True,
-                        )
-                    except Exception:
-                        content = cell.source
-                else:
-                    content = Text("(empty)", style="dim italic")
+        return lines + [[Segment(" " * options.max_width)]] * (area - len(lines))
+
+    def display_cells(self):
+        """Display cells with current cell highlighted.
+
+        Cells are rendered to lines once and cached; a redraw only re-renders
+        cells whose render key changed (see ``_cell_render_key``). On a
+        terminal in alternate-screen mode (see ``run``) the frame is painted
+        in place with ``update_screen_lines`` instead of clearing the screen,
+        and only the cells inside the viewport around the current cell are
+        rendered. Otherwise every cell is printed after a ``console.clear()``.
+        """
+        from rich.control import Control
+        from rich.segment import Segment, Segments
+
+        width, height = console.size
+        options = console.options.update_width(width)
+        if width != self._render_width:
+            self._cell_lines.clear()
+            self._command_bar_lines = None
+            self._render_width = width
+        elif len(self._cell_lines) > len(self.notebook.cells):
+            # Forget renders of cells that were deleted or replaced by a reload
+            live = {id(cell) for cell in self.notebook.cells}
+            self._cell_lines = {k: v for k, v in self._cell_lines.items() if k in live}
+
+        top_lines = console.render_lines(self._build_header(), options)
+        if self._status_message:
+            top_lines += console.render_lines(Text.from_markup(f"  {self._status_message}"), options)
+            self._status_message = ""
+        blank = [Segment(" " * width)]
+        top_lines.append(blank)
+
+        if self._command_bar_lines is None:
+            self._command_bar_lines = console.render_lines(self._command_bar, options)
+        bottom_lines = [blank] + self._command_bar_lines
+
+        if not console.is_alt_screen:
+            if self.notebook.cells:
+                cell_lines = []
+                for i in range(len(self.notebook.cells)):
+                    cell_lines.extend(self._render_cell_lines(i, options))
             else:
-                if cell.source.strip():
-                    try:
-                        content = Markdown(cell.source)
-                    except Exception:
-                        content = cell.source
-                else:
-                    content = Text("(empty)", style="dim italic")
-
-            full_title = f"[{title_style}]{cursor}{type_icon}  {title_label}[/{title_style}]"
-
-            panel = Panel(
-                content,
-                title=full_title,
-                title_align="left",
-                subtitle=subtitle,
-                subtitle_align="right",
-                border_style=border_style,
-                padding=(0, 1),
-            )
-            console.print(panel)
-
-            # Display outputs for code cells
-            if cell.type == CellType.CODE and cell.outputs:
-                for output in cell.outputs:
-                    rich_output = format_rich_output(output)
-                    if output.get("type") == "error":
-                        console.print(Panel(
-                            rich_output,
-                            title="[red]Error[/red]",
-                            title_align="left",
-                            border_style="red",
-                            padding=(0, 1),
-                        ))
-                    else:
-                        out_label = f"Out [{cell.execution_count or ''}]"
-                        console.print(Panel(
-                            rich_output,
-                            title=f"[blue]{out_label}[/blue]",
-                            title_align="left",
-                            border_style="blue",
-                            padding=(0, 1),
-                        ))
+                cell_lines = console.render_lines(self._build_welcome(), options)
+            console.clear()
+            frame = top_lines + cell_lines + bottom_lines
+            console.print(Segments(
+                [segment for line in frame for segment in (*line, Segment.line())]
+            ))
+            return
 
-    def display_command_bar(self):
-        """Display compact command bar at bottom."""
-        console.print()
-        console.print(Rule(style="dim"))
+        # Leave the last row free for the key prompt.
+        area = max(1, height - len(top_lines) - len(bottom_lines) - 1)
+        if self.notebook.cells:
+            window = self._visible_cell_lines(area, options)
+        else:
+            window = console.render_lines(self._build_welcome(), options)[:area]
+            window += [blank] * (area - len(window))
+
+        console.update_screen_lines(top_lines + window + bottom_lines + [blank])
+        console.control(Control.move_to(0, len(top_lines) + area + len(bottom_lines)))
+
+    def _build_command_bar(self):
+        """Build the compact command bar."""
+        from rich.console import Group
 
         commands = [
             ("Enter", "Edit"),
@@ -333,23 +595,75 @@ class NotebookEditor:
             ("q", "Quit"),
         ]
 
-        bar = Text()
+        bar = Text(justify="center")
         for i, (key, action) in enumerate(commands):
             if i > 0:
                 bar.append("  ", style="dim")
             bar.append(key, style="bold cyan")
             bar.append(f":{action}", style="dim")
 
-        console.print(bar, justify="center")
-        console.print(Rule(style="dim"))
+        return Group(Rule(style="dim"), bar, Rule(style="dim"))
+
+    def display_command_bar(self):
+        """Display compact command bar at bottom."""
+        console.print()
+        console.print(self._command_bar)
 
     def edit_current_cell(self):
-        """Open editor for current cell."""
+        """Open editor for current cell.
+
+        The cell source is handed to $EDITOR via click.edit(); the line-by-line
+        prompt is used instead when the editor was started with simple_editor.
+        """
         if not self.notebook.cells:
             self._set_message("[yellow]No cells to edit[/yellow]")
             return
 
         cell = self.notebook.get_cell(self.current_cell_index)
+
+        if self.simple_editor:
+            new_source = self._prompt_cell_source(cell)
+        else:
+            extension = ".py" if cell.type == CellType.CODE else ".md"
+            # Editors like vim leave the alternate screen when they quit, so
+            # hand them the normal screen and re-enter ours afterwards;
+            # display_cells repaints the whole frame on the next loop.
+            alt_screen = console.is_alt_screen
+            if alt_screen:
+                console.set_alt_screen(False)
+            try:
+                new_source = click.edit(text=cell.source, extension=extension, require_save=True)
+            except click.ClickException as e:
+                self._set_message(f"[red]Editor failed: {e.format_message()}[/red]")
+                return
+            finally:
+                if alt_screen:
+                    console.set_alt_screen(True)
+                    console.clear()
+            if new_source is not None:
+                new_source = new_source.rstrip("\n")
+
+        if new_source is None:
+            self._set_message("[yellow]Edit cancelled[/yellow]")
+            return
+
+        if new_source != cell.source:
+            cell.source = new_source
+            cell.outputs = []
+            self._set_exec_count(cell, None)
+            self.modified = True
+            self._set_message("[green]Cell updated[/green]")
+        else:
+            self._set_message("[dim]No changes[/dim]")
+
+    def _prompt_cell_source(self, cell: Cell) -> Optional[str]:
+        """Read new cell source line by line from the console.
+
+        Returns:
+            The new source, or None if the edit was cancelled
+        """
+        from notebook_lr.utils import get_cell_type_icon
+
         type_icon = get_cell_type_icon(cell.type)
 
         console.print()
@@ -359,13 +673,9 @@ class NotebookEditor:
         if cell.source.strip():
             console.print("[dim]Current content:[/dim]")
             if cell.type == CellType.CODE:
-                console.print(Syntax(
-                    cell.source, "python",
-                    theme="monokai",
-                    line_numbers=True,
-                ))
+                console.print(_render_syntax(cell.source))
             else:
-                console.print(Panel(Markdown(cell.source), border_style="dim"))
+                console.print(Panel(_render_markdown(cell.source), border_style="dim"))
             console.print()
 
         console.print("[dim]Enter new content (empty line to finish, 'cancel' to abort):[/dim]")
@@ -377,26 +687,15 @@ class NotebookEditor:
                 prompt_str = f"[green]{line_num:>3}[/green] | "
                 line = console.input(prompt_str)
                 if line.strip() == "cancel":
-                    self._set_message("[yellow]Edit cancelled[/yellow]")
-                    return
+                    return None
                 if line == "" and lines:
                     break
                 lines.append(line)
                 line_num += 1
             except KeyboardInterrupt:
-                self._set_message("[yellow]Edit cancelled[/yellow]")
-                return
+                return None
 
-        if lines:
-            new_source = "\n".join(lines)
-            if new_source != cell.source:
-                cell.source = new_source
-                cell.outputs = []
-                cell.execution_count = None
-                self.modified = True
-                self._set_message("[green]Cell updated[/green]")
-            else:
-                self._set_message("[dim]No changes[/dim]")
+        return "\n".join(lines)
 
     def execute_current_cell(self):
         """Execute the current cell."""
@@ -414,24 +713,36 @@ class NotebookEditor:
             self._set_message("[yellow]Cell is empty[/yellow]")
             return
 
+        from rich.status import Status
+
         with Status(
             f"[bold]Executing cell {self.current_cell_index}...[/bold]",
             console=console,
             spinner="dots",
         ):
-            result = self.kernel.execute_cell(cell.source)
+            result = self._execute_cell_silent(cell)
 
-        cell.outputs = result.outputs
-        cell.execution_count = result.execution_count
         self.modified = True
+        self._output_cache.clear()
 
         if result.success:
             self._set_message(f"[green]Cell {self.current_cell_index} executed[/green]")
         else:
             self._set_message(f"[red]Error in cell {self.current_cell_index}: {result.error}[/red]")
 
+    def _execute_cell_silent(self, cell: Cell) -> ExecutionResult:
+        """Execute a cell and store its outputs without touching the display."""
+        result = self.kernel.execute_cell(cell.source)
+        cell.outputs = result.outputs
+        self._set_exec_count(cell, result.execution_count)
+        return result
+
     def execute_all_cells(self):
-        """Execute all cells in sequence with progress."""
+        """Execute all cells in sequence, filling in one live summary table.
+
+        Rows are appended as cells finish and a single Live region repaints
+        them at most 10 times a second; execution stops at the first error.
+        """
         code_cells = [
             (i, c) for i, c in enumerate(self.notebook.cells)
             if c.type == CellType.CODE and c.source.strip()
@@ -441,35 +752,32 @@ class NotebookEditor:
             self._set_message("[yellow]No code cells to execute[/yellow]")
             return
 
-        console.print()
-        success_count = 0
-        error_count = 0
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TextColumn("{task.completed}/{task.total}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Executing cells...", total=len(code_cells))
+        from rich.console import Group
+        from rich.live import Live
+        from rich.spinner import Spinner
+
+        rows: list[tuple[int, ExecutionResult, float]] = []
+        table = _build_run_summary(rows)
+        spinner = Spinner("dots", text=f"Executing {len(code_cells)} cells...", style="bold")
 
+        console.print()
+        with Live(Group(spinner, table), console=console, refresh_per_second=10) as live:
             for i, cell in code_cells:
-                progress.update(task, description=f"Cell {i}...")
-                result = self.kernel.execute_cell(cell.source)
-                cell.outputs = result.outputs
-                cell.execution_count = result.execution_count
-
-                if result.success:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    progress.update(task, advance=1)
+                spinner.update(text=f"Cell {i}...")
+                start = time.perf_counter()
+                result = self._execute_cell_silent(cell)
+                rows.append((i, result, (time.perf_counter() - start) * 1000))
+                _add_run_summary_row(table, *rows[-1])
+                if not result.success:
                     break
-
-                progress.update(task, advance=1)
+            # Leave only the finished table on screen
+            live.update(table)
 
         self.modified = True
+        self._output_cache.clear()
+
+        success_count = sum(1 for _, result, _ in rows if result.success)
+        error_count = len(rows) - success_count
 
         if error_count > 0:
             self._set_message(
@@ -505,6 +813,7 @@ class NotebookEditor:
 
         if Confirm.ask(f"Delete cell {self.current_cell_index}?"):
             cell = self.notebook.remove_cell(self.current_cell_index)
+            self._executed_count -= cell.execution_count is not None
             self._deleted_cells.append((self.current_cell_index, cell))
             if self.current_cell_index >= len(self.notebook.cells):
                 self.current_cell_index = max(0, len(self.notebook.cells) - 1)
@@ -520,6 +829,7 @@ class NotebookEditor:
         index, cell = self._deleted_cells.pop()
         index = min(index, len(self.notebook.cells))
         self.notebook.insert_cell(index, cell)
+        self._executed_count += cell.execution_count is not None
         self.current_cell_index = index
         self.modified = True
         self._set_message("[green]Cell restored[/green]")
@@ -575,12 +885,14 @@ class NotebookEditor:
         """Clear all cell outputs."""
         cleared = 0
         for cell in self.notebook.cells:
+            # Clean cells are left alone rather than given a fresh empty list
             if cell.outputs or cell.execution_count is not None:
                 cleared += 1
-            cell.outputs = []
-            cell.execution_count = None
+                cell.outputs = []
+                self._set_exec_count(cell, None)
         if cleared:
             self.modified = True
+            self._output_cache.clear()
             self._set_message(f"[green]Cleared outputs from {cleared} cells[/green]")
         else:
             self._set_message("[dim]No outputs to clear[/dim]")
@@ -600,7 +912,7 @@ class NotebookEditor:
         cell = self.notebook.get_cell(self.current_cell_index)
         cell.type = CellType.MARKDOWN if cell.type == CellType.CODE else CellType.CODE
         cell.outputs = []
-        cell.execution_count = None
+        self._set_exec_count(cell, None)
         self.modified = True
         self._set_message(f"[green]Cell type: {cell.type.value}[/green]")
 
@@ -617,8 +929,23 @@ class NotebookEditor:
                 "user_ns": self.kernel.get_namespace(),
                 "execution_count": self.kernel.execution_count,
             }
-            self.notebook.save(path, include_session=True, session_data=session_data)
-            self.session_manager.save_checkpoint(self.kernel, path)
+            from rich.status import Status
+
+            with Status("[bold]Saving...[/bold]", console=console, spinner="dots"):
+                futures = [
+                    self._io_pool.submit(
+                        self.notebook.save, path,
+                        include_session=True, session_data=session_data,
+                    ),
+                    self._io_pool.submit(
+                        self.session_manager.save_delta_checkpoint
+                        if self.delta_checkpoints
+                        else self.session_manager.save_checkpoint,
+                        self.kernel, path,
+                    ),
+                ]
+                for future in futures:
+                    future.result()
         else:
             self.notebook.save(path)
 
@@ -638,6 +965,8 @@ class NotebookEditor:
             self._set_message("[yellow]No saved sessions found[/yellow]")
             return
 
+        from rich.table import Table
+
         console.print()
         table = Table(title="Saved Sessions", border_style="blue")
         table.add_column("#", style="bold cyan", justify="right")
@@ -676,13 +1005,15 @@ class NotebookEditor:
 
     def show_variables(self):
         """Show current variables in namespace."""
-        variables = self.kernel.get_defined_names()
+        variables = self.kernel.get_namespace()
 
         if not variables:
             console.print("\n[yellow]No variables defined[/yellow]")
             console.input("\n[dim]Press Enter to continue...[/dim]")
             return
 
+        from rich.table import Table
+
         console.print()
         table = Table(
             title="Namespace Variables",
@@ -693,13 +1024,10 @@ class NotebookEditor:
         table.add_column("Type", style="yellow")
         table.add_column("Value", max_width=60, overflow="ellipsis")
 
-        for name in sorted(variables):
-            value = self.kernel.get_variable(name)
+        for name, value in sorted(variables.items()):
             var_type = type(value).__name__
             try:
-                var_str = repr(value)
-                if len(var_str) > 60:
-                    var_str = var_str[:57] + "..."
+                var_str = _short_repr.repr(value)
             except Exception:
                 var_str = "<unable to repr>"
             table.add_row(name, var_type, var_str)
@@ -707,6 +1035,11 @@ class NotebookEditor:
         console.print(table)
         console.input("\n[dim]Press Enter to continue...[/dim]")
 
+    def _find_matches(self, term: str) -> list[int]:
+        """Return indices of cells whose source contains term, ignoring case."""
+        pattern = re.compile(re.escape(term), re.IGNORECASE)
+        return [i for i, cell in enumerate(self.notebook.cells) if pattern.search(cell.source)]
+
     def search_cells(self):
         """Search cells by content."""
         console.print()
@@ -714,10 +1047,7 @@ class NotebookEditor:
         if not term:
             return
 
-        matches = []
-        for i, cell in enumerate(self.notebook.cells):
-            if term.lower() in cell.source.lower():
-                matches.append(i)
+        matches = self._find_matches(term)
 
         if not matches:
             self._set_message(f"[yellow]No matches for '{term}'[/yellow]")
@@ -743,6 +1073,8 @@ class NotebookEditor:
 
     def show_help(self):
         """Show detailed help."""
+        from rich.table import Table
+
         console.print()
 
         help_sections = [
@@ -804,6 +1136,64 @@ class NotebookEditor:
         console.print()
         console.input("[dim]Press Enter to continue...[/dim]")
 
+    def quit(self):
+        """Stop the editor, offering to save unsaved changes."""
+        if self.modified:
+            if Confirm.ask("Save before quitting?"):
+                self.save_notebook()
+        self.running = False
+
+    def select_next_cell(self):
+        """Move the cursor to the next cell."""
+        if self.notebook.cells and self.current_cell_index < len(self.notebook.cells) - 1:
+            self.current_cell_index += 1
+
+    def select_previous_cell(self):
+        """Move the cursor to the previous cell."""
+        if self.current_cell_index > 0:
+            self.current_cell_index -= 1
+
+    def select_first_cell(self):
+        """Move the cursor to the first cell."""
+        self.current_cell_index = 0
+
+    def select_last_cell(self):
+        """Move the cursor to the last cell."""
+        if self.notebook.cells:
+            self.current_cell_index = len(self.notebook.cells) - 1
+
+    def _build_bindings(self) -> dict[str, Callable[[], None]]:
+        """Map each key typed at the prompt to its handler."""
+        return {
+            "q": self.quit,
+            "h": self.show_help,
+            "": self.edit_current_cell,
+            "enter": self.edit_current_cell,
+            "e": self.execute_current_cell,
+            "E": self.execute_all_cells,
+            "a": self.add_cell_after,
+            "b": self.add_cell_before,
+            "d": self.delete_current_cell,
+            "u": self.undo_delete,
+            "m": self.toggle_cell_type,
+            "c": self.duplicate_cell,
+            "s": self.save_notebook,
+            "S": lambda: self.save_notebook(include_session=True),
+            "l": self.load_session,
+            "?": self.show_variables,
+            "/": self.search_cells,
+            "x": self.clear_outputs,
+            "X": self.clear_kernel,
+            "j": self.select_next_cell,
+            "down": self.select_next_cell,
+            "k": self.select_previous_cell,
+            "up": self.select_previous_cell,
+            "g": self.select_first_cell,
+            "G": self.select_last_cell,
+            "J": self.move_cell_down,
+            "K": self.move_cell_up,
+        }
+
     def run(self):
         """Run the interactive editor."""
         # Check for saved session
@@ -822,104 +1212,30 @@ class NotebookEditor:
         self._start_file_watcher()
 
         try:
-            while self.running:
-                # Check for external changes before display
-                self._handle_external_changes()
-
-                self.display_cells()
-                self.display_command_bar()
-
-                try:
-                    key = console.input("\n[bold cyan]> [/bold cyan]").strip()
-                except (KeyboardInterrupt, EOFError):
-                    key = "q"
-
-                if key == "q":
-                    if self.modified:
-                        if Confirm.ask("Save before quitting?"):
-                            self.save_notebook()
-                    self.running = False
-
-                elif key == "h":
-                    self.show_help()
-
-                elif key == "" or key == "enter":
-                    self.edit_current_cell()
-
-                elif key == "e":
-                    self.execute_current_cell()
-
-                elif key == "E":
-                    self.execute_all_cells()
-
-                elif key == "a":
-                    self.add_cell_after()
-
-                elif key == "b":
-                    self.add_cell_before()
-
-                elif key == "d":
-                    self.delete_current_cell()
-
-                elif key == "u":
-                    self.undo_delete()
+            with console.screen(hide_cursor=False):
+                while self.running:
+                    # Check for external changes before display
+                    self._handle_external_changes()
 
-                elif key == "m":
-                    self.toggle_cell_type()
+                    self.display_cells()
 
-                elif key == "c":
-                    self.duplicate_cell()
-
-                elif key == "s":
-                    self.save_notebook()
-
-                elif key == "S":
-                    self.save_notebook(include_session=True)
-
-                elif key == "l":
-                    self.load_session()
-
-                elif key == "?":
-                    self.show_variables()
-
-                elif key == "/":
-                    self.search_cells()
-
-                elif key == "x":
-                    self.clear_outputs()
-
-                elif key == "X":
-                    self.clear_kernel()
-
-                elif key in ("j", "down"):
-                    if self.notebook.cells and self.current_cell_index < len(self.notebook.cells) - 1:
-                        self.current_cell_index += 1
-
-                elif key in ("k", "up"):
-                    if self.current_cell_index > 0:
-                        self.current_cell_index -= 1
-
-                elif key == "g":
-                    self.current_cell_index = 0
-
-                elif key == "G":
-                    if self.notebook.cells:
-                        self.current_cell_index = len(self.notebook.cells) - 1
-
-                elif key == "J":
-                    self.move_cell_down()
-
-                elif key == "K":
-                    self.move_cell_up()
+                    try:
+                        key = console.input("[bold cyan]> [/bold cyan]").strip()
+                    except (KeyboardInterrupt, EOFError):
+                        key = "q"
 
-                else:
-                    self._set_message(f"[dim]Unknown command: '{key}' (press 'h' for help)[/dim]")
+                    handler = self._bindings.get(key)
+                    if handler is not None:
+                        handler()
+                    else:
+                        self._set_message(f"[dim]Unknown command: '{key}' (press 'h' for help)[/dim]")
 
             console.print("\n[green]Goodbye![/green]")
 
         finally:
             # Stop file watcher on exit
             self._stop_file_watcher()
+            self._io_pool.shutdown(wait=True)
 
 
 @click.group()
@@ -960,20 +1276,39 @@ def new(path: str, name: str):
 
 @main.command()
 @click.argument("path", type=click.Path(exists=True))
-def edit(path: str):
+@click.option(
+    "--simple-editor", is_flag=True,
+    help="Edit cells with the built-in line prompt instead of $EDITOR",
+)
+@click.option(
+    "--delta-checkpoints", is_flag=True,
+    help="Save sessions incrementally, rewriting only changed variables",
+)
+def edit(path: str, simple_editor: bool, delta_checkpoints: bool):
     """Edit a notebook with the interactive TUI."""
     nb = Notebook.load(Path(path))
     nb.metadata["path"] = path
 
-    editor = NotebookEditor(nb)
+    editor = NotebookEditor(
+        nb, simple_editor=simple_editor, delta_checkpoints=delta_checkpoints
+    )
     editor.run()
 
 
 @main.command()
 @click.argument("path", type=click.Path(exists=True))
 @click.option("--save-session", "-s", is_flag=True, help="Save session state after execution")
-def run(path: str, save_session: bool):
+@click.option(
+    "--fail-fast/--no-fail-fast", default=True,
+    help="Stop at the first cell that raises (default) or keep going",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Print each cell's full, highlighted source")
+def run(path: str, save_session: bool, fail_fast: bool, verbose: bool):
     """Run a notebook non-interactively."""
+    from rich.markup import escape
+    from rich.status import Status
+    from notebook_lr.utils import format_rich_output, make_syntax
+
     nb = Notebook.load(Path(path))
     kernel = NotebookKernel()
 
@@ -994,29 +1329,37 @@ def run(path: str, save_session: bool):
         console.print("[yellow]No code cells to execute[/yellow]")
         return
 
-    success_count = 0
+    rows: list[tuple[int, ExecutionResult, float]] = []
     for cell_idx, cell in code_cells:
-        console.print(f"[dim]--- Cell {cell_idx} ---[/dim]")
-        console.print(Syntax(cell.source, "python", theme="monokai", line_numbers=True))
+        if verbose:
+            console.print(f"[dim]--- Cell {cell_idx} ---[/dim]")
+            console.print(make_syntax(cell.source, line_numbers=True))
+        else:
+            console.print(f"[dim]Cell {cell_idx}:[/dim] {escape(_source_summary(cell.source))}")
 
+        start = time.perf_counter()
         with Status("Executing...", console=console, spinner="dots"):
             result = kernel.execute_cell(cell.source)
+        rows.append((cell_idx, result, (time.perf_counter() - start) * 1000))
 
         cell.outputs = result.outputs
         cell.execution_count = result.execution_count
 
         if result.success:
-            success_count += 1
             for output in result.outputs:
                 rich_out = format_rich_output(output)
                 if output.get("type") != "error":
                     console.print(rich_out)
         else:
             console.print(f"[red]Error: {result.error}[/red]")
-            break
+            if fail_fast:
+                break
 
         console.print()
 
+    success_count = sum(1 for _, result, _ in rows if result.success)
+    console.print(_build_run_summary(rows))
+
     if save_session:
         session_manager = SessionManager()
         session_manager.save_checkpoint(kernel, Path(path))
@@ -1034,6 +1377,8 @@ def run(path: str, save_session: bool):
 @main.command()
 def sessions():
     """List saved sessions."""
+    from rich.table import Table
+
     sm = SessionManager()
     sessions_list = sm.list_sessions()
 
@@ -5,88 +5,306 @@ import os
 import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional
+
+# watchdog event types that can mean the file's contents changed. Opens and
+# read-only closes are ignored so the watcher's own reads do not wake it.
+_CHANGE_EVENTS = frozenset({"modified", "created", "moved", "deleted", "closed"})
+
+
+# Watched files are hashed in fixed-size blocks so a same-size change is
+# usually found without reading the rest of the file.
+_BLOCK_SIZE = 1 << 20
+
+
+def _iter_block_hashes(f) -> Iterator[bytes]:
+    """Yield the SHA-256 digest of each _BLOCK_SIZE block of an open binary file."""
+    buf = bytearray(_BLOCK_SIZE)
+    view = memoryview(buf)
+    while n := f.readinto(buf):
+        yield hashlib.sha256(view[:n]).digest()
+
+
+class _ObserverRegistry:
+    """One watchdog Observer shared by every FileWatcher in the process.
+
+    Each watched directory is scheduled once, however many files in it are
+    watched, and events are dispatched to the subscribers of the file they
+    touch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._observer = None
+        self._watches: dict[str, object] = {}
+        self._subscribers: dict[str, list[Callable[[], None]]] = {}
+
+    def subscribe(self, target: str, callback: Callable[[], None]) -> bool:
+        """Call callback on events for target. Returns False if unavailable."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        directory = os.path.dirname(target)
+        with self._lock:
+            if directory not in self._watches:
+                if self._observer is None:
+                    self._observer = Observer()
+                    self._observer.start()
+                handler = FileSystemEventHandler()
+                handler.on_any_event = self._dispatch
+                try:
+                    self._watches[directory] = self._observer.schedule(
+                        handler, directory, recursive=False
+                    )
+                except (OSError, RuntimeError):
+                    self._stop_if_idle()
+                    return False
+            self._subscribers.setdefault(target, []).append(callback)
+        return True
+
+    def unsubscribe(self, target: str, callback: Callable[[], None]) -> None:
+        """Remove a subscription, unscheduling its directory when unused."""
+        with self._lock:
+            callbacks = self._subscribers.get(target, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._subscribers.pop(target, None)
+            directory = os.path.dirname(target)
+            if directory in self._watches and not any(
+                os.path.dirname(path) == directory for path in self._subscribers
+            ):
+                self._observer.unschedule(self._watches.pop(directory))
+            self._stop_if_idle()
+
+    def _stop_if_idle(self) -> None:
+        """Stop the observer thread once nothing is scheduled (lock held)."""
+        if self._observer is not None and not self._watches:
+            self._observer.stop()
+            self._observer.join(timeout=1.0)
+            self._observer = None
+
+    def _dispatch(self, event) -> None:
+        """Forward an event to the subscribers of the paths it touches."""
+        if event.event_type not in _CHANGE_EVENTS:
+            return
+        with self._lock:
+            callbacks = [
+                callback
+                for path in (event.src_path, getattr(event, "dest_path", ""))
+                if path
+                for callback in self._subscribers.get(os.fsdecode(path), ())
+            ]
+        for callback in callbacks:
+            callback()
+
+
+_registry = _ObserverRegistry()
 
 
 class FileWatcher:
-    """Watch a file for external changes using polling.
+    """Watch a file for external changes.
     
-    Uses a background thread to check file mtime periodically.
+    Uses OS file notifications through watchdog when it is installed, so the
+    background thread only wakes when the file is touched; all watchers share
+    one Observer. Without watchdog
+    (or when the directory cannot be watched) it falls back to checking the
+    file mtime every poll_interval seconds.
     Thread-safe for use with TUI main loop.
     """
     
-    def __init__(self, file_path: str | Path, poll_interval: float = 1.0):
+    def __init__(
+        self,
+        file_path: str | Path,
+        poll_interval: float = 0.5,
+        debounce: float = 0.0,
+        max_wait: float = 1.0,
+        leading: bool = False,
+    ):
         """Initialize file watcher.
         
         Args:
             file_path: Path to the file to watch
-            poll_interval: Seconds between checks (default: 1.0)
+            poll_interval: Seconds between checks when polling (default: 0.5)
+            debounce: Seconds the file must stay unchanged before a change
+                is reported, so bursts of writes are reported once
+                (default: 0.0, report immediately)
+            max_wait: Report a change at most this many seconds after it was
+                first seen, even while writes keep arriving (default: 1.0)
+            leading: Report the first change after a quiet spell of at least
+                debounce seconds immediately; later writes in the same burst
+                are batched as above (default: False)
         """
         self.file_path = Path(file_path)
         self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.leading = leading
+        self._pending_since: Optional[float] = None
+        self._last_notify: float = float("-inf")
+        self._notified_mtime: Optional[float] = None
+        self._last_event: float = 0.0
+        self._seen_mtime: float = 0.0
         self._last_mtime: float = 0.0
-        self._last_hash: Optional[str] = None
+        self._last_size: int = -1
+        self._last_file_id: tuple[int, int] = (0, 0)
+        self._last_blocks: Optional[list[bytes]] = None
         self._has_changes: bool = False
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
         self._stop_event = threading.Event()
+        self._wake = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._watch_target: Optional[str] = None
         
         # Initialize with current state
         self._update_state()
     
-    def _get_file_hash(self) -> Optional[str]:
-        """Get SHA256 hash of file contents."""
+    def _get_block_hashes(self) -> Optional[list[bytes]]:
+        """Get the SHA-256 digest of each block of the file."""
         try:
-            content = self.file_path.read_bytes()
-            return hashlib.sha256(content).hexdigest()
+            with open(self.file_path, "rb") as f:
+                return list(_iter_block_hashes(f))
         except (OSError, IOError):
             return None
+
+    def _blocks_differ(self, last_blocks: Optional[list[bytes]]) -> bool:
+        """Compare the file block by block, stopping at the first difference."""
+        if last_blocks is None:
+            return True
+        with open(self.file_path, "rb") as f:
+            count = 0
+            for i, digest in enumerate(_iter_block_hashes(f)):
+                if i >= len(last_blocks) or digest != last_blocks[i]:
+                    return True
+                count += 1
+        return count != len(last_blocks)
     
     def _update_state(self) -> None:
-        """Update internal state from current file."""
+        """Update internal state from current file.
+
+        The file is read before the lock is taken so a slow disk never
+        stalls the watch thread; only the assignment is locked.
+        """
         try:
-            self._last_mtime = os.path.getmtime(self.file_path)
-            self._last_hash = self._get_file_hash()
+            st = os.stat(self.file_path)
+            state = (
+                st.st_mtime, st.st_size, (st.st_dev, st.st_ino), self._get_block_hashes()
+            )
         except (OSError, IOError):
-            self._last_mtime = 0.0
-            self._last_hash = None
-    
-    def _check_file(self) -> bool:
-        """Check if file has changed. Returns True if changed."""
+            state = (0.0, -1, (0, 0), None)
+        with self._lock:
+            (
+                self._last_mtime, self._last_size, self._last_file_id, self._last_blocks
+            ) = state
+
+    def _changed_mtime(self) -> Optional[float]:
+        """Stat the file once; return its mtime if it changed, else None."""
+        with self._lock:
+            last_mtime, last_size, last_file_id, last_blocks = (
+                self._last_mtime, self._last_size, self._last_file_id, self._last_blocks
+            )
         try:
-            current_mtime = os.path.getmtime(self.file_path)
-            if current_mtime != self._last_mtime:
-                current_hash = self._get_file_hash()
-                if current_hash != self._last_hash:
-                    return True
-                # mtime changed but content same - update mtime only
-                self._last_mtime = current_mtime
+            st = os.stat(self.file_path)
+            if st.st_mtime == last_mtime:
+                return None
+            if st.st_size != last_size or (st.st_dev, st.st_ino) != last_file_id:
+                # A different size, or a new file renamed into place by an
+                # atomic save, is a change; no need to hash
+                return st.st_mtime
+            if self._blocks_differ(last_blocks):
+                return st.st_mtime
+            # mtime changed but content same - update mtime only
+            with self._lock:
+                self._last_mtime = st.st_mtime
         except (OSError, IOError):
             pass
-        return False
+        return None
+
+    def _check_file(self) -> bool:
+        """Check if file has changed. Returns True if changed."""
+        return self._changed_mtime() is not None
     
+    def _poll(self) -> None:
+        """Check the file once and report a change once the burst settles."""
+        now = time.monotonic()
+        mtime = self._changed_mtime()
+        if mtime is not None:
+            if self._pending_since is None:
+                if mtime == self._notified_mtime:
+                    pass  # Already reported, waiting to be acknowledged
+                elif self.leading and now - self._last_notify >= self.debounce:
+                    self._notify(now, mtime)
+                else:
+                    self._pending_since = now
+                    self._last_event = now
+                    self._seen_mtime = mtime
+            elif mtime != self._seen_mtime:
+                # Another write in the same burst restarts the quiet period
+                self._last_event = now
+                self._seen_mtime = mtime
+
+        if self._pending_since is not None and (
+            now - self._last_event >= self.debounce
+            or now - self._pending_since >= self.max_wait
+        ):
+            self._notify(now, self._seen_mtime)
+
+    def _notify(self, now: float, mtime: float) -> None:
+        """Flag a change for the consumer and end the current burst."""
+        with self._lock:
+            self._has_changes = True
+            self._pending_since = None
+            self._last_notify = now
+            self._notified_mtime = mtime
+
+    def _next_timeout(self) -> Optional[float]:
+        """Seconds to sleep before the next check, or None to wait for an event."""
+        if self._pending_since is not None:
+            deadline = min(
+                self._last_event + self.debounce,
+                self._pending_since + self.max_wait,
+            )
+            return max(0.0, min(self.poll_interval, deadline - time.monotonic()))
+        if self._watch_target is not None:
+            return None
+        return self.poll_interval
+
     def _watch_loop(self) -> None:
         """Main watch loop running in background thread."""
         while not self._stop_event.is_set():
-            if self._check_file():
-                with self._lock:
-                    self._has_changes = True
-            time.sleep(self.poll_interval)
-    
+            self._wake.clear()
+            self._poll()
+            self._wake.wait(self._next_timeout())
+
+    def _mark_changed(self) -> None:
+        """Wake the watch loop; called for OS events on the watched file."""
+        self._wake.set()
+
     def start(self) -> None:
         """Start the file watcher thread."""
         if self._thread is not None and self._thread.is_alive():
             return
         
         self._stop_event.clear()
+        target = str(self.file_path.resolve())
+        if _registry.subscribe(target, self._mark_changed):
+            self._watch_target = target
         self._thread = threading.Thread(target=self._watch_loop, daemon=True)
         self._thread.start()
     
     def stop(self) -> None:
         """Stop the file watcher thread."""
         self._stop_event.set()
+        self._wake.set()
+        if self._watch_target is not None:
+            _registry.unsubscribe(self._watch_target, self._mark_changed)
+            self._watch_target = None
         if self._thread is not None:
-            self._thread.join(timeout=self.poll_interval + 0.5)
+            # The loop waits on _wake, which was just set, so it exits at once
+            self._thread.join(timeout=1.0)
             self._thread = None
     
     def has_changes(self) -> bool:
@@ -98,7 +316,9 @@ class FileWatcher:
         """Acknowledge and reset change flag."""
         with self._lock:
             self._has_changes = False
-            self._update_state()
+            self._pending_since = None
+            self._notified_mtime = None
+        self._update_state()
     
     def __enter__(self):
         self.start()
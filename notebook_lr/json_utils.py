@@ -0,0 +1,64 @@
+"""
+JSON encoding helpers that use orjson when it is installed.
+
+orjson is an optional extra (``pip install notebook-lr[fast]``); without it
+the standard library json module is used with orjson's formatting (raw UTF-8
+rather than \\uXXXX escapes, no spaces in compact output), so a document's
+bytes do not depend on which one is installed.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+
+    Args:
+        obj: JSON-compatible object
+        indent: Indent nested structures by two spaces
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # orjson rejects a few values json accepts (e.g. integers wider
+            # than 64 bits); let json decide whether they are serializable.
+            pass
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    return text.encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: Encoded or decoded JSON text
+
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json also accepts NaN/Infinity literals; it raises the same
+            # JSONDecodeError type for anything that is really malformed.
+            pass
+    return json.loads(data)
@@ -2,11 +2,49 @@
 NotebookKernel: Persistent IPython kernel that maintains execution state.
 """
 
+import io
+import weakref
+from collections import deque
+from contextlib import redirect_stderr, redirect_stdout
 from typing import Any, Optional
 from dataclasses import dataclass, field
 
-from IPython.core.interactiveshell import InteractiveShell
-from IPython.utils.capture import capture_output
+# IPython is imported when the first kernel is created rather than here:
+# notebook_lr.notebook imports ExecutionResult from this module, so a
+# module-level import would make every CLI command (even `new` and
+# `--help`) pay for loading IPython.
+
+
+_MIME_METHODS = (
+    ("text/html", "_repr_html_"),
+    ("text/markdown", "_repr_markdown_"),
+    ("application/json", "_repr_json_"),
+    ("text/latex", "_repr_latex_"),
+    ("image/svg+xml", "_repr_svg_"),
+    ("image/png", "_repr_png_"),
+)
+
+# type -> the _MIME_METHODS entries its class defines. Weak keys let classes
+# redefined in cells be collected.
+_MIME_METHODS_CACHE: "weakref.WeakKeyDictionary[type, tuple[tuple[str, str], ...]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _mime_methods_for(obj) -> tuple[tuple[str, str], ...]:
+    """Return the rich display methods worth probing on obj."""
+    t = type(obj)
+    if hasattr(t, "__getattr__"):
+        # Attributes may be synthesized per instance; probe them all.
+        return _MIME_METHODS
+    try:
+        return _MIME_METHODS_CACHE[t]
+    except KeyError:
+        entries = tuple(entry for entry in _MIME_METHODS if hasattr(t, entry[1]))
+    except TypeError:
+        return _MIME_METHODS
+    _MIME_METHODS_CACHE[t] = entries
+    return entries
 
 
 def _build_mime_bundle(obj) -> dict:
@@ -17,18 +55,28 @@ def _build_mime_bundle(obj) -> dict:
     mapping MIME types to their representations. For display objects
     that have a primary content attribute (e.g. HTML.data), use that
     as the text/plain fallback instead of repr().
+
+    Objects implementing _repr_mimebundle_ (matplotlib, pandas, plotly)
+    return every format from one call, so the per-MIME methods are not
+    probed for them.
     """
+    bundle_fn = getattr(obj, "_repr_mimebundle_", None)
+    if callable(bundle_fn):
+        bundle = bundle_fn(include=None, exclude=None)
+        if isinstance(bundle, tuple):
+            bundle = bundle[0]
+        if isinstance(bundle, dict) and bundle:
+            data = dict(bundle)
+            if "text/plain" not in data:
+                # Same fallback as below: the first rich value, not repr()
+                first = next(iter(data.values()))
+                data = {"text/plain": first if first is not None else repr(obj), **data}
+            return data
+
     rich_content = None
 
     rich_entries = []
-    for mime_type, method_name in [
-        ("text/html", "_repr_html_"),
-        ("text/markdown", "_repr_markdown_"),
-        ("application/json", "_repr_json_"),
-        ("text/latex", "_repr_latex_"),
-        ("image/svg+xml", "_repr_svg_"),
-        ("image/png", "_repr_png_"),
-    ]:
+    for mime_type, method_name in _mime_methods_for(obj):
         method = getattr(obj, method_name, None)
         if callable(method):
             value = method()
@@ -47,7 +95,100 @@ def _build_mime_bundle(obj) -> dict:
     return data
 
 
-@dataclass
+# shell -> its user-visible names, kept in user_ns order (dict as an ordered
+# set). InteractiveShell is a process-wide singleton shared by every
+# NotebookKernel, so the names are tracked per shell and refreshed by one
+# post_run_cell hook instead of each kernel scanning user_ns on every query.
+_USER_NAMES: "weakref.WeakKeyDictionary[Any, dict[str, None]]" = weakref.WeakKeyDictionary()
+
+
+def _refresh_user_names(shell) -> None:
+    """Recompute the non-underscore names of shell.user_ns."""
+    names = _USER_NAMES[shell]
+    names.clear()
+    names.update(dict.fromkeys(k for k in shell.user_ns if not k.startswith("_")))
+
+
+def _track_user_names(shell) -> dict[str, None]:
+    """Return the name set for shell, installing its refresh hook once."""
+    names = _USER_NAMES.get(shell)
+    if names is None:
+        names = _USER_NAMES[shell] = {}
+        shell.events.register("post_run_cell", lambda result: _refresh_user_names(shell))
+        _refresh_user_names(shell)
+    return names
+
+
+class _BoundedStream(io.TextIOBase):
+    """
+    Write-only text stream that keeps only the tail of what is written.
+
+    Used in place of StringIO for cell stdout/stderr so a cell printing in
+    a loop cannot grow the capture without bound. Once more than max_chars
+    characters or max_lines lines have been written, the oldest text is
+    dropped and getvalue() starts with a truncation notice.
+    """
+
+    def __init__(self, max_chars: int = 4 << 20, max_lines: int = 10_000):
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self.truncated = 0
+        self._chunks: deque[str] = deque()
+        self._head_offset = 0  # characters of _chunks[0] already dropped
+        self._chars = 0
+        self._lines = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if not isinstance(s, str):
+            raise TypeError(f"write() argument must be str, not {type(s).__name__}")
+        if s:
+            self._chunks.append(s)
+            self._chars += len(s)
+            self._lines += s.count("\n")
+            self._trim()
+        return len(s)
+
+    def _trim(self) -> None:
+        """Drop text from the front until both limits are met."""
+        while self._chars > self.max_chars or self._lines > self.max_lines:
+            head = self._chunks[0]
+            start = self._head_offset
+            cut = max(0, self._chars - self.max_chars)
+            excess_lines = self._lines - self.max_lines
+            if excess_lines > 0:
+                pos = start - 1
+                for _ in range(excess_lines):
+                    pos = head.find("\n", pos + 1)
+                    if pos == -1:
+                        break
+                cut = max(cut, len(head) - start if pos == -1 else pos + 1 - start)
+            cut = min(cut, len(head) - start)
+            self._chars -= cut
+            self._lines -= head.count("\n", start, start + cut)
+            self.truncated += cut
+            start += cut
+            if start == len(head):
+                self._chunks.popleft()
+                start = 0
+            elif start > len(head) // 2:
+                # Slicing only once half the head is dead keeps the copying
+                # linear in the text written while still freeing it.
+                self._chunks[0] = head[start:]
+                start = 0
+            self._head_offset = start
+
+    def getvalue(self) -> str:
+        """Return the retained text, prefixed by a notice if any was dropped."""
+        text = "".join(self._chunks)[self._head_offset:]
+        if self.truncated:
+            return f"...[truncated {self.truncated} characters]...\n{text}"
+        return text
+
+
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of executing a code cell."""
     success: bool
@@ -90,10 +231,13 @@ class NotebookKernel:
 
     def __init__(self):
         """Initialize the kernel with a fresh IPython shell."""
+        from IPython.core.interactiveshell import InteractiveShell
+
         # Create a new InteractiveShell instance
         self.ip = InteractiveShell.instance()
         self.execution_count = 0
         self._history: list[tuple[int, str, ExecutionResult]] = []
+        self._user_names = _track_user_names(self.ip)
 
         # Ensure clean state
         self._setup_namespace()
@@ -111,6 +255,7 @@ class NotebookKernel:
             pass  # matplotlib not installed, skip
         except Exception:
             pass  # matplotlib inline setup failed, continue without it
+        _refresh_user_names(self.ip)
 
     def execute_cell(self, code: str) -> ExecutionResult:
         """
@@ -122,27 +267,33 @@ class NotebookKernel:
         Returns:
             ExecutionResult with outputs and status
         """
+        from IPython.utils.capture import capture_output
+
         self.execution_count += 1
         outputs = []
         error = None
         return_value = None
 
         try:
-            with capture_output() as captured:
+            stdout, stderr = _BoundedStream(), _BoundedStream()
+            with capture_output(stdout=False, stderr=False) as captured, \
+                    redirect_stdout(stdout), redirect_stderr(stderr):
                 result = self.ip.run_cell(code, silent=False)
 
-            if captured.stdout:
+            stdout_text = stdout.getvalue()
+            if stdout_text:
                 outputs.append({
                     "type": "stream",
                     "name": "stdout",
-                    "text": captured.stdout,
+                    "text": stdout_text,
                 })
 
-            if captured.stderr:
+            stderr_text = stderr.getvalue()
+            if stderr_text:
                 outputs.append({
                     "type": "stream",
                     "name": "stderr",
-                    "text": captured.stderr,
+                    "text": stderr_text,
                 })
 
             # display() 호출로 생성된 출력 처리
@@ -209,20 +360,15 @@ class NotebookKernel:
         """
         Get current namespace for serialization.
 
-        Returns a copy of the user namespace, filtering out
-        non-serializable items and internal IPython objects.
+        Returns a copy of the user namespace without private/internal
+        (underscore) names. Values are not checked for picklability here;
+        SessionManager.save_session dumps them with dill in one pass (dill
+        also accepts functions and lambdas that plain pickle rejects) and
+        probes values one by one only if that pass fails.
         """
-        ns = {}
-        for key, value in self.ip.user_ns.items():
-            # Skip private/internal variables
-            if key.startswith("_"):
-                continue
-            # Skip modules and functions that can't be pickled easily
-            try:
-                ns[key] = value
-            except Exception:
-                pass
-        return ns
+        user_ns = self.ip.user_ns
+        # Private/internal (underscore) names are never in _user_names
+        return {key: user_ns[key] for key in self._user_names if key in user_ns}
 
     def restore_namespace(self, namespace: dict):
         """
@@ -232,6 +378,7 @@ class NotebookKernel:
             namespace: Dictionary of variables to restore
         """
         self.ip.user_ns.update(namespace)
+        _refresh_user_names(self.ip)
 
     def get_history(self) -> list[tuple[int, str, ExecutionResult]]:
         """Get execution history."""
@@ -243,7 +390,14 @@ class NotebookKernel:
 
     def reset(self):
         """Reset the kernel to a clean state."""
-        self.ip.reset()
+        # Starting a new history session writes to IPython's SQLite history,
+        # whose connection only works on the thread that created the shell;
+        # the web server resets from request threads, so only the in-memory
+        # history is cleared.
+        self.ip.reset(new_session=False)
+        history = self.ip.history_manager
+        history.input_hist_parsed[:] = [""]
+        history.input_hist_raw[:] = [""]
         self.execution_count = 0
         self._history.clear()
         self._setup_namespace()
@@ -255,12 +409,15 @@ class NotebookKernel:
     def set_variable(self, name: str, value: Any):
         """Set a variable in the namespace."""
         self.ip.user_ns[name] = value
+        if not name.startswith("_"):
+            self._user_names[name] = None
 
     def del_variable(self, name: str):
         """Delete a variable from the namespace."""
         if name in self.ip.user_ns:
             del self.ip.user_ns[name]
+        self._user_names.pop(name, None)
 
     def get_defined_names(self) -> list[str]:
         """Get list of user-defined names in namespace."""
-        return [k for k in self.ip.user_ns.keys() if not k.startswith("_")]
+        return list(self._user_names)
@@ -7,14 +7,19 @@ This module provides MCP tools for interacting with Jupyter-like notebooks:
 - Notebook Operations: get_notebook_info, save_notebook
 """
 
+import atexit
 import os
+import stat
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from notebook_lr import Notebook, Cell, CellType, NotebookKernel, SessionManager, Comment
+from notebook_lr.autosave import DebouncedSaver
 
 
 # Pydantic models for structured output
@@ -44,12 +49,25 @@ class CellList(BaseModel):
     cells: list[CellOutput] = Field(description="Array of cells")
 
 
+# Dumps a cell's comments in one pydantic-core call instead of one per comment.
+_COMMENTS_ADAPTER = TypeAdapter(list[Comment])
+# Comment fields included in get_notebook_context.
+_CONTEXT_COMMENT_FIELDS = {"__all__": {"user_comment", "status", "selected_text"}}
+
+
 # Global state (would be managed properly in production)
 _notebook: Optional[Notebook] = None
 _kernel: Optional[NotebookKernel] = None
 _session_manager: Optional[SessionManager] = None
 _notebook_path: Optional[str] = None
 _notebook_mtime: float = 0.0
+# A burst of tool calls (e.g. reading many cells in a loop) stats the file
+# at most once per _STAT_CACHE_TTL seconds.
+_STAT_CACHE_TTL = 0.1
+_last_stat_ts: float = float("-inf")
+# Mutations closer together than this many seconds are written to disk once,
+# after the last one. 0 (the default) saves synchronously on every mutation.
+_AUTO_SAVE_DELAY = float(os.environ.get("NOTEBOOK_LR_SAVE_DELAY") or 0)
 
 mcp = FastMCP("notebook-lr")
 
@@ -59,10 +77,16 @@ def get_notebook() -> Notebook:
     global _notebook, _notebook_path, _notebook_mtime
     if _notebook is None:
         env_path = os.environ.get("NOTEBOOK_LR_PATH")
-        if env_path and os.path.isfile(env_path):
+        st = None
+        if env_path:
+            try:
+                st = os.stat(env_path)
+            except OSError:
+                pass
+        if st is not None and stat.S_ISREG(st.st_mode):
             _notebook_path = env_path
             _notebook = Notebook.load(Path(env_path))
-            _notebook_mtime = os.path.getmtime(env_path)
+            _notebook_mtime = st.st_mtime
         else:
             _notebook = Notebook.new()
             if env_path:
@@ -72,14 +96,24 @@ def get_notebook() -> Notebook:
 
 def _maybe_reload() -> None:
     """Reload notebook from file if it was modified externally."""
-    global _notebook, _notebook_mtime
+    global _notebook, _notebook_mtime, _last_stat_ts
     if _notebook_path is None:
         return
+    if _saver.pending:
+        # The in-memory notebook is newer than the file until the pending
+        # save lands; reloading now would drop those edits.
+        return
+    now = time.monotonic()
+    if now - _last_stat_ts < _STAT_CACHE_TTL:
+        return
+    _last_stat_ts = now
     try:
-        current_mtime = os.path.getmtime(_notebook_path)
+        current_mtime = os.stat(_notebook_path).st_mtime
         if current_mtime != _notebook_mtime:
             _notebook = Notebook.load(Path(_notebook_path))
             _notebook_mtime = current_mtime
+            # Entries keep the replaced notebook's cells alive.
+            _cell_output_cache.clear()
     except OSError:
         pass
 
@@ -90,12 +124,23 @@ def _auto_save() -> bool:
     Returns:
         True if saved to disk, False if no file path configured.
     """
-    global _notebook_mtime
     if _notebook_path is None or _notebook is None:
         return False
+    _saver.request(_AUTO_SAVE_DELAY)
+    return True
+
+
+def _write_notebook() -> None:
+    """Write the current notebook to its configured path."""
+    global _notebook_mtime
+    if _notebook_path is None or _notebook is None:
+        return
     _notebook.save(Path(_notebook_path))
     _notebook_mtime = os.path.getmtime(_notebook_path)
-    return True
+
+
+_saver = DebouncedSaver(_write_notebook)
+atexit.register(_saver.flush)
 
 
 def _check_persisted(saved: bool) -> None:
@@ -127,14 +172,68 @@ def get_session_manager() -> SessionManager:
 
 def _validate_index(index: int) -> None:
     """Validate that an index is within range."""
-    notebook = get_notebook()
-    if index < 0 or index >= len(notebook.cells):
-        raise ValueError(f"Cell index {index} out of range (0-{len(notebook.cells) - 1})")
+    count = len(get_notebook().cells)
+    if not 0 <= index < count:
+        raise ValueError(f"Cell index {index} out of range (0-{count - 1})")
+
+
+def _first_n_lines(source: str, n: int) -> str:
+    """Return the first n lines of source, stopping the scan after the nth newline."""
+    end = -1
+    for _ in range(n):
+        end = source.find("\n", end + 1)
+        if end == -1:
+            break
+    head = source if end == -1 else source[:end + 1]
+    return "\n".join(head.splitlines()[:n])
+
+
+# Longest string kept per output field in get_notebook_context previews.
+_OUTPUT_PREVIEW_CHARS = 2048
+
+
+def _preview_text(text: str) -> str:
+    """Cut text to _OUTPUT_PREVIEW_CHARS, noting how much was dropped."""
+    if len(text) <= _OUTPUT_PREVIEW_CHARS:
+        return text
+    return f"{text[:_OUTPUT_PREVIEW_CHARS]}...<{len(text) - _OUTPUT_PREVIEW_CHARS} truncated>"
+
+
+def _preview_output(output: dict) -> dict:
+    """Shrink an output dict for context previews; images become size markers."""
+    preview = dict(output)
+    text = preview.get("text")
+    if isinstance(text, str):
+        preview["text"] = _preview_text(text)
+    data = preview.get("data")
+    if isinstance(data, dict):
+        preview["data"] = {}
+        for mime, value in data.items():
+            if isinstance(value, str):
+                if mime.startswith("image/"):
+                    value = f"<{len(value)} bytes omitted>"
+                else:
+                    value = _preview_text(value)
+            preview["data"][mime] = value
+    return preview
+
+
+# (id(cell), cell._version, index) -> (cell, CellOutput). The cell is kept
+# alive by its entry, so its id cannot be reused while the entry exists;
+# the cache is cleared whenever the notebook is replaced.
+_CELL_OUTPUT_CACHE_SIZE = 1024
+_cell_output_cache: "OrderedDict[tuple[int, int, int], tuple[Cell, CellOutput]]" = OrderedDict()
 
 
 def _cell_to_output(cell: Cell, index: int) -> CellOutput:
-    """Convert a Cell to CellOutput."""
-    return CellOutput(
+    """Convert a Cell to CellOutput, reusing the model while the cell is unchanged."""
+    key = (id(cell), cell._version, index)
+    hit = _cell_output_cache.get(key)
+    if hit is not None and hit[0] is cell:
+        _cell_output_cache.move_to_end(key)
+        return hit[1]
+
+    output = CellOutput(
         index=index,
         id=cell.id,
         type=cell.type.value,
@@ -142,6 +241,10 @@ def _cell_to_output(cell: Cell, index: int) -> CellOutput:
         outputs=cell.outputs,
         execution_count=cell.execution_count
     )
+    _cell_output_cache[key] = (cell, output)
+    if len(_cell_output_cache) > _CELL_OUTPUT_CACHE_SIZE:
+        _cell_output_cache.popitem(last=False)
+    return output
 
 
 # =============================================================================
@@ -345,11 +448,13 @@ def get_notebook_info() -> NotebookInfo:
     notebook = get_notebook()
     name = notebook.metadata.get("name", "Untitled")
     cell_count = len(notebook.cells)
-    code_count = sum(1 for c in notebook.cells if c.type == CellType.CODE)
+    code_count = executed_count = 0
+    for c in notebook.cells:
+        if c.type == CellType.CODE:
+            code_count += 1
+        if c.execution_count is not None:
+            executed_count += 1
     md_count = cell_count - code_count
-    executed_count = sum(
-        1 for c in notebook.cells if c.execution_count is not None
-    )
 
     return NotebookInfo(
         name=name,
@@ -376,23 +481,25 @@ def save_notebook(
     Returns:
         Dict with 'status', 'path', and optionally session info
     """
+    _saver.flush()
     notebook = get_notebook()
     kernel = get_kernel()
     session_manager = get_session_manager()
 
     save_path = path or notebook.metadata.get("path", "notebook.nblr")
 
-    if include_session:
-        session_data = {
-            "user_ns": kernel.get_namespace(),
-            "execution_count": kernel.execution_count,
-        }
-        notebook.save(Path(save_path), include_session=True, session_data=session_data)
-        session_manager.save_checkpoint(kernel, Path(save_path))
-        status = "saved with session"
-    else:
-        notebook.save(Path(save_path))
-        status = "saved"
+    with _saver.lock:
+        if include_session:
+            session_data = {
+                "user_ns": kernel.get_namespace(),
+                "execution_count": kernel.execution_count,
+            }
+            notebook.save(Path(save_path), include_session=True, session_data=session_data)
+            session_manager.save_checkpoint(kernel, Path(save_path))
+            status = "saved with session"
+        else:
+            notebook.save(Path(save_path))
+            status = "saved"
 
     notebook.metadata["path"] = save_path
     # Update mtime tracking after explicit save
@@ -417,7 +524,7 @@ def get_cell_comments(index: int) -> list[dict]:
     notebook = get_notebook()
     _validate_index(index)
     cell = notebook.get_cell(index)
-    return [c.model_dump() for c in cell.comments]
+    return _COMMENTS_ADAPTER.dump_python(cell.comments)
 
 
 @mcp.tool()
@@ -433,7 +540,7 @@ def get_notebook_context(index: int) -> dict:
         prev = notebook.get_cell(index - 1)
         previous_cell = {
             "type": prev.type.value,
-            "source_preview": "\n".join(prev.source.splitlines()[:5]),
+            "source_preview": _first_n_lines(prev.source, 5),
         }
 
     next_cell = None
@@ -441,7 +548,7 @@ def get_notebook_context(index: int) -> dict:
         nxt = notebook.get_cell(index + 1)
         next_cell = {
             "type": nxt.type.value,
-            "source_preview": "\n".join(nxt.source.splitlines()[:5]),
+            "source_preview": _first_n_lines(nxt.source, 5),
         }
 
     return {
@@ -449,17 +556,12 @@ def get_notebook_context(index: int) -> dict:
         "total_cells": len(notebook.cells),
         "cell_type": cell.type.value,
         "cell_source": cell.source,
-        "cell_outputs": cell.outputs[:3],
+        "cell_outputs": [_preview_output(o) for o in cell.outputs[:3]],
         "previous_cell": previous_cell,
         "next_cell": next_cell,
-        "comments": [
-            {
-                "user_comment": c.user_comment,
-                "status": c.status,
-                "selected_text": c.selected_text,
-            }
-            for c in cell.comments
-        ],
+        "comments": _COMMENTS_ADAPTER.dump_python(
+            cell.comments, include=_CONTEXT_COMMENT_FIELDS
+        ),
     }
 
 
@@ -469,12 +571,15 @@ def get_notebook_context(index: int) -> dict:
 
 def _reset_notebook() -> None:
     """Reset the global notebook state. Useful for testing."""
-    global _notebook, _kernel, _session_manager, _notebook_path, _notebook_mtime
+    global _notebook, _kernel, _session_manager, _notebook_path, _notebook_mtime, _last_stat_ts
+    _saver.cancel()
     _notebook = None
     _kernel = None
     _session_manager = None
     _notebook_path = None
     _notebook_mtime = 0.0
+    _last_stat_ts = float("-inf")
+    _cell_output_cache.clear()
 
 
 if __name__ == "__main__":
@@ -2,17 +2,72 @@
 Notebook: .nblr file format - JSON-based notebook storage.
 """
 
-import json
+import itertools
+import os
+import stat
+import threading
+import time
 from pathlib import Path
 from typing import Any, Optional
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
+from notebook_lr import json_utils
 from notebook_lr.kernel import ExecutionResult
 
 
+# Files written by newer versions may carry extra keys; from_dict validates
+# whole dicts, so unknown keys are dropped rather than stored per instance, and
+# assignments skip re-validation on the hot edit paths.
+_MODEL_CONFIG = ConfigDict(extra="ignore", validate_assignment=False)
+
+# Timestamps and id prefixes only change once a second, so each is formatted
+# once per second and reused by every cell/comment created within it.
+_last_touch_s: int = -1
+_last_touch_str: str = ""
+_last_id_s: int = -1
+_last_id_prefix: str = ""
+_id_counter = itertools.count()
+
+
+def _timestamp() -> str:
+    """Return the current local time as a second-resolution ISO-8601 string."""
+    global _last_touch_s, _last_touch_str
+    now = int(time.time())
+    if now != _last_touch_s:
+        _last_touch_str = datetime.fromtimestamp(now).isoformat(timespec="seconds")
+        _last_touch_s = now
+    return _last_touch_str
+
+
+def _new_id(prefix: str) -> str:
+    """Return a unique id made of a per-second stamp, the pid and a counter.
+
+    The web and MCP servers are separate processes editing the same file, so
+    the pid keeps ids minted in the same second by different processes apart.
+    """
+    global _last_id_s, _last_id_prefix
+    now = int(time.time())
+    if now != _last_id_s:
+        stamp = datetime.fromtimestamp(now).strftime("%Y%m%d%H%M%S")
+        _last_id_prefix = f"{stamp}{os.getpid() % 10_000_000:07d}"
+        _last_id_s = now
+    return f"{prefix}_{_last_id_prefix}{next(_id_counter) % 1_000_000:06d}"
+
+
+def _reset_id_state() -> None:
+    """Drop the cached id prefix in a forked child, whose pid differs."""
+    global _last_id_s, _id_counter
+    _last_id_s = -1
+    _id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_state)
+
+
 class CellType(str, Enum):
     """Type of notebook cell."""
     CODE = "code"
@@ -21,7 +76,9 @@ class CellType(str, Enum):
 
 class Comment(BaseModel):
     """An inline code comment with optional AI response."""
-    id: str = Field(default_factory=lambda: f"cmt_{datetime.now().strftime('%Y%m%d%H%M%S%f')}")
+    model_config = _MODEL_CONFIG
+
+    id: str = Field(default_factory=lambda: _new_id("cmt"))
     from_line: int
     from_ch: int
     to_line: int
@@ -36,38 +93,31 @@ class Comment(BaseModel):
 
 class Cell(BaseModel):
     """A single notebook cell."""
-    id: str = Field(default_factory=lambda: f"cell_{datetime.now().strftime('%Y%m%d%H%M%S%f')}")
+    model_config = _MODEL_CONFIG
+
+    id: str = Field(default_factory=lambda: _new_id("cell"))
     type: CellType = CellType.CODE
     source: str = ""
     outputs: list[dict[str, Any]] = Field(default_factory=list)
     execution_count: Optional[int] = None
     metadata: dict[str, Any] = Field(default_factory=dict)
     comments: list[Comment] = Field(default_factory=list)
+    # Bumped on every field assignment so derived views can be cached.
+    _version: int = PrivateAttr(default=0)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._version += 1
 
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
-        return {
-            "id": self.id,
-            "type": self.type.value,
-            "source": self.source,
-            "outputs": self.outputs,
-            "execution_count": self.execution_count,
-            "metadata": self.metadata,
-            "comments": [c.model_dump() for c in self.comments],
-        }
+        return self.model_dump(mode="json")
 
     @classmethod
     def from_dict(cls, data: dict) -> "Cell":
         """Create from dictionary."""
-        return cls(
-            id=data.get("id", f"cell_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"),
-            type=CellType(data.get("type", "code")),
-            source=data.get("source", ""),
-            outputs=data.get("outputs", []),
-            execution_count=data.get("execution_count"),
-            metadata=data.get("metadata", {}),
-            comments=[Comment(**c) for c in data.get("comments", [])],
-        )
+        return cls.model_validate(data)
 
 
 class Notebook(BaseModel):
@@ -80,19 +130,21 @@ class Notebook(BaseModel):
     - Optional session state for persistence
     """
 
+    model_config = _MODEL_CONFIG
+
     version: str = "1.0"
     cells: list[Cell] = Field(default_factory=list)
     metadata: dict[str, Any] = Field(default_factory=dict)
     session_state: Optional[dict[str, Any]] = None
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    def model_post_init(self, __context: Any) -> None:
+        # Runs for both Notebook(...) and model_validate(...).
         # Set default metadata
         if not self.metadata:
             self.metadata = {
                 "name": "Untitled",
-                "created": datetime.now().isoformat(),
-                "modified": datetime.now().isoformat(),
+                "created": _timestamp(),
+                "modified": _timestamp(),
             }
 
     def add_cell(self, cell: Optional[Cell] = None, **kwargs) -> Cell:
@@ -140,27 +192,25 @@ class Notebook(BaseModel):
 
     def _touch(self):
         """Update the modified timestamp."""
-        self.metadata["modified"] = datetime.now().isoformat()
+        self.metadata["modified"] = _timestamp()
 
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
-        return {
-            "version": self.version,
-            "cells": [cell.to_dict() for cell in self.cells],
-            "metadata": self.metadata,
-            "session_state": self.session_state,
-        }
+        # pydantic-core walks cells and comments in one call; field order
+        # matches the .nblr layout.
+        return self.model_dump(mode="json")
 
     @classmethod
     def from_dict(cls, data: dict) -> "Notebook":
         """Create from dictionary."""
-        cells = [Cell.from_dict(c) for c in data.get("cells", [])]
-        return cls(
-            version=data.get("version", "1.0"),
-            cells=cells,
-            metadata=data.get("metadata", {}),
-            session_state=data.get("session_state"),
-        )
+        # One validation pass over the whole tree instead of one per cell
+        # and comment.
+        return cls.model_validate(data)
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> "Notebook":
+        """Create from the contents of a .nblr file."""
+        return cls.from_dict(json_utils.loads(data))
 
     def save(self, path: Path, include_session: bool = False, session_data: Optional[dict] = None):
         """
@@ -176,11 +226,57 @@ class Notebook(BaseModel):
         else:
             self.session_state = None
 
-        path = Path(path)
+        # Write through symlinks to the real file rather than replacing the link.
+        path = Path(os.path.realpath(path))
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        # Serialize first and hand the file one buffer; json.dump would issue a
+        # write() per encoder chunk.
+        payload = json_utils.dumps(self.to_dict(), indent=True)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+
+        if st is not None and st.st_nlink > 1:
+            # A rename would detach this name from the file's other hard
+            # links, so those are written in place.
+            with open(path, "wb") as f:
+                self._write_payload(f, payload, include_session)
+            return
+
+        # Writing to a sibling temp file and renaming it over the target means
+        # a crash never leaves a half-written notebook. The temp name is per
+        # process and thread so concurrent saves of the same path never share
+        # (and rename away) each other's temp file.
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with open(tmp_path, "wb") as f:
+                if st is not None:
+                    # The rename must not change who can read the notebook.
+                    os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+                    if hasattr(os, "chown"):
+                        try:
+                            os.chown(tmp_path, st.st_uid, st.st_gid)
+                        except OSError:
+                            pass
+                self._write_payload(f, payload, include_session)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _write_payload(f, payload: bytes, durable: bool) -> None:
+        """Write an encoded notebook to an open file, fsyncing when durable."""
+        f.write(payload)
+        if durable:
+            # Only explicit session saves pay for durability; frequent
+            # auto-saves are left to the page cache.
+            f.flush()
+            os.fsync(f.fileno())
 
     @classmethod
     def load(cls, path: Path) -> "Notebook":
@@ -194,9 +290,8 @@ class Notebook(BaseModel):
             Loaded notebook
         """
         path = Path(path)
-        with open(path, "r") as f:
-            data = json.load(f)
-        return cls.from_dict(data)
+        with open(path, "rb") as f:
+            return cls.from_json(f.read())
 
     @classmethod
     def new(cls, name: str = "Untitled") -> "Notebook":
@@ -204,7 +299,7 @@ class Notebook(BaseModel):
         return cls(
             metadata={
                 "name": name,
-                "created": datetime.now().isoformat(),
-                "modified": datetime.now().isoformat(),
+                "created": _timestamp(),
+                "modified": _timestamp(),
             }
         )
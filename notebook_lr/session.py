@@ -2,14 +2,34 @@
 SessionManager: Manages saving/loading of kernel state.
 """
 
+import hashlib
+import json
+import os
 import pickle
-import dill
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Optional
 from datetime import datetime
 
 from notebook_lr.kernel import NotebookKernel
 
+# dill is imported where sessions are read or written; loading it at module
+# level would add to the startup of every CLI command.
+
+# Session pickles are streamed through a large buffer so big values reach the
+# file in few write() calls; protocol 5 frames large bytes/array buffers
+# without extra copies.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+_MISSING = object()
+
+try:
+    import fcntl
+except ImportError:  # Windows: blobs are never pruned
+    fcntl = None
+
 
 class SessionManager:
     """
@@ -45,23 +65,23 @@ class SessionManager:
         Returns:
             Path to saved session file
         """
-        # Prepare state for serialization
-        namespace = kernel.get_namespace()
-
-        # Filter namespace for picklable items
-        filtered_ns = {}
+        import dill
+
+        # Prepare state for serialization. Objects IPython seeds itself
+        # (exit, get_ipython, ...) are often bound to the live shell and
+        # unpicklable, so those few are probed up front; the user's own
+        # variables are then usually written in a single pass.
+        hidden = kernel.ip.user_ns_hidden
+        namespace = {}
         unpicklable = []
-
-        for key, value in namespace.items():
-            try:
-                # Test if it's picklable with dill
-                dill.dumps(value)
-                filtered_ns[key] = value
-            except Exception:
+        for key, value in kernel.get_namespace().items():
+            if hidden.get(key, _MISSING) is value and not _is_picklable(dill, value):
                 unpicklable.append(key)
+            else:
+                namespace[key] = value
 
         state = {
-            "user_ns": filtered_ns,
+            "user_ns": namespace,
             "execution_count": kernel.execution_count,
             "history": [
                 (count, code, result.to_dict())
@@ -79,9 +99,31 @@ class SessionManager:
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Save with dill
-        with open(path, "wb") as f:
-            dill.dump(state, f)
+        # Only when the single pass fails is each remaining variable probed on
+        # its own to find the ones to leave out. The temp file keeps a failed
+        # attempt from clobbering an existing session.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            try:
+                with open(tmp_path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+                    dill.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                filtered_ns = {}
+                for key, value in namespace.items():
+                    if _is_picklable(dill, value):
+                        filtered_ns[key] = value
+                    else:
+                        unpicklable.append(key)
+                state["user_ns"] = filtered_ns
+                with open(tmp_path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+                    dill.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        # The sidecar lets list_sessions skip unpickling this file.
+        _write_session_meta(path, path.stat(), state)
 
         return path
 
@@ -96,11 +138,17 @@ class SessionManager:
         Returns:
             Dictionary with load information
         """
+        import dill
+
         path = Path(path)
 
         with open(path, "rb") as f:
             state = dill.load(f)
 
+        return self._restore_state(kernel, state)
+
+    def _restore_state(self, kernel: NotebookKernel, state: dict[str, Any]) -> dict[str, Any]:
+        """Restore a loaded session state dictionary into a kernel."""
         # Restore namespace
         kernel.restore_namespace(state["user_ns"])
         kernel.execution_count = state["execution_count"]
@@ -122,33 +170,32 @@ class SessionManager:
         """
         List available saved sessions.
 
+        Listing metadata comes from the ``.meta.json`` sidecar save_session
+        writes next to each file. Only files without a current sidecar are
+        loaded (they get one for the next listing), and files are read in
+        parallel.
+
         Returns:
             List of session info dictionaries
         """
-        sessions = []
-        for path in self.sessions_dir.glob("*.session"):
-            try:
-                with open(path, "rb") as f:
-                    state = dill.load(f)
-                sessions.append({
-                    "path": str(path),
-                    "name": path.stem,
-                    "saved_at": state.get("saved_at"),
-                    "var_count": len(state.get("user_ns", {})),
-                })
-            except Exception as e:
-                sessions.append({
-                    "path": str(path),
-                    "name": path.stem,
-                    "error": str(e),
-                })
-        return sorted(sessions, key=lambda x: x.get("saved_at", ""), reverse=True)
+        with os.scandir(self.sessions_dir) as it:
+            entries = [(e.path, e.stat()) for e in it if e.name.endswith(".session") and e.is_file()]
+
+        if not entries:
+            return []
+        with ThreadPoolExecutor(max_workers=min(8, len(entries))) as pool:
+            sessions = list(pool.map(
+                _read_session_meta, [p for p, _ in entries], [st for _, st in entries]
+            ))
+
+        return sorted(sessions, key=lambda x: x.get("saved_at") or "", reverse=True)
 
     def delete_session(self, path: Path) -> bool:
         """Delete a session file."""
         path = Path(path)
         if path.exists():
             path.unlink()
+            _meta_path(path).unlink(missing_ok=True)
             return True
         return False
 
@@ -173,10 +220,180 @@ class SessionManager:
 
         return self.save_session(kernel, path=checkpoint_path)
 
+    def get_manifest_path(self, notebook_path: Path) -> Path:
+        """Get the delta checkpoint manifest path for a notebook."""
+        notebook_path = Path(notebook_path)
+        return self.sessions_dir / "checkpoints" / f"{notebook_path.stem}.manifest.json"
+
+    @property
+    def blobs_dir(self) -> Path:
+        """Directory holding content-addressed variable blobs."""
+        return self.sessions_dir / "blobs"
+
+    def save_delta_checkpoint(self, kernel: NotebookKernel, notebook_path: Path) -> Path:
+        """
+        Save an incremental checkpoint for a notebook.
+
+        Each variable is serialized on its own and stored under the hash of
+        its bytes, so values that did not change since an earlier checkpoint
+        are not written again. A small JSON manifest maps variable names to
+        blob ids; names bound to the same object (``b = a``) are recorded as
+        aliases so they still share it after loading. Objects shared only
+        through nested references end up as separate copies, so use
+        save_checkpoint when those must stay shared. Blobs no manifest refers
+        to any more are removed, unless another save (from this or another
+        process sharing sessions_dir) is still between its blob and manifest
+        writes.
+
+        Args:
+            kernel: Kernel to save state from
+            notebook_path: Path to the notebook
+
+        Returns:
+            Path to the manifest file
+        """
+        import dill
+
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._blobs_lock(exclusive=False):
+            manifest_path = self._write_delta_checkpoint(dill, kernel, notebook_path)
+        self._prune_blobs()
+
+        return manifest_path
+
+    def _write_delta_checkpoint(self, dill, kernel: NotebookKernel, notebook_path: Path) -> Path:
+        """Write the blobs and manifest of a delta checkpoint."""
+        blob_ids = {}
+        aliases = {}
+        unpicklable = []
+        first_name = {}  # id(value) -> first name bound to it
+        for key, value in kernel.get_namespace().items():
+            owner = first_name.setdefault(id(value), key)
+            if owner != key:
+                aliases[key] = owner
+                continue
+            try:
+                data = dill.dumps(value)
+            except Exception:
+                unpicklable.append(key)
+                continue
+            blob_id = hashlib.blake2b(data, digest_size=16).hexdigest()
+            blob_path = self.blobs_dir / f"{blob_id}.pkl"
+            if not blob_path.exists():
+                _write_atomic(blob_path, data)
+            blob_ids[key] = blob_id
+        for key, owner in list(aliases.items()):
+            if owner not in blob_ids:
+                del aliases[key]
+                unpicklable.append(key)
+
+        manifest = {
+            "vars": blob_ids,
+            "aliases": aliases,
+            "execution_count": kernel.execution_count,
+            "history": [
+                (count, code, result.to_dict())
+                for count, code, result in kernel.get_history()
+            ],
+            "saved_at": datetime.now().isoformat(),
+            "unpicklable_vars": unpicklable,
+        }
+
+        manifest_path = self.get_manifest_path(notebook_path)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(manifest_path, json.dumps(manifest, default=str).encode("utf-8"))
+        return manifest_path
+
+    @contextmanager
+    def _blobs_lock(self, exclusive: bool):
+        """
+        Hold the blobs directory lock.
+
+        Saves hold it shared from their first blob write until their manifest
+        is written; pruning takes it exclusively without waiting, so it never
+        deletes blobs a manifest about to be written will refer to.
+
+        Yields:
+            Whether the lock was acquired (always True for a shared lock)
+        """
+        if fcntl is None:
+            yield not exclusive
+            return
+        with open(self.blobs_dir / ".lock", "a+b") as f:
+            if exclusive:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+            else:
+                fcntl.flock(f, fcntl.LOCK_SH)
+            yield True
+
+    def _prune_blobs(self) -> None:
+        """Delete blobs that no delta checkpoint manifest refers to."""
+        with self._blobs_lock(exclusive=True) as locked:
+            if not locked:
+                # Another save is in flight; a later save prunes instead.
+                return
+            referenced = set()
+            for manifest_path in (self.sessions_dir / "checkpoints").glob("*.manifest.json"):
+                try:
+                    with open(manifest_path, "r", encoding="utf-8") as f:
+                        referenced.update(json.load(f).get("vars", {}).values())
+                except (OSError, ValueError):
+                    # An unreadable manifest may still refer to any blob.
+                    return
+            for blob_path in self.blobs_dir.glob("*.pkl"):
+                if blob_path.stem not in referenced:
+                    blob_path.unlink(missing_ok=True)
+
+    def load_delta_checkpoint(self, kernel: NotebookKernel, manifest_path: Path) -> dict[str, Any]:
+        """
+        Load kernel state from a delta checkpoint manifest.
+
+        Args:
+            kernel: NotebookKernel instance to restore into
+            manifest_path: Path to the manifest file
+
+        Returns:
+            Dictionary with load information
+        """
+        import dill
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        user_ns = {}
+        unpicklable = list(manifest.get("unpicklable_vars", []))
+        for key, blob_id in manifest.get("vars", {}).items():
+            try:
+                with open(self.blobs_dir / f"{blob_id}.pkl", "rb") as f:
+                    user_ns[key] = dill.load(f)
+            except Exception:
+                unpicklable.append(key)
+        for key, owner in manifest.get("aliases", {}).items():
+            if owner in user_ns:
+                user_ns[key] = user_ns[owner]
+            else:
+                unpicklable.append(key)
+
+        return self._restore_state(kernel, {
+            "user_ns": user_ns,
+            "execution_count": manifest.get("execution_count", 0),
+            "history": manifest.get("history", []),
+            "saved_at": manifest.get("saved_at"),
+            "unpicklable_vars": unpicklable,
+        })
+
     def load_checkpoint(self, kernel: NotebookKernel, notebook_path: Path) -> Optional[dict]:
         """
         Load checkpoint for a notebook.
 
+        When both a full checkpoint and a delta checkpoint exist, the one
+        written most recently wins.
+
         Args:
             kernel: Kernel to restore into
             notebook_path: Path to the notebook
@@ -185,6 +402,90 @@ class SessionManager:
             Load info or None if no checkpoint exists
         """
         checkpoint_path = self.get_checkpoint_path(notebook_path)
+        manifest_path = self.get_manifest_path(notebook_path)
+
+        if manifest_path.exists() and (
+            not checkpoint_path.exists()
+            or manifest_path.stat().st_mtime >= checkpoint_path.stat().st_mtime
+        ):
+            return self.load_delta_checkpoint(kernel, manifest_path)
         if checkpoint_path.exists():
             return self.load_session(kernel, checkpoint_path)
         return None
+
+
+def _is_picklable(dill, value: Any) -> bool:
+    """Return whether dill can serialize value."""
+    try:
+        dill.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def _write_session_meta(path: Path, stat: os.stat_result, state: dict[str, Any]) -> None:
+    """Write a session file's listing sidecar; failures only cost a slower listing."""
+    meta = {
+        "saved_at": state.get("saved_at"),
+        "var_count": len(state.get("user_ns", {})),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "unpicklable_vars": state.get("unpicklable_vars", []),
+    }
+    try:
+        _write_atomic(_meta_path(path), json.dumps(meta, default=str).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def _meta_path(path: Path) -> Path:
+    """Sidecar JSON holding a session file's listing metadata."""
+    return path.with_name(path.name + ".meta.json")
+
+
+def _read_session_meta(path: str, stat: Optional[os.stat_result] = None) -> dict[str, Any]:
+    """Return a session file's listing info, from its sidecar when it is current."""
+    import dill
+
+    name = Path(path).stem
+    if stat is not None:
+        try:
+            with open(_meta_path(Path(path)), "rb") as f:
+                meta = json.loads(f.read())
+            if meta.get("mtime_ns") == stat.st_mtime_ns and meta.get("size") == stat.st_size:
+                return {
+                    "path": path,
+                    "name": name,
+                    "saved_at": meta.get("saved_at"),
+                    "var_count": meta.get("var_count", 0),
+                }
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    # No current sidecar, e.g. a file saved by an older version: unpickle it
+    # and write one for the next listing.
+    try:
+        with open(path, "rb") as f:
+            state = dill.load(f)
+        if stat is not None:
+            _write_session_meta(Path(path), stat, state)
+        return {
+            "path": path,
+            "name": name,
+            "saved_at": state.get("saved_at"),
+            "var_count": len(state.get("user_ns", {})),
+        }
+    except Exception as e:
+        return {
+            "path": path,
+            "name": name,
+            "error": str(e),
+        }
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write bytes to a temporary sibling file and rename it over path."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
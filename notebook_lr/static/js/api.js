@@ -1,6 +1,8 @@
 window.NB = window.NB || {};
 
 NB.api = (function() {
+  var RUN_ALL_POLL_INTERVAL = 500; // ms between background run-all polls
+
   async function _handleResponse(res, operation, eventId) {
     // Log response
     if (eventId && NB.agentLogger) {
@@ -82,7 +84,21 @@ NB.api = (function() {
     moveCell(index, direction) { return _post('/api/cell/move', { index: index, direction: direction }); },
     updateCell(index, source) { return _post('/api/cell/update', { index: index, source: source }); },
     executeCell(index, source) { return _post('/api/cell/execute', { index: index, source: source }); },
-    executeAll() { return _post('/api/execute-all', {}); },
+    async executeAll() {
+      // Run in the background and poll, so no request stays open for the
+      // whole notebook.
+      const job = await _post('/api/execute-all', { background: true });
+      const results = [];
+      for (;;) {
+        const status = await _get('/api/execute-all/status/' + job.job_id + '?since=' + results.length);
+        results.push.apply(results, status.results);
+        if (status.done) {
+          if (status.error) throw new Error(status.error);
+          return { results: results };
+        }
+        await new Promise(function (resolve) { setTimeout(resolve, RUN_ALL_POLL_INTERVAL); });
+      }
+    },
     save(includeSession) { return _post('/api/save', { include_session: includeSession }); },
     async load(file) {
       let eventId = null;
@@ -110,6 +126,9 @@ NB.api = (function() {
     addComment(cellId, data) {
       return _post('/api/cell/comment/add', Object.assign({ cell_id: cellId }, data));
     },
+    getCommentStatus(commentId) {
+      return _get('/api/cell/comment/status?id=' + encodeURIComponent(commentId));
+    },
     deleteComment(cellId, commentId) {
       return _post('/api/cell/comment/delete', { cell_id: cellId, comment_id: commentId });
     }
@@ -5,6 +5,7 @@ NB.comments = (function () {
   var commentMarkers = {};   // { cellId: { commentId: { marker, widget } } }
   var floatingBtn = null;    // singleton floating button
   var currentSelection = null; // { cm, cellId, from, to, text }
+  var COMMENT_POLL_INTERVAL = 1000; // ms between AI response status polls
 
   // ── Markdown Renderer (lightweight) ─────────────────────────────
   function renderMarkdown(text) {
@@ -261,7 +262,7 @@ NB.comments = (function () {
         selected_text: selectedText,
         user_comment: userComment,
         provider: selectedProvider
-      }).then(function (res) {
+      }).then(waitForComment).then(function (res) {
         // Complete AI call event with full response
         if (NB.agentLogger && aiEventId) {
           var isError = res.comment && res.comment.status === 'error';
@@ -390,6 +391,20 @@ NB.comments = (function () {
     return node;
   }
 
+  /**
+   * Poll until the server has the AI response for a newly added comment
+   */
+  function waitForComment(res) {
+    if (!res.ok || !res.comment || res.comment.status !== 'loading') {
+      return res;
+    }
+    return new Promise(function (resolve) {
+      setTimeout(resolve, COMMENT_POLL_INTERVAL);
+    }).then(function () {
+      return NB.api.getCommentStatus(res.comment.id);
+    }).then(waitForComment);
+  }
+
   function replaceFormWithResult(cm, cellId, formNode, marker, comment) {
     // Remove old widget that contains formNode
     var oldWidgetInfo = findWidgetByNode(cellId, formNode);
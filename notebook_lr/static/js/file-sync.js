@@ -11,6 +11,7 @@ NB.fileSync = (function() {
   var _isPolling = false;
   var _dialogOpen = false;
   var _lastSaveTime = 0;
+  var _forceNext = false;
 
   /**
    * Start polling for external changes
@@ -62,6 +63,8 @@ NB.fileSync = (function() {
           _timer = null;
         }
       } else if (_isPolling && !_timer && !_dialogOpen) {
+        // Compare file contents too when the tab comes back into view
+        _forceNext = true;
         _schedulePoll();
       }
     });
@@ -83,7 +86,9 @@ NB.fileSync = (function() {
     }
 
     try {
-      var res = await fetch('/api/notebook/check-updates');
+      var url = '/api/notebook/check-updates' + (_forceNext ? '?force=1' : '');
+      _forceNext = false;
+      var res = await fetch(url);
       var data = await res.json();
 
       if (data.changed) {
@@ -3,12 +3,49 @@ Utility functions for notebook-lr.
 """
 
 import re
+from functools import lru_cache
 from typing import Any
 from datetime import datetime
 
-from rich.syntax import Syntax
+from rich.syntax import PygmentsSyntaxTheme, Syntax
 from rich.text import Text
 
+from notebook_lr import json_utils
+
+
+@lru_cache(maxsize=None)
+def _get_lexer(name: str):
+    """Return a shared Pygments lexer configured the way Rich configures its own."""
+    from pygments.lexers import get_lexer_by_name
+
+    return get_lexer_by_name(name, stripnl=False, ensurenl=True)
+
+
+@lru_cache(maxsize=None)
+def _get_theme(name: str) -> PygmentsSyntaxTheme:
+    """Return a shared syntax theme built from a Pygments style."""
+    return PygmentsSyntaxTheme(name)
+
+
+def make_syntax(code: str, lexer: str = "python", theme: str = "monokai", **kwargs) -> Syntax:
+    """
+    Build a Syntax renderable that reuses one lexer and theme per name.
+
+    Passing lexer and theme names to Syntax makes Rich look up the Pygments
+    lexer and rebuild the style for every renderable; this resolves each
+    once per process.
+
+    Args:
+        code: Source code to highlight
+        lexer: Pygments lexer name
+        theme: Pygments style name
+        **kwargs: Extra Syntax options such as line_numbers
+
+    Returns:
+        Syntax renderable
+    """
+    return Syntax(code, _get_lexer(lexer), theme=_get_theme(theme), **kwargs)
+
 
 def format_output(output: dict[str, Any]) -> str:
     """
@@ -33,9 +70,8 @@ def format_output(output: dict[str, Any]) -> str:
         if "text/markdown" in data:
             return data["text/markdown"]
         if "application/json" in data:
-            import json
             val = data["application/json"]
-            return json.dumps(val, indent=2) if not isinstance(val, str) else val
+            return json_utils.dumps(val, indent=True).decode() if not isinstance(val, str) else val
         return data.get("text/plain", "")
 
     elif output_type == "error":
@@ -51,9 +87,8 @@ def format_output(output: dict[str, Any]) -> str:
         if "text/markdown" in data:
             return data["text/markdown"]
         if "application/json" in data:
-            import json
             val = data["application/json"]
-            return json.dumps(val, indent=2) if not isinstance(val, str) else val
+            return json_utils.dumps(val, indent=True).decode() if not isinstance(val, str) else val
         return data.get("text/plain", str(data))
 
     return str(output)
@@ -86,16 +121,15 @@ def format_rich_output(output: dict[str, Any]):
         if "text/markdown" in data:
             return Text(data["text/markdown"], style="cyan")
         if "application/json" in data:
-            import json
             val = data["application/json"]
-            text = json.dumps(val, indent=2) if not isinstance(val, str) else val
+            text = json_utils.dumps(val, indent=True).decode() if not isinstance(val, str) else val
             try:
-                return Syntax(text, "json", theme="monokai", line_numbers=False)
+                return make_syntax(text, "json", line_numbers=False)
             except Exception:
                 return Text(text, style="cyan")
         text = data.get("text/plain", "")
         try:
-            return Syntax(text, "python", theme="monokai", line_numbers=False)
+            return make_syntax(text, line_numbers=False)
         except Exception:
             return Text(text, style="cyan")
 
@@ -121,9 +155,8 @@ def format_rich_output(output: dict[str, Any]):
         if "text/markdown" in data:
             return Text(data["text/markdown"], style="cyan")
         if "application/json" in data:
-            import json
             val = data["application/json"]
-            text = json.dumps(val, indent=2) if not isinstance(val, str) else val
+            text = json_utils.dumps(val, indent=True).decode() if not isinstance(val, str) else val
             return Text(text, style="cyan")
         return Text(data.get("text/plain", str(data)), style="cyan")
 
@@ -154,6 +187,21 @@ def get_cell_status(cell) -> tuple[str, str]:
     return ("--", "dim")
 
 
+# Line-start markers that make text look like markdown, matched in one scan.
+_MARKDOWN_RE = re.compile(
+    r"^(?:"
+    r"#{1,6}\s+"  # Headers
+    r"|\*\*.*\*\*"  # Bold
+    r"|\*.*\*"  # Italic
+    r"|\[.*\]\(.*\)"  # Links
+    r"|```"  # Code blocks
+    r"|-\s+"  # Lists
+    r"|\d+\.\s+"  # Numbered lists
+    r")",
+    re.MULTILINE,
+)
+
+
 def is_markdown(text: str) -> bool:
     """
     Check if text appears to be markdown.
@@ -164,21 +212,19 @@ def is_markdown(text: str) -> bool:
     Returns:
         True if text looks like markdown
     """
-    markdown_patterns = [
-        r"^#{1,6}\s+",  # Headers
-        r"^\*\*.*\*\*",  # Bold
-        r"^\*.*\*",  # Italic
-        r"^\[.*\]\(.*\)",  # Links
-        r"^```",  # Code blocks
-        r"^-\s+",  # Lists
-        r"^\d+\.\s+",  # Numbered lists
-    ]
+    if len(text) > _MARKDOWN_CACHE_MAX_LEN:
+        return _MARKDOWN_RE.search(text) is not None
+    return _is_markdown_cached(text)
+
+
+# Sources longer than this are scanned directly rather than kept in the cache.
+_MARKDOWN_CACHE_MAX_LEN = 4096
 
-    for pattern in markdown_patterns:
-        if re.search(pattern, text, re.MULTILINE):
-            return True
 
-    return False
+@lru_cache(maxsize=1024)
+def _is_markdown_cached(text: str) -> bool:
+    """Memoized is_markdown for texts short enough to keep in the cache."""
+    return _MARKDOWN_RE.search(text) is not None
 
 
 def truncate_text(text: str, max_length: int = 100) -> str:
@@ -193,6 +239,7 @@ def get_timestamp() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+@lru_cache(maxsize=1024)
 def sanitize_variable_name(name: str) -> str:
     """
     Sanitize a variable name to be valid Python.
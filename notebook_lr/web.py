@@ -2,16 +2,202 @@
 Web interface for notebook-lr using Flask.
 """
 
+import concurrent.futures
+import gzip
+import hashlib
 import os
+import reprlib
+import shutil
+import stat
 import sys
-import tempfile
+import threading
+import time
+import uuid
+import zlib
 from pathlib import Path
 from typing import Optional
 
+from pydantic import TypeAdapter
+
 from notebook_lr import NotebookKernel, Notebook, Cell, CellType, Comment, SessionManager
+from notebook_lr import json_utils
+from notebook_lr.autosave import DebouncedSaver
 from notebook_lr.utils import format_output
 
 
+# Dumps a whole comment list in one call rather than one model_dump per comment.
+_COMMENTS_ADAPTER = TypeAdapter(list[Comment])
+# How long a stat of the notebook file is reused by check-updates polls.
+_STAT_TTL = 0.5
+# Bytes hashed from each end of the file by a forced check-updates.
+_FINGERPRINT_CHUNK = 4096
+# Cache-Control for static assets requested with their current ?v= hash.
+_STATIC_IMMUTABLE = "public, max-age=31536000, immutable"
+# JSON responses smaller than this are not worth gzipping.
+_GZIP_MIN_SIZE = 1024
+# Request threads when serving with waitress.
+_SERVER_THREADS = 8
+# Concurrent AI comment requests; each one waits on a CLI subprocess.
+_AI_WORKERS = 8
+# Seconds to wait after the last edit before auto-saving; 0 saves on every edit.
+_AUTO_SAVE_DELAY = float(os.environ.get("NOTEBOOK_LR_SAVE_DELAY") or 0)
+# Seconds a provider's environment (which may cost a shell spawn) is reused.
+_PROVIDER_ENV_TTL = 60.0
+# Seconds a finished background run-all stays pollable before it is dropped.
+_RUN_ALL_JOB_TTL = 300.0
+
+
+# Bounded repr for the variables panel: containers and strings are cut while
+# being formatted instead of after a full repr().
+_short_repr = reprlib.Repr()
+_short_repr.maxstring = _short_repr.maxother = 197
+_short_repr.maxlist = _short_repr.maxtuple = _short_repr.maxset = 10
+_short_repr.maxdict = 10
+# Array libraries whose values are summarized by shape instead of repr.
+_SHAPE_SUMMARY_MODULES = {"numpy", "pandas"}
+
+
+def _variable_repr(value) -> str:
+    """Short display string for a namespace value, at most 200 characters."""
+    cls = type(value)
+    if cls.__module__.partition(".")[0] in _SHAPE_SUMMARY_MODULES and hasattr(value, "shape"):
+        return f"<{cls.__name__} shape={value.shape}>"
+    try:
+        val_repr = _short_repr.repr(value)
+    except Exception:
+        return "<unable to repr>"
+    if len(val_repr) > 200:
+        val_repr = val_repr[:197] + "..."
+    return val_repr
+
+
+# Fixed instructions appended to every comment prompt, pre-encoded for stdin.
+_PROMPT_GUIDANCE = """
+
+## 중요 안내
+
+당신은 노트북을 직접 수정할 수 없습니다. MCP 도구에 접근할 수 없습니다.
+절대로 "수정했습니다", "분할했습니다", "변경을 적용했습니다" 등 직접 수정한 것처럼 답변하지 마세요.
+
+대신 다음과 같이 답변해주세요:
+- 코드에 대한 설명, 분석, 개선 제안
+- 수정이 필요한 경우: 수정된 코드를 코드 블록으로 제시하고, 사용자가 직접 적용하도록 안내
+- 셀 분할이 필요한 경우: 각 셀의 코드를 별도 코드 블록으로 제시
+
+선택된 코드에 대해 교육적인 답변을 한국어로 제공해주세요.""".encode()
+
+_claude_bin: Optional[str] = None
+
+
+def _claude_command() -> str:
+    """Return the claude CLI path, resolved on PATH once it has been found."""
+    global _claude_bin
+    if _claude_bin is None:
+        _claude_bin = shutil.which("claude")
+    # Fall back to the bare name so a missing CLI still raises FileNotFoundError.
+    return _claude_bin or "claude"
+
+
+def _file_fingerprint(path: str, size: int) -> bytes:
+    """
+    Cheaply fingerprint a file from its size and its first and last 4KB.
+
+    Used to notice edits that leave the mtime unchanged, e.g. on
+    filesystems with coarse or pinned timestamps.
+    """
+    h = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(_FINGERPRINT_CHUNK))
+        if size > _FINGERPRINT_CHUNK:
+            f.seek(max(size - _FINGERPRINT_CHUNK, _FINGERPRINT_CHUNK))
+            h.update(f.read(_FINGERPRINT_CHUNK))
+    return h.digest()
+
+
+def _static_etags(static_dir: Path) -> dict[str, str]:
+    """Map each file's /static/ URL path to a short hash of its contents."""
+    etags = {}
+    for path in static_dir.rglob("*"):
+        if path.is_file():
+            digest = hashlib.blake2b(path.read_bytes(), digest_size=8).hexdigest()
+            etags["/static/" + path.relative_to(static_dir).as_posix()] = digest
+    return etags
+
+
+def _cell_summary(cell: Cell, label: str) -> str:
+    """Label, type and first three source lines of a cell, for AI context."""
+    preview = "\n".join(cell.source.splitlines()[:3])
+    return f"{label} (유형: {cell.type.value}):\n{preview}"
+
+
+def _gzip_chunks(chunks):
+    """Gzip a streamed response body chunk by chunk."""
+    compressor = zlib.compressobj(1, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _serve(app, host: str, port: int) -> None:
+    """
+    Serve the app until interrupted.
+
+    Uses waitress when it is installed (``pip install notebook-lr[serve]``),
+    otherwise Flask's threaded development server.
+    """
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host=host, port=port, debug=False, threaded=True)
+        return
+    serve(app, host=host, port=port, threads=_SERVER_THREADS, connection_limit=200)
+
+
+def _make_json_provider(app):
+    """
+    Build a Flask JSON provider that encodes responses with orjson.
+
+    Returns None when orjson is not installed, leaving Flask's default
+    provider in place. Dates, Decimals and other values orjson does not
+    handle the way Flask does are passed to Flask's own default hook, so
+    responses look the same either way.
+    """
+    orjson = json_utils.orjson
+    if orjson is None:
+        return None
+    from flask.json.provider import DefaultJSONProvider
+
+    base_option = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    class OrjsonProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            # jsonify only ever passes indent (debug) or compact separators.
+            if set(kwargs) - {"indent", "separators"}:
+                return super().dumps(obj, **kwargs)
+            option = base_option
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get("indent"):
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode()
+            except TypeError:
+                return super().dumps(obj, **kwargs)
+
+        def loads(self, s, **kwargs):
+            if kwargs:
+                return super().loads(s, **kwargs)
+            return json_utils.loads(s)
+
+    return OrjsonProvider(app)
+
+
 def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
     """
     Launch the Flask web interface.
@@ -20,7 +206,7 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
         notebook: Optional notebook to load
         share: Whether to create a public share link (unused for Flask, kept for API compat)
     """
-    from flask import Flask, render_template, request, jsonify
+    from flask import Flask, Response, abort, render_template, request, jsonify
 
     kernel = NotebookKernel()
     session_manager = SessionManager()
@@ -40,17 +226,84 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
 
     # Track file mtime for external change detection
     _last_file_mtime = 0.0
-    if notebook.metadata.get("path") and os.path.isfile(notebook.metadata["path"]):
-        _last_file_mtime = os.path.getmtime(notebook.metadata["path"])
+    _last_file_fingerprint = None
+    # path -> (expires_at, stat_result or None), shared by check-updates polls
+    _stat_cache = {}
+
+    def _stat_file(path, fresh=False):
+        """Stat a regular file, reusing a recent result unless fresh is set."""
+        now = time.monotonic()
+        if not fresh:
+            cached = _stat_cache.get(path)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        else:
+            if not stat.S_ISREG(st.st_mode):
+                st = None
+        _stat_cache.clear()
+        _stat_cache[path] = (now + _STAT_TTL, st)
+        return st
+
+    def _record_file_state(path):
+        """Remember the file's current mtime and fingerprint as seen."""
+        nonlocal _last_file_mtime, _last_file_fingerprint
+        st = _stat_file(path, fresh=True)
+        # Let the next poll stat again so later external edits are not hidden.
+        _stat_cache.pop(path, None)
+        if st is None:
+            return None
+        _last_file_mtime = st.st_mtime
+        try:
+            _last_file_fingerprint = _file_fingerprint(path, st.st_size)
+        except OSError:
+            _last_file_fingerprint = None
+        return st
+
+    if notebook.metadata.get("path"):
+        _record_file_state(notebook.metadata["path"])
 
     tmpl_dir = Path(__file__).parent / "templates"
     static_dir = Path(__file__).parent / "static"
     app = Flask(__name__, template_folder=str(tmpl_dir), static_folder=str(static_dir))
+    json_provider = _make_json_provider(app)
+    if json_provider is not None:
+        app.json = json_provider
+    # The browser doesn't care about key order or indentation.
+    app.json.sort_keys = False
+    app.json.compact = True
 
     # ------------------------------------------------------------------ #
     # Helper
     # ------------------------------------------------------------------ #
 
+    def _json_body() -> dict:
+        """Decode the request body as JSON; an empty or null body reads as {}."""
+        # Each route reads its body once, so don't keep a copy on the request.
+        raw = request.get_data(cache=False)
+        if not raw:
+            return {}
+        try:
+            data = json_utils.loads(raw)
+        except ValueError:
+            abort(400)  # what request.get_json would raise
+        return data or {}
+
+    # id(cell) -> (cell, cell._version, dumped comments). Routes replace a
+    # cell's comment list instead of mutating it, so the version bump on
+    # assignment is enough to invalidate an entry.
+    _comments_cache: dict[int, tuple[Cell, int, list]] = {}
+
+    def _dump_comments(cell: Cell) -> list:
+        hit = _comments_cache.get(id(cell))
+        if hit is None or hit[0] is not cell or hit[1] != cell._version:
+            hit = (cell, cell._version, _COMMENTS_ADAPTER.dump_python(cell.comments))
+            _comments_cache[id(cell)] = hit
+        return hit[2]
+
     def _cell_dict(cell: Cell, index: int) -> dict:
         return {
             "index": index,
@@ -59,27 +312,136 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
             "source": cell.source,
             "outputs": cell.outputs,
             "execution_count": cell.execution_count,
-            "comments": [c.model_dump() for c in cell.comments],
+            "comments": _dump_comments(cell),
         }
 
+    def _prune_comments_cache() -> None:
+        """Drop cached comment dumps for cells no longer in the notebook."""
+        if len(_comments_cache) > len(notebook.cells):
+            live = {id(c) for c in notebook.cells}
+            for key in [k for k in _comments_cache if k not in live]:
+                del _comments_cache[key]
+
+    def _cell_dicts() -> list[dict]:
+        """Serialize every cell, dropping cache entries for cells no longer present."""
+        cells = [_cell_dict(c, i) for i, c in enumerate(notebook.cells)]
+        _prune_comments_cache()
+        return cells
+
     def _format_outputs(outputs: list) -> tuple[str, str]:
         """Return (output_text, error_text) for a list of output dicts."""
-        output_text = ""
-        error_text = ""
+        output_parts = []
+        error_parts = []
         for output in outputs:
-            text = format_output(output)
-            if output.get("type") == "error":
-                error_text += text + "\n"
-            else:
-                output_text += text + "\n"
-        return output_text.strip(), error_text.strip()
+            parts = error_parts if output.get("type") == "error" else output_parts
+            parts.append(format_output(output))
+        return "\n".join(output_parts).strip(), "\n".join(error_parts).strip()
 
-    def _auto_save_if_path():
-        nonlocal _last_file_mtime
+    def _write_notebook():
+        """Write the notebook to its path and remember the file state."""
         path = notebook.metadata.get("path")
         if path:
             notebook.save(Path(path))
-            _last_file_mtime = os.path.getmtime(path)
+            _record_file_state(path)
+
+    _saver = DebouncedSaver(_write_notebook)
+
+    def _auto_save_if_path():
+        if notebook.metadata.get("path"):
+            _saver.request(_AUTO_SAVE_DELAY)
+
+    # Running cell counts for /api/notebook-info, kept up to date by the
+    # routes that add, delete or execute cells. None means "recount".
+    _counts: Optional[dict] = None
+    _counted: tuple = (None, -1)  # (notebook, cell count) the counts match
+
+    def _cell_counts() -> dict:
+        nonlocal _counts, _counted
+        if _counts is None or _counted != (notebook, len(notebook.cells)):
+            code = executed = 0
+            for c in notebook.cells:
+                if c.type == CellType.CODE:
+                    code += 1
+                if c.execution_count is not None:
+                    executed += 1
+            _counts = {"code": code, "executed": executed}
+            _counted = (notebook, len(notebook.cells))
+        return _counts
+
+    def _count_cell(cell: Cell, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a just inserted/removed cell."""
+        nonlocal _counts, _counted
+        if _counts is None:
+            return
+        if _counted != (notebook, len(notebook.cells) - sign):
+            _counts = None  # cells changed behind our back; recount next time
+            return
+        if cell.type == CellType.CODE:
+            _counts["code"] += sign
+        if cell.execution_count is not None:
+            _counts["executed"] += sign
+        _counted = (notebook, len(notebook.cells))
+
+    def _store_result(cell: Cell, result) -> None:
+        """Record an execution result on a cell and in the running counts."""
+        if _counts is not None and cell.execution_count is None and result.execution_count is not None:
+            _counts["executed"] += 1
+        cell.outputs = result.outputs
+        cell.execution_count = result.execution_count
+
+    # Static files don't change while the server runs, so their ETags are
+    # computed once. Templates link them with ?v=<etag> (the "versioned"
+    # filter), which lets browsers cache those URLs for good.
+    static_etags = _static_etags(static_dir)
+
+    @app.template_filter("versioned")
+    def _versioned_url(url: str) -> str:
+        etag = static_etags.get(url)
+        return url if etag is None else f"{url}?v={etag}"
+
+    def _static_cache_headers(response, etag: str):
+        response.set_etag(etag)
+        if request.args.get("v") == etag:
+            response.headers["Cache-Control"] = _STATIC_IMMUTABLE
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    @app.before_request
+    def _static_not_modified():
+        """Answer a revalidation of an unchanged static file without touching it."""
+        etag = static_etags.get(request.path)
+        if etag is not None and request.if_none_match.contains_weak(etag):
+            return _static_cache_headers(app.response_class(status=304), etag)
+
+    @app.after_request
+    def _static_etag(response):
+        etag = static_etags.get(request.path)
+        if etag is not None and response.status_code == 200:
+            _static_cache_headers(response, etag)
+        return response
+
+    @app.after_request
+    def _compress_json(response):
+        """Gzip JSON responses for clients that accept it, at the fastest level."""
+        if (
+            response.mimetype != "application/json"
+            or response.status_code < 200
+            or "Content-Encoding" in response.headers
+            or "gzip" not in request.accept_encodings
+        ):
+            return response
+        if response.is_streamed:
+            response.response = _gzip_chunks(response.response)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < _GZIP_MIN_SIZE:
+                return response
+            response.set_data(gzip.compress(data, compresslevel=1))
+        response.headers["Content-Encoding"] = "gzip"
+        response.vary.add("Accept-Encoding")
+        return response
 
     # ------------------------------------------------------------------ #
     # Routes
@@ -93,16 +455,26 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
 
     @app.route("/api/notebook", methods=["GET"])
     def api_notebook():
-        cells = [_cell_dict(c, i) for i, c in enumerate(notebook.cells)]
-        return jsonify({
-            "version": notebook.version,
-            "metadata": notebook.metadata,
-            "cells": cells,
-        })
+        _prune_comments_cache()
+        # Encode one cell at a time so a large notebook is never held as a
+        # second full copy of dicts plus its encoded document.
+        version = notebook.version
+        metadata = notebook.metadata
+        cells = list(notebook.cells)
+
+        def generate():
+            yield b'{"version":' + json_utils.dumps(version)
+            yield b',"metadata":' + json_utils.dumps(metadata)
+            yield b',"cells":['
+            for i, cell in enumerate(cells):
+                yield (b"," if i else b"") + json_utils.dumps(_cell_dict(cell, i))
+            yield b"]}"
+
+        return Response(generate(), mimetype="application/json")
 
     @app.route("/api/cell/add", methods=["POST"])
     def api_cell_add():
-        data = request.get_json(force=True) or {}
+        data = _json_body()
         after_index = data.get("after_index")
         cell_type_str = data.get("type", "code")
         ct = CellType.CODE if cell_type_str == "code" else CellType.MARKDOWN
@@ -114,22 +486,23 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
             new_idx = len(notebook.cells)
 
         notebook.insert_cell(new_idx, cell)
+        _count_cell(cell, 1)
         _auto_save_if_path()
         return jsonify({"cell": _cell_dict(cell, new_idx), "index": new_idx})
 
     @app.route("/api/cell/delete", methods=["POST"])
     def api_cell_delete():
-        data = request.get_json(force=True) or {}
+        data = _json_body()
         index = int(data.get("index", -1))
         if 0 <= index < len(notebook.cells):
-            notebook.remove_cell(index)
+            _count_cell(notebook.remove_cell(index), -1)
             _auto_save_if_path()
             return jsonify({"ok": True})
         return jsonify({"ok": False, "error": "index out of range"}), 400
 
     @app.route("/api/cell/move", methods=["POST"])
     def api_cell_move():
-        data = request.get_json(force=True) or {}
+        data = _json_body()
         index = int(data.get("index", -1))
         direction = data.get("direction", "up")
 
@@ -156,7 +529,7 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
 
     @app.route("/api/cell/update", methods=["POST"])
     def api_cell_update():
-        data = request.get_json(force=True) or {}
+        data = _json_body()
         index = int(data.get("index", -1))
         source = data.get("source", "")
         if 0 <= index < len(notebook.cells):
@@ -165,9 +538,19 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
             return jsonify({"ok": True})
         return jsonify({"ok": False, "error": "index out of range"}), 400
 
+    # Everything that runs code in the kernel goes through this one worker:
+    # the IPython shell and its stdout capture are not safe to use from two
+    # threads at once, whether the request waits for the result or not.
+    # Held around each cell execution and around kernel.reset(), which runs
+    # on the request thread (IPython's history database is bound to it).
+    _kernel_lock = threading.Lock()
+    _exec_pool = concurrent.futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="notebook-lr-kernel"
+    )
+
     @app.route("/api/cell/execute", methods=["POST"])
     def api_cell_execute():
-        data = request.get_json(force=True) or {}
+        data = _json_body()
         index = int(data.get("index", -1))
         source = data.get("source", None)
 
@@ -186,29 +569,82 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
                 "error": None,
             })
 
-        result = kernel.execute_cell(cell.source)
-        cell.outputs = result.outputs
-        cell.execution_count = result.execution_count
+        result = _exec_pool.submit(_execute_locked, cell.source).result()
+        _store_result(cell, result)
         _auto_save_if_path()
 
         output_text, error_text = _format_outputs(result.outputs)
-        return jsonify({
-            "outputs": result.outputs,
+        payload = {
             "execution_count": result.execution_count,
             "success": result.success,
             "error": result.error,
             "output_text": output_text,
             "error_text": error_text,
-        })
-
-    @app.route("/api/execute-all", methods=["POST"])
-    def api_execute_all():
-        results = []
-        for i, cell in enumerate(notebook.cells):
+        }
+        # ?raw=0 is for text-only clients; the raw outputs can be large and
+        # repeat what output_text/error_text already carry.
+        if request.args.get("raw") not in ("0", "false"):
+            payload["outputs"] = result.outputs
+        return jsonify(payload)
+
+    # (notebook, kernel.execution_count, [(cell id, source digest), ...]) for
+    # the code cells the last run-all completed, in order. Only valid while
+    # nothing else has run in the kernel since.
+    _last_run_all: Optional[tuple[Notebook, int, list[tuple[str, bytes]]]] = None
+    # Bumped by every kernel reset; a run-all that straddles one must not
+    # record _last_run_all for cells whose state the reset wiped.
+    _kernel_generation = 0
+
+    def _execute_locked(source: str):
+        with _kernel_lock:
+            return kernel.execute_cell(source)
+
+    # job id -> (future, results so far) for background run-alls
+    _run_all_jobs: dict[str, tuple[concurrent.futures.Future, list]] = {}
+    # job id -> monotonic time after which a finished job is dropped
+    _run_all_expiry: dict[str, float] = {}
+
+    def _expire_run_all_jobs() -> None:
+        """Drop finished run-all jobs nobody polled within _RUN_ALL_JOB_TTL."""
+        now = time.monotonic()
+        for job_id in [j for j, t in list(_run_all_expiry.items()) if t <= now]:
+            _run_all_jobs.pop(job_id, None)
+            _run_all_expiry.pop(job_id, None)
+
+    def _run_all(skip_unchanged: bool, results: list) -> None:
+        """Execute the notebook's code cells in order, appending each result."""
+        nonlocal _last_run_all
+        nb = notebook
+        generation = _kernel_generation
+        # skip_unchanged reuses the outputs of the leading cells whose source
+        # is unchanged since the last run-all; everything after the first
+        # changed cell runs again, since it may depend on it.
+        reusable = []
+        if skip_unchanged and _last_run_all is not None:
+            last_nb, count, entries = _last_run_all
+            if last_nb is nb and count == kernel.execution_count:
+                reusable = entries
+        completed = []
+        for i, cell in enumerate(list(nb.cells)):
             if cell.type == CellType.CODE and cell.source.strip():
-                result = kernel.execute_cell(cell.source)
-                cell.outputs = result.outputs
-                cell.execution_count = result.execution_count
+                entry = (cell.id, hashlib.blake2b(cell.source.encode(), digest_size=16).digest())
+                if len(completed) < len(reusable) and reusable[len(completed)] == entry:
+                    completed.append(entry)
+                    output_text, error_text = _format_outputs(cell.outputs)
+                    results.append({
+                        "index": i,
+                        "outputs": cell.outputs,
+                        "execution_count": cell.execution_count,
+                        "success": True,
+                        "error": None,
+                        "output_text": output_text,
+                        "error_text": error_text,
+                        "skipped": True,
+                    })
+                    continue
+                reusable = []
+                result = _execute_locked(cell.source)
+                _store_result(cell, result)
 
                 output_text, error_text = _format_outputs(result.outputs)
                 results.append({
@@ -222,29 +658,72 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
                 })
                 if not result.success:
                     break
+                completed.append(entry)
 
-        return jsonify({"results": results})
+        with _kernel_lock:
+            if generation == _kernel_generation:
+                _last_run_all = (nb, kernel.execution_count, completed)
+
+    @app.route("/api/execute-all", methods=["POST"])
+    def api_execute_all():
+        data = _json_body()
+        skip_unchanged = bool(data.get("skip_unchanged"))
+        results = []
+        future = _exec_pool.submit(_run_all, skip_unchanged, results)
+        if not data.get("background"):
+            future.result()
+            return jsonify({"results": results})
+
+        _expire_run_all_jobs()
+        job_id = uuid.uuid4().hex
+        _run_all_jobs[job_id] = (future, results)
+        future.add_done_callback(
+            lambda _f: _run_all_expiry.__setitem__(job_id, time.monotonic() + _RUN_ALL_JOB_TTL)
+        )
+        return jsonify({"job_id": job_id})
+
+    @app.route("/api/execute-all/status/<job_id>", methods=["GET"])
+    def api_execute_all_status(job_id):
+        """Results of a background run-all from index ?since= on, and whether it finished."""
+        job = _run_all_jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "unknown job"}), 404
+        future, results = job
+        since = request.args.get("since", 0, type=int)
+        done = future.done()
+        # Read the results only after checking done, so a finished job's
+        # last results are always included.
+        response = {"results": results[since:], "done": done}
+        if done:
+            _run_all_jobs.pop(job_id, None)
+            _run_all_expiry.pop(job_id, None)
+            error = future.exception()
+            if error is not None:
+                logger.error("Run-all failed: %s", error)
+                response["error"] = str(error)
+        return jsonify(response)
 
     @app.route("/api/save", methods=["POST"])
     def api_save():
-        nonlocal _last_file_mtime
-        data = request.get_json(force=True) or {}
+        data = _json_body()
         include_session = bool(data.get("include_session", False))
         path = notebook.metadata.get("path", "notebook.nblr")
+        with _saver.lock:
+            _saver.cancel()
+
+            if include_session:
+                session_data = {
+                    "user_ns": kernel.get_namespace(),
+                    "execution_count": kernel.execution_count,
+                }
+                notebook.save(
+                    Path(path), include_session=True, session_data=session_data
+                )
+                session_manager.save_checkpoint(kernel, Path(path))
+            else:
+                notebook.save(Path(path))
 
-        if include_session:
-            session_data = {
-                "user_ns": kernel.get_namespace(),
-                "execution_count": kernel.execution_count,
-            }
-            notebook.save(
-                Path(path), include_session=True, session_data=session_data
-            )
-            session_manager.save_checkpoint(kernel, Path(path))
-        else:
-            notebook.save(Path(path))
-
-        _last_file_mtime = os.path.getmtime(path)
+            _record_file_state(path)
         return jsonify({
             "status": "saved" + (" (with session)" if include_session else ""),
             "path": path,
@@ -253,7 +732,7 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
 
     @app.route("/api/load", methods=["POST"])
     def api_load():
-        nonlocal notebook, _last_file_mtime
+        nonlocal notebook, _last_file_mtime, _last_file_fingerprint
         if "file" not in request.files:
             return jsonify({"error": "no file provided"}), 400
 
@@ -261,17 +740,15 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
         if not file.filename:
             return jsonify({"error": "empty filename"}), 400
 
-        suffix = Path(file.filename).suffix or ".nblr"
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            file.save(tmp.name)
-            tmp_path = Path(tmp.name)
-
-        notebook = Notebook.load(tmp_path)
+        # Werkzeug already buffers the upload (spooling large ones to disk),
+        # so parse it from there instead of copying it to a temp file first.
+        _saver.cancel()
+        notebook = Notebook.from_json(file.stream.read())
         notebook.metadata["path"] = file.filename
-        tmp_path.unlink(missing_ok=True)
         _last_file_mtime = 0.0
+        _last_file_fingerprint = None
 
-        cells = [_cell_dict(c, i) for i, c in enumerate(notebook.cells)]
+        cells = _cell_dicts()
         return jsonify({"cells": cells, "metadata": notebook.metadata})
 
     @app.route("/api/variables", methods=["GET"])
@@ -280,27 +757,30 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
         variables = []
         for name in sorted(names):
             value = kernel.get_variable(name)
-            var_type = type(value).__name__
-            val_repr = repr(value)
-            if len(val_repr) > 200:
-                val_repr = val_repr[:197] + "..."
-            variables.append({"name": name, "type": var_type, "value": val_repr})
+            variables.append({
+                "name": name,
+                "type": type(value).__name__,
+                "value": _variable_repr(value),
+            })
         return jsonify({"variables": variables})
 
     @app.route("/api/clear-variables", methods=["POST"])
     def api_clear_variables():
-        kernel.reset()
+        nonlocal _last_run_all, _kernel_generation
+        with _kernel_lock:
+            kernel.reset()
+            _kernel_generation += 1
+            _last_run_all = None
         return jsonify({"ok": True})
 
     @app.route("/api/notebook-info", methods=["GET"])
     def api_notebook_info():
         name = notebook.metadata.get("name", "Untitled")
         cell_count = len(notebook.cells)
-        code_count = sum(1 for c in notebook.cells if c.type == CellType.CODE)
+        counts = _cell_counts()
+        code_count = counts["code"]
+        executed_count = counts["executed"]
         md_count = cell_count - code_count
-        executed_count = sum(
-            1 for c in notebook.cells if c.execution_count is not None
-        )
         return jsonify({
             "name": name,
             "cell_count": cell_count,
@@ -311,41 +791,50 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
 
     @app.route("/api/notebook/check-updates", methods=["GET"])
     def api_check_updates():
-        nonlocal _last_file_mtime
         path = notebook.metadata.get("path")
-        if not path or not os.path.isfile(path):
+        if not path:
             return jsonify({"changed": False})
-
-        current_mtime = os.path.getmtime(path)
-        if current_mtime == _last_file_mtime:
+        # ?force=1 skips the stat cache and also compares file contents,
+        # catching edits that did not move the mtime.
+        force = request.args.get("force") in ("1", "true")
+        st = _stat_file(path, fresh=force)
+        if st is None:
             return jsonify({"changed": False})
 
+        if st.st_mtime == _last_file_mtime:
+            if not force or _last_file_fingerprint is None:
+                return jsonify({"changed": False})
+            try:
+                fingerprint = _file_fingerprint(path, st.st_size)
+            except OSError:
+                return jsonify({"changed": False})
+            if fingerprint == _last_file_fingerprint:
+                return jsonify({"changed": False})
+
         # File changed externally - report only, do NOT reload
         return jsonify({"changed": True})
 
     @app.route("/api/notebook/reload", methods=["POST"])
     def api_reload():
         """Explicitly reload notebook from disk (used after user confirms reload)."""
-        nonlocal notebook, _last_file_mtime
+        nonlocal notebook
         path = notebook.metadata.get("path")
-        if not path or not os.path.isfile(path):
+        if not path or _record_file_state(path) is None:
             return jsonify({"error": "no file path available"}), 400
 
-        _last_file_mtime = os.path.getmtime(path)
+        _saver.cancel()
         notebook = Notebook.load(Path(path))
         notebook.metadata["path"] = path
-        cells = [_cell_dict(c, i) for i, c in enumerate(notebook.cells)]
+        cells = _cell_dicts()
         return jsonify({"cells": cells, "metadata": notebook.metadata, "mtime": _last_file_mtime})
 
     @app.route("/api/notebook/acknowledge", methods=["POST"])
     def api_acknowledge():
         """Acknowledge external change without reloading (user chose 'Keep mine')."""
-        nonlocal _last_file_mtime
         path = notebook.metadata.get("path")
-        if not path or not os.path.isfile(path):
+        if not path or _record_file_state(path) is None:
             return jsonify({"error": "no file path available"}), 400
 
-        _last_file_mtime = os.path.getmtime(path)
         return jsonify({"acknowledged": True, "mtime": _last_file_mtime})
 
     # ------------------------------------------------------------------ #
@@ -354,11 +843,26 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
     import logging
     logger = logging.getLogger(__name__)
 
+    # cell id -> position in notebook.cells. Cells are also inserted, moved
+    # and replaced outside these routes, so a hit is checked against the
+    # list and any mismatch or miss rebuilds the map.
+    _id_positions: dict[str, int] = {}
+
+    def _index_of(cell_id: str) -> Optional[int]:
+        nonlocal _id_positions
+        cells = notebook.cells
+        i = _id_positions.get(cell_id)
+        if i is not None and i < len(cells) and cells[i].id == cell_id:
+            return i
+        positions = {}
+        for i, c in enumerate(cells):
+            positions.setdefault(c.id, i)
+        _id_positions = positions
+        return positions.get(cell_id)
+
     def _find_cell_by_id(cell_id: str) -> Optional[Cell]:
-        for cell in notebook.cells:
-            if cell.id == cell_id:
-                return cell
-        return None
+        i = _index_of(cell_id)
+        return None if i is None else notebook.cells[i]
 
     def _load_gt_env(provider_cmd: str) -> dict:
         """Source ~/gl-switcher/gt.sh, run 'gt <cmd>', return ANTHROPIC_*/API_TIMEOUT_* vars."""
@@ -386,9 +890,26 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
 
     _PLACEHOLDER_TOKENS = {"your-z-ai-token-here", "your-kimi-token-here"}
 
+    # provider -> (built_at, env); only successfully built envs are cached
+    _provider_env_cache: dict[str, tuple[float, dict]] = {}
+
     def _build_provider_env(provider: str) -> dict:
+        """
+        Return the subprocess env for a provider, rebuilt at most once a minute.
+
+        The dict is shared between calls and must be treated as read-only;
+        it is only ever handed to subprocess.run.
+        """
+        cached = _provider_env_cache.get(provider)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < _PROVIDER_ENV_TTL:
+            return cached[1]
+        env = _make_provider_env(provider)
+        _provider_env_cache[provider] = (now, env)
+        return env
+
+    def _make_provider_env(provider: str) -> dict:
         """Build environment dict for subprocess based on provider."""
-        import os
         env = os.environ.copy()
 
         if provider == "claude":
@@ -414,12 +935,11 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
 
     def _build_comment_context(nb, cell: Cell, cell_id: str) -> str:
         """Build rich context string about the cell and its surroundings."""
-        # Find cell index
-        index = None
-        for i, c in enumerate(nb.cells):
-            if c.id == cell_id:
-                index = i
-                break
+        if nb is notebook:
+            index = _index_of(cell_id)
+        else:
+            # The position map only tracks the live notebook.
+            index = next((i for i, c in enumerate(nb.cells) if c.id == cell_id), None)
         total = len(nb.cells)
 
         lines = []
@@ -428,17 +948,11 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
         lines.append(f"셀 유형: {cell.type.value}")
 
         # Neighboring cells summary
-        def cell_summary(c: Cell, label: str) -> str:
-            src_lines = c.source.splitlines()[:3]
-            preview = "\n".join(src_lines)
-            return f"{label} (유형: {c.type.value}):\n{preview}"
-
-        if index is not None and index > 0:
-            prev_cell = nb.cells[index - 1]
-            lines.append(cell_summary(prev_cell, "이전 셀"))
-        if index is not None and index < total - 1:
-            next_cell = nb.cells[index + 1]
-            lines.append(cell_summary(next_cell, "다음 셀"))
+        if index is not None:
+            if index > 0:
+                lines.append(_cell_summary(nb.cells[index - 1], "이전 셀"))
+            if index < total - 1:
+                lines.append(_cell_summary(nb.cells[index + 1], "다음 셀"))
 
         # Cell outputs
         if cell.outputs:
@@ -448,70 +962,97 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
             lines.append(f"셀 출력:\n{outputs_repr}")
 
         # Other comments on same cell
-        other_comments = [c for c in cell.comments]
-        if other_comments:
+        if cell.comments:
             lines.append("이 셀의 기존 코멘트:")
-            for cm in other_comments:
-                lines.append(f"  - [{cm.status}] 사용자: {cm.user_comment}")
+            lines.extend(f"  - [{cm.status}] 사용자: {cm.user_comment}" for cm in cell.comments)
 
         return "\n\n".join(lines)
 
-    def _call_ai(cell_source: str, selected_text: str, user_comment: str, provider: str = "claude", context: str = "") -> str:
+    def _call_ai(cell_source: str, selected_text: str, user_comment: str, provider: str = "claude", context: str = "", env: Optional[dict] = None) -> str:
         import subprocess
 
         context_section = f"\n\n## 노트북 컨텍스트\n{context}" if context else ""
 
-        prompt = f"""다음은 Python 노트북 셀의 전체 코드입니다:
-
-```python
-{cell_source}
-```
-
-사용자가 다음 부분을 선택했습니다:
-```
-{selected_text}
-```
-
-사용자의 질문: {user_comment}{context_section}
-
-## 중요 안내
-
-당신은 노트북을 직접 수정할 수 없습니다. MCP 도구에 접근할 수 없습니다.
-절대로 "수정했습니다", "분할했습니다", "변경을 적용했습니다" 등 직접 수정한 것처럼 답변하지 마세요.
-
-대신 다음과 같이 답변해주세요:
-- 코드에 대한 설명, 분석, 개선 제안
-- 수정이 필요한 경우: 수정된 코드를 코드 블록으로 제시하고, 사용자가 직접 적용하도록 안내
-- 셀 분할이 필요한 경우: 각 셀의 코드를 별도 코드 블록으로 제시
-
-선택된 코드에 대해 교육적인 답변을 한국어로 제공해주세요."""
-
-        try:
-            env = _build_provider_env(provider)
-        except ValueError as e:
-            return f"Error: {e}"
+        prompt = "".join([
+            "다음은 Python 노트북 셀의 전체 코드입니다:\n\n```python\n",
+            cell_source,
+            "\n```\n\n사용자가 다음 부분을 선택했습니다:\n```\n",
+            selected_text,
+            "\n```\n\n사용자의 질문: ",
+            user_comment,
+            context_section,
+        ]).encode() + _PROMPT_GUIDANCE
+
+        if env is None:
+            try:
+                env = _build_provider_env(provider)
+            except ValueError as e:
+                return f"Error: {e}"
 
         logger.info("AI call started: provider=%s", provider)
         try:
             result = subprocess.run(
-                ['claude', '-p', prompt, '--dangerously-skip-permissions'],
-                capture_output=True, text=True, timeout=120, env=env
+                [_claude_command(), '-p', '--dangerously-skip-permissions'],
+                input=prompt, capture_output=True, timeout=120, env=env
             )
             if result.returncode == 0:
-                logger.info("AI call completed: provider=%s, response_length=%d", provider, len(result.stdout))
-                return result.stdout.strip()
+                stdout = result.stdout.decode("utf-8", "replace").strip()
+                logger.info("AI call completed: provider=%s, response_length=%d", provider, len(stdout))
+                return stdout
             else:
-                logger.error("AI call failed: provider=%s, error=%s", provider, result.stderr.strip())
-                return f"Error: {result.stderr.strip()}"
+                stderr = result.stderr.decode("utf-8", "replace").strip()
+                logger.error("AI call failed: provider=%s, error=%s", provider, stderr)
+                return f"Error: {stderr}"
         except subprocess.TimeoutExpired:
             logger.error("AI call timeout: provider=%s", provider)
             return "Error: AI 응답 시간 초과"
         except FileNotFoundError:
             return "Error: claude CLI를 찾을 수 없습니다. 'npm install -g @anthropic-ai/claude-code'로 설치해주세요."
 
+    # comment id -> (future, cell, comment) for AI calls still in flight
+    _ai_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=_AI_WORKERS, thread_name_prefix="notebook-lr-ai"
+    )
+    _pending_comments: dict[str, tuple[concurrent.futures.Future, Cell, Comment]] = {}
+    _comments_lock = threading.Lock()
+
+    def _settle_comment(comment_id: str) -> None:
+        """Store a finished AI call's response on its comment and save it.
+
+        Runs as the future's done callback, so responses reach the file even
+        if no client is left polling for them.
+        """
+        with _comments_lock:
+            pending = _pending_comments.pop(comment_id, None)
+            if pending is None:
+                return
+            future, cell, comment = pending
+            try:
+                ai_response = future.result()
+            except Exception as e:
+                logger.exception("AI call crashed")
+                ai_response = f"Error: {e}"
+            comment.status = "error" if ai_response.startswith("Error:") else "resolved"
+            comment.ai_response = ai_response
+            # Skip comments deleted, or cells dropped by a reload, meanwhile.
+            index = _index_of(cell.id)
+            if index is None or notebook.cells[index] is not cell:
+                return
+            if not any(c is comment for c in cell.comments):
+                return
+            cell.comments = list(cell.comments)
+            notebook._touch()
+        _auto_save_if_path()
+
+    @app.route("/api/provider/refresh-env", methods=["POST"])
+    def api_provider_refresh_env():
+        """Forget cached provider environments, e.g. after rotating a token."""
+        _provider_env_cache.clear()
+        return jsonify({"ok": True})
+
     @app.route("/api/cell/comment/add", methods=["POST"])
     def api_cell_comment_add():
-        data = request.get_json(force=True) or {}
+        data = _json_body()
         cell_id = data.get("cell_id", "")
         cell = _find_cell_by_id(cell_id)
         if not cell:
@@ -521,9 +1062,10 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
         if provider not in ("claude", "glm", "kimi"):
             provider = "claude"
 
-        # Validate provider env vars before creating a comment
+        # Validate provider env vars before creating a comment; the AI call
+        # reuses the env built here.
         try:
-            _build_provider_env(provider)
+            env = _build_provider_env(provider)
         except ValueError as e:
             return jsonify({"ok": False, "error": str(e)}), 400
 
@@ -539,22 +1081,34 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
         )
 
         ctx = _build_comment_context(notebook, cell, cell_id)
-        ai_response = _call_ai(cell.source, comment.selected_text, comment.user_comment, provider, context=ctx)
-        if ai_response.startswith("Error:"):
-            comment.status = "error"
-        else:
-            comment.status = "resolved"
-        comment.ai_response = ai_response
-
-        cell.comments.append(comment)
-        notebook._touch()
-        _auto_save_if_path()
-
+        # The CLI can take minutes; answer now and let the client poll
+        # /api/cell/comment/status for the response.
+        with _comments_lock:
+            future = _ai_executor.submit(
+                _call_ai, cell.source, comment.selected_text, comment.user_comment, provider,
+                context=ctx, env=env,
+            )
+            _pending_comments[comment.id] = (future, cell, comment)
+            cell.comments = [*cell.comments, comment]
+        future.add_done_callback(lambda _f, cid=comment.id: _settle_comment(cid))
         return jsonify({"ok": True, "comment": comment.model_dump()})
 
+    @app.route("/api/cell/comment/status", methods=["GET"])
+    def api_cell_comment_status():
+        comment_id = request.args.get("id", "")
+        with _comments_lock:
+            pending = _pending_comments.get(comment_id)
+        if pending is not None:
+            return jsonify({"ok": True, "comment": pending[2].model_dump()})
+        for cell in notebook.cells:
+            for comment in cell.comments:
+                if comment.id == comment_id:
+                    return jsonify({"ok": True, "comment": comment.model_dump()})
+        return jsonify({"ok": False, "error": "comment not found"}), 404
+
     @app.route("/api/cell/comment/delete", methods=["POST"])
     def api_cell_comment_delete():
-        data = request.get_json(force=True) or {}
+        data = _json_body()
         cell_id = data.get("cell_id", "")
         comment_id = data.get("comment_id", "")
         cell = _find_cell_by_id(cell_id)
@@ -578,8 +1132,9 @@ def launch_web(notebook: Optional[Notebook] = None, share: bool = False):
     if _had_ps1:
         del sys.ps1
     try:
-        app.run(host="0.0.0.0", port=7860, debug=False)
+        _serve(app, host="0.0.0.0", port=7860)
     finally:
+        _saver.flush()
         if _had_ps1:
             sys.ps1 = _ps1
 
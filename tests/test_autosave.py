@@ -0,0 +1,63 @@
+"""Tests for DebouncedSaver."""
+
+import threading
+
+from notebook_lr.autosave import DebouncedSaver
+
+
+def _counting_saver():
+    writes = []
+    return DebouncedSaver(lambda: writes.append(1)), writes
+
+
+def test_zero_delay_writes_immediately():
+    saver, writes = _counting_saver()
+    saver.request(0)
+    assert writes == [1]
+    assert not saver.pending
+
+
+def test_burst_is_written_once():
+    saver, writes = _counting_saver()
+    for _ in range(5):
+        saver.request(0.05)
+    assert saver.pending and writes == []
+    saver._timer.join(timeout=2.0)
+    assert writes == [1]
+    assert not saver.pending
+
+
+def test_flush_writes_pending_and_cancel_drops_it():
+    saver, writes = _counting_saver()
+    saver.flush()
+    assert writes == []
+    saver.request(60)
+    saver.flush()
+    assert writes == [1]
+    saver.request(60)
+    saver.cancel()
+    saver.flush()
+    assert writes == [1]
+
+
+def test_writes_never_overlap():
+    active = []
+    overlaps = []
+
+    def write():
+        active.append(1)
+        if len(active) > 1:
+            overlaps.append(1)
+        threading.Event().wait(0.001)
+        active.pop()
+
+    saver = DebouncedSaver(write)
+    threads = [
+        threading.Thread(target=lambda: [saver.request(0) for _ in range(20)])
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert overlaps == []
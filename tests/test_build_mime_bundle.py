@@ -269,3 +269,63 @@ class TestBuildMimeBundleIpythonDisplayObjects:
         result = _build_mime_bundle(Latex(r"$x^2$"))
         assert "text/latex" in result
         assert r"$x^2$" in result["text/latex"]
+
+
+class TestBuildMimeBundleMethodCache:
+    """The per-type cache of rich display methods."""
+
+    def test_type_is_probed_once(self):
+        from notebook_lr.kernel import _MIME_METHODS_CACHE
+
+        class HtmlObj:
+            def _repr_html_(self):
+                return "<i>x</i>"
+
+        _build_mime_bundle(HtmlObj())
+        assert _MIME_METHODS_CACHE[HtmlObj] == (("text/html", "_repr_html_"),)
+        assert _build_mime_bundle(HtmlObj())["text/html"] == "<i>x</i>"
+
+    def test_dynamic_getattr_objects_are_not_cached(self):
+        from notebook_lr.kernel import _MIME_METHODS_CACHE
+
+        class Dynamic:
+            def __getattr__(self, name):
+                if name == "_repr_markdown_":
+                    return lambda: "*md*"
+                raise AttributeError(name)
+
+        assert _build_mime_bundle(Dynamic())["text/markdown"] == "*md*"
+        assert Dynamic not in _MIME_METHODS_CACHE
+
+
+class TestBuildMimeBundleReprMimebundle:
+    """Objects implementing _repr_mimebundle_."""
+
+    def test_bundle_is_used_without_probing_other_methods(self):
+        class Bundled:
+            def _repr_mimebundle_(self, include=None, exclude=None):
+                return {"text/html": "<b>x</b>", "text/plain": "x"}
+
+            def _repr_latex_(self):
+                raise AssertionError("per-MIME methods should not be called")
+
+        assert _build_mime_bundle(Bundled()) == {"text/html": "<b>x</b>", "text/plain": "x"}
+
+    def test_bundle_with_metadata_tuple(self):
+        class Bundled:
+            def _repr_mimebundle_(self, include=None, exclude=None):
+                return {"text/markdown": "*x*"}, {"text/markdown": {}}
+
+        result = _build_mime_bundle(Bundled())
+        assert result["text/markdown"] == "*x*"
+        assert result["text/plain"] == "*x*"
+
+    def test_empty_bundle_falls_back_to_repr_methods(self):
+        class Bundled:
+            def _repr_mimebundle_(self, include=None, exclude=None):
+                return {}
+
+            def _repr_html_(self):
+                return "<i>y</i>"
+
+        assert _build_mime_bundle(Bundled())["text/html"] == "<i>y</i>"
@@ -23,13 +23,37 @@ class TestCellIdGeneration:
         cell2 = Cell()
         assert cell1.id != cell2.id
 
+    def test_ids_unique_in_tight_loop(self):
+        """Cells created within the same second still get distinct IDs."""
+        ids = {Cell().id for _ in range(1000)}
+        assert len(ids) == 1000
+
+    def test_ids_unique_across_processes(self):
+        """Processes creating cells in the same second get distinct IDs."""
+        import subprocess
+        import sys
+
+        code = (
+            "from notebook_lr.notebook import Cell, Comment\n"
+            "for _ in range(200): print(Cell().id)\n"
+            "print(Comment(from_line=0, from_ch=0, to_line=0, to_ch=0,"
+            " selected_text='', user_comment='').id)\n"
+        )
+        procs = [
+            subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True)
+            for _ in range(2)
+        ]
+        outputs = [set(p.communicate()[0].split()) for p in procs]
+        assert all(len(ids) == 201 for ids in outputs)
+        assert not outputs[0] & outputs[1]
+
     def test_custom_id_is_preserved(self):
         """Explicitly provided ID is not overwritten."""
         cell = Cell(id="my_custom_id")
         assert cell.id == "my_custom_id"
 
     def test_id_format(self):
-        """Auto-generated ID follows expected format: cell_YYYYMMDDHHMMSSXXXXXX."""
+        """Auto-generated ID follows expected format: cell_YYYYMMDDHHMMSS + pid + counter."""
         cell = Cell()
         # Should be "cell_" followed by digits only
         suffix = cell.id[len("cell_"):]
@@ -186,11 +210,12 @@ class TestCellToDict:
         d = cell.to_dict()
         assert d["source"] == src
 
-    def test_to_dict_outputs_is_same_reference(self):
-        """to_dict() returns the live outputs list (not a copy) — documenting actual behavior."""
+    def test_to_dict_outputs_is_a_snapshot(self):
+        """to_dict() returns a JSON-ready copy of outputs, not the live list."""
         cell = Cell(outputs=[{"type": "stream", "text": "hello"}])
         d = cell.to_dict()
-        assert d["outputs"] is cell.outputs
+        assert d["outputs"] == cell.outputs
+        assert d["outputs"] is not cell.outputs
 
 
 class TestCellFromDict:
@@ -1,8 +1,9 @@
 """Tests for _build_comment_context() in notebook_lr.web."""
 
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock
-from flask import Flask
 
 from notebook_lr import Notebook, NotebookKernel, Cell, CellType
 from notebook_lr.notebook import Comment
@@ -14,13 +15,13 @@ def nb_and_context_fn():
     """Return (notebook, _build_comment_context) by launching the web app."""
     captured = {}
 
-    def fake_run(self, *a, **kw):
-        captured["app"] = self
+    def fake_serve(app, *a, **kw):
+        captured["app"] = app
 
     nb = Notebook.new()
     kernel = NotebookKernel()
 
-    with patch.object(Flask, "run", fake_run), \
+    with patch.object(web_module, "_serve", fake_serve), \
          patch.object(web_module, "NotebookKernel", return_value=kernel):
         web_module.launch_web(notebook=nb)
 
@@ -242,3 +243,32 @@ class TestBuildCommentContextExistingComments:
         result = fn(nb, cell, cell.id)
         for i in range(3):
             assert f"question {i}" in result
+
+
+class TestBuildCommentContextViaRoute:
+    def test_prompt_carries_neighbors_and_existing_comments(self, web_app):
+        client, nb, kernel = web_app
+        nb.insert_cell(0, _make_cell("a = 1\nb = 2\nc = 3\nd = 4"))
+        target = _make_cell("total = a + b")
+        target.comments = [Comment(from_line=0, from_ch=0, to_line=0, to_ch=5,
+                                   selected_text="total", user_comment="earlier?", status="resolved")]
+        nb.insert_cell(1, target)
+        nb.insert_cell(2, _make_cell("# Notes", CellType.MARKDOWN))
+
+        with patch("subprocess.run") as mock_sub, \
+             patch("os.path.isfile", return_value=True):
+            mock_sub.return_value = MagicMock(returncode=0, stdout=b"ok", stderr=b"")
+            comment_id = client.post("/api/cell/comment/add", json={
+                "cell_id": target.id, "selected_text": "a + b", "user_comment": "?",
+            }).get_json()["comment"]["id"]
+            for _ in range(500):
+                status = client.get(f"/api/cell/comment/status?id={comment_id}").get_json()
+                if status["comment"]["status"] != "loading":
+                    break
+                time.sleep(0.01)
+
+        prompt = mock_sub.call_args.kwargs["input"].decode()
+        assert "이 코멘트는 셀 #2 (총 3개 중)에서 작성되었습니다." in prompt
+        assert "이전 셀 (유형: code):\na = 1\nb = 2\nc = 3\n\n" in prompt
+        assert "다음 셀 (유형: markdown):\n# Notes" in prompt
+        assert "  - [resolved] 사용자: earlier?" in prompt
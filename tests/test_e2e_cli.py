@@ -175,6 +175,28 @@ class TestRunCommandE2E:
             assert result.exit_code == 0, result.output
             assert "cli output test" in result.output
 
+    def test_run_prints_one_line_per_cell_by_default(self):
+        """Without --verbose only the first source line of each cell is echoed."""
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            self._make_notebook("test.nblr", [{"source": "a = 1\nb_hidden_line = 2"}])
+
+            result = runner.invoke(main, ["run", "test.nblr"])
+            assert result.exit_code == 0, result.output
+            assert "Cell 0: a = 1..." in result.output
+            assert "b_hidden_line" not in result.output
+
+    def test_run_verbose_prints_full_source(self):
+        """--verbose echoes the whole highlighted source."""
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            self._make_notebook("test.nblr", [{"source": "a = 1\nb_hidden_line = 2"}])
+
+            result = runner.invoke(main, ["run", "test.nblr", "-v"])
+            assert result.exit_code == 0, result.output
+            assert "--- Cell 0 ---" in result.output
+            assert "b_hidden_line" in result.output
+
     def test_run_stops_on_error(self):
         """Execution stops when a cell raises an error."""
         runner = CliRunner()
@@ -206,6 +228,20 @@ class TestRunCommandE2E:
             assert result.exit_code == 0, result.output
             assert "Error" in result.output or "boom" in result.output
 
+    def test_run_no_fail_fast_continues_after_error(self):
+        """--no-fail-fast keeps executing cells after an error."""
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            self._make_notebook("test.nblr", [
+                {"source": "raise ValueError('intentional error')"},
+                {"source": "print('still runs')"},
+            ])
+
+            result = runner.invoke(main, ["run", "test.nblr", "--no-fail-fast"])
+            assert result.exit_code == 0, result.output
+            assert "still runs" in result.output
+            assert "Executed 1/2 cells" in result.output
+
     def test_run_with_save_session_flag(self):
         """--save-session flag creates a checkpoint file."""
         runner = CliRunner()
@@ -2,10 +2,14 @@
 Tests for NotebookEditor cell management methods.
 
 Covers: add_cell_after, add_cell_before, undo_delete, move_cell_up,
-move_cell_down, duplicate_cell, toggle_cell_type, clear_outputs, _set_message.
+move_cell_down, duplicate_cell, toggle_cell_type, clear_outputs, _set_message,
+_cell_content, edit_current_cell, _visible_cell_lines, _output_panel,
+_render_cell_lines, _executed_count.
 """
 
 import pytest
+from unittest.mock import patch
+
 from notebook_lr.cli import NotebookEditor
 from notebook_lr import Notebook, Cell, CellType, NotebookKernel
 
@@ -453,3 +457,265 @@ class TestSetMessage:
         msg = "[green]Done[/green]"
         editor._set_message(msg)
         assert editor._status_message == msg
+
+
+# ---------------------------------------------------------------------------
+# _cell_content render cache
+# ---------------------------------------------------------------------------
+
+class TestRenderCache:
+
+    def test_unchanged_cell_reuses_renderable(self, editor):
+        """Rendering the same cell twice returns the memoized renderable."""
+        cell = editor.notebook.cells[0]
+        assert editor._cell_content(cell) is editor._cell_content(cell)
+
+    def test_toggle_type_builds_new_renderable(self, editor):
+        """Toggling the cell type switches to the other renderer."""
+        from rich.markdown import Markdown
+        cell = editor.notebook.cells[0]
+        before = editor._cell_content(cell)
+        editor.current_cell_index = 0
+        editor.toggle_cell_type()
+        after = editor._cell_content(cell)
+        assert after is not before
+        assert isinstance(after, Markdown)
+
+    def test_edited_source_misses_cache(self, editor):
+        """A new source string builds a new renderable."""
+        cell = editor.notebook.cells[0]
+        before = editor._cell_content(cell)
+        cell.source = "x = 2"
+        assert editor._cell_content(cell) is not before
+
+
+# ---------------------------------------------------------------------------
+# edit_current_cell
+# ---------------------------------------------------------------------------
+
+class TestEditCurrentCell:
+
+    def test_external_editor_updates_source(self, editor):
+        """Text returned from $EDITOR replaces the cell source."""
+        with patch("notebook_lr.cli.click.edit", return_value="x = 10\n") as mock_edit:
+            editor.edit_current_cell()
+        assert mock_edit.call_args.kwargs["extension"] == ".py"
+        assert editor.notebook.cells[0].source == "x = 10"
+        assert editor.modified is True
+
+    def test_markdown_cell_uses_md_extension(self, editor):
+        """Markdown cells are opened with a .md buffer."""
+        editor.current_cell_index = 2
+        with patch("notebook_lr.cli.click.edit", return_value="# New\n") as mock_edit:
+            editor.edit_current_cell()
+        assert mock_edit.call_args.kwargs["extension"] == ".md"
+
+    def test_external_editor_abort_cancels(self, editor):
+        """Quitting $EDITOR without saving leaves the cell untouched."""
+        with patch("notebook_lr.cli.click.edit", return_value=None):
+            editor.edit_current_cell()
+        assert editor.notebook.cells[0].source == "x = 1"
+        assert editor.modified is False
+        assert "cancelled" in editor._status_message
+
+    def test_unchanged_source_is_not_modified(self, editor):
+        """Saving the buffer unchanged does not mark the notebook modified."""
+        with patch("notebook_lr.cli.click.edit", return_value="x = 1\n"):
+            editor.edit_current_cell()
+        assert editor.modified is False
+
+    def test_external_editor_runs_outside_alt_screen(self, editor, monkeypatch):
+        """$EDITOR gets the normal screen; the alternate screen is restored after."""
+        from notebook_lr.cli import console
+
+        calls = []
+        monkeypatch.setattr(type(console), "is_alt_screen", property(lambda self: True))
+        monkeypatch.setattr(console, "set_alt_screen", lambda enable: calls.append(enable))
+        monkeypatch.setattr(console, "clear", lambda *a, **kw: calls.append("clear"))
+
+        def fake_edit(**kwargs):
+            calls.append("edit")
+            return "x = 2\n"
+
+        with patch("notebook_lr.cli.click.edit", side_effect=fake_edit):
+            editor.edit_current_cell()
+        assert calls == [False, "edit", True, "clear"]
+
+    def test_simple_editor_reads_lines(self, monkeypatch):
+        """simple_editor keeps the line-by-line prompt."""
+        nb = Notebook.new()
+        nb.add_cell(type=CellType.CODE, source="x = 1")
+        ed = NotebookEditor(nb, simple_editor=True)
+        answers = iter(["a = 1", "b = 2", ""])
+        monkeypatch.setattr("notebook_lr.cli.console.input", lambda *a, **kw: next(answers))
+        with patch("notebook_lr.cli.click.edit") as mock_edit:
+            ed.edit_current_cell()
+        mock_edit.assert_not_called()
+        assert nb.cells[0].source == "a = 1\nb = 2"
+
+
+# ---------------------------------------------------------------------------
+# _visible_cell_lines viewport
+# ---------------------------------------------------------------------------
+
+class TestViewport:
+
+    @pytest.fixture
+    def long_editor(self):
+        nb = Notebook.new()
+        for i in range(50):
+            nb.add_cell(type=CellType.CODE, source=f"x = {i}")
+        return NotebookEditor(nb)
+
+    @staticmethod
+    def _text(lines):
+        return ["".join(segment.text for segment in line) for line in lines]
+
+    def test_only_cells_near_cursor_are_rendered(self, long_editor):
+        """Cells outside the viewport are never rendered."""
+        from notebook_lr.cli import console
+        options = console.options.update_width(80)
+        long_editor.current_cell_index = 30
+        lines = long_editor._visible_cell_lines(20, options)
+        assert len(lines) == 20
+        rendered = [
+            i for i, cell in enumerate(long_editor.notebook.cells)
+            if id(cell) in long_editor._cell_lines
+        ]
+        assert min(rendered) >= 30 - 20 // 3
+        assert max(rendered) < 36
+
+    def test_markers_count_hidden_cells(self, long_editor):
+        """Marker rows report cells hidden above and below the viewport."""
+        from notebook_lr.cli import console
+        options = console.options.update_width(80)
+        long_editor.current_cell_index = 30
+        text = self._text(long_editor._visible_cell_lines(20, options))
+        assert "cells above" in text[0]
+        assert "more cells below" in text[-1]
+        assert any("x = 30" in line for line in text)
+
+    def test_small_notebook_has_no_markers(self, editor):
+        """A notebook that fits the viewport is shown without markers."""
+        from notebook_lr.cli import console
+        options = console.options.update_width(80)
+        text = self._text(editor._visible_cell_lines(40, options))
+        assert not any("..." in line for line in text)
+
+
+# ---------------------------------------------------------------------------
+# _output_panel cache and truncation
+# ---------------------------------------------------------------------------
+
+class TestOutputPanels:
+
+    def test_unchanged_output_reuses_panel(self, editor):
+        """The same output object maps to the same cached Panel."""
+        output = {"type": "stream", "name": "stdout", "text": "hi\n"}
+        assert editor._output_panel(output, 1) is editor._output_panel(output, 1)
+
+    def test_new_execution_count_rebuilds_panel(self, editor):
+        """The Out [n] label changes, so the panel is rebuilt."""
+        output = {"type": "stream", "name": "stdout", "text": "hi\n"}
+        assert editor._output_panel(output, 1) is not editor._output_panel(output, 2)
+
+    def test_long_stream_output_is_truncated(self):
+        """Only the last lines of a long stream are kept, behind a banner."""
+        from notebook_lr.cli import _OUTPUT_MAX_LINES, _tail_output
+        text = "\n".join(f"line {i}" for i in range(_OUTPUT_MAX_LINES + 50))
+        output = {"type": "stream", "name": "stdout", "text": text}
+        tail = _tail_output(output)["text"].splitlines()
+        assert tail[0] == "... 50 lines truncated ..."
+        assert tail[1] == "line 50"
+        assert len(tail) == _OUTPUT_MAX_LINES + 1
+        assert output["text"] == text
+
+    def test_short_output_is_untouched(self):
+        """Outputs below the limit are displayed in full."""
+        from notebook_lr.cli import _tail_output
+        output = {"type": "execute_result", "data": {"text/plain": "42"}}
+        assert _tail_output(output) == output
+
+
+# ---------------------------------------------------------------------------
+# _render_cell_lines cache keys
+# ---------------------------------------------------------------------------
+
+class TestCellLineCache:
+
+    @pytest.fixture
+    def options(self):
+        from notebook_lr.cli import console
+        return console.options.update_width(80)
+
+    def test_unchanged_cell_is_not_rerendered(self, editor, options):
+        """A second redraw of an unchanged cell reuses its rendered lines."""
+        first = editor._render_cell_lines(1, options)
+        assert editor._render_cell_lines(1, options) is first
+
+    def test_source_change_rerenders(self, editor, options):
+        """Changing the source changes the key and forces a re-render."""
+        first = editor._render_cell_lines(1, options)
+        editor.notebook.cells[1].source = "y = 3"
+        assert editor._render_cell_lines(1, options) is not first
+
+    def test_cursor_move_rerenders_only_affected_cells(self, editor, options):
+        """Moving the cursor re-renders the old and new current cells only."""
+        before = [editor._render_cell_lines(i, options) for i in range(3)]
+        editor.current_cell_index = 1
+        after = [editor._render_cell_lines(i, options) for i in range(3)]
+        assert after[0] is not before[0]
+        assert after[1] is not before[1]
+        assert after[2] is before[2]
+
+    def test_moved_cell_keeps_its_render(self, editor, options):
+        """Swapping two non-current cells does not re-render them."""
+        editor.current_cell_index = 0
+        lines = editor._render_cell_lines(2, options)
+        cells = editor.notebook.cells
+        cells[1], cells[2] = cells[2], cells[1]
+        assert editor._render_cell_lines(1, options) is lines
+
+    def test_command_bar_rendered_once_per_width(self, editor, monkeypatch):
+        """Redraws reuse the command bar lines until the width changes."""
+        monkeypatch.setattr("notebook_lr.cli.console.print", lambda *a, **kw: None)
+        monkeypatch.setattr("notebook_lr.cli.console.clear", lambda *a, **kw: None)
+        editor.display_cells()
+        lines = editor._command_bar_lines
+        editor.display_cells()
+        assert editor._command_bar_lines is lines
+        editor._render_width = None
+        editor.display_cells()
+        assert editor._command_bar_lines is not lines
+
+
+# ---------------------------------------------------------------------------
+# _executed_count header counter
+# ---------------------------------------------------------------------------
+
+class TestExecutedCount:
+
+    def test_counter_matches_loaded_notebook(self):
+        """The counter starts from the cells that already ran."""
+        nb = Notebook.new()
+        nb.add_cell(type=CellType.CODE, source="x = 1")
+        nb.cells[0].execution_count = 3
+        nb.add_cell(type=CellType.CODE, source="y = 2")
+        assert NotebookEditor(nb)._executed_count == 1
+
+    def test_counter_tracks_execute_clear_delete_and_undo(self, editor, monkeypatch):
+        """Every path that changes execution counts keeps the counter exact."""
+        editor.current_cell_index = 1
+        with patch("rich.status.Status"):
+            editor.execute_current_cell()
+        assert editor._executed_count == editor._count_executed() == 1
+
+        monkeypatch.setattr("notebook_lr.cli.Confirm.ask", lambda *a, **kw: True)
+        editor.delete_current_cell()
+        assert editor._executed_count == editor._count_executed() == 0
+
+        editor.undo_delete()
+        assert editor._executed_count == editor._count_executed() == 1
+
+        editor.clear_outputs()
+        assert editor._executed_count == editor._count_executed() == 0
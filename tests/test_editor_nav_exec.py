@@ -3,7 +3,7 @@ Unit tests for NotebookEditor navigation and execution in notebook_lr/cli.py.
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 from notebook_lr.cli import NotebookEditor
 from notebook_lr import Notebook, Cell, CellType, NotebookKernel
@@ -50,6 +50,26 @@ class TestNavigationState:
             editor.current_cell_index += 1
         assert editor.current_cell_index == last
 
+    def test_select_next_and_previous_stop_at_edges(self, editor):
+        editor.select_previous_cell()
+        assert editor.current_cell_index == 0
+        editor.select_last_cell()
+        editor.select_next_cell()
+        assert editor.current_cell_index == len(editor.notebook.cells) - 1
+        editor.select_previous_cell()
+        assert editor.current_cell_index == len(editor.notebook.cells) - 2
+        editor.select_first_cell()
+        assert editor.current_cell_index == 0
+
+    def test_key_aliases_share_handlers(self, editor):
+        assert editor._bindings["j"] == editor._bindings["down"]
+        assert editor._bindings["k"] == editor._bindings["up"]
+        assert editor._bindings[""] == editor._bindings["enter"]
+
+    def test_quit_binding_stops_editor(self, editor):
+        editor._bindings["q"]()
+        assert editor.running is False
+
 
 # ---------------------------------------------------------------------------
 # execute_current_cell
@@ -58,7 +78,7 @@ class TestNavigationState:
 class TestExecuteCurrentCell:
     def test_execute_code_cell_sets_outputs_and_count(self, editor):
         editor.current_cell_index = 0  # "x = 1"
-        with patch("notebook_lr.cli.Status"):
+        with patch("rich.status.Status"):
             editor.execute_current_cell()
         cell = editor.notebook.cells[0]
         assert cell.execution_count is not None
@@ -66,56 +86,56 @@ class TestExecuteCurrentCell:
 
     def test_execute_markdown_cell_sets_cannot_execute_message(self, editor):
         editor.current_cell_index = 2  # markdown cell
-        with patch("notebook_lr.cli.Status"):
+        with patch("rich.status.Status"):
             editor.execute_current_cell()
         assert "Cannot execute" in editor._status_message or "markdown" in editor._status_message.lower()
 
     def test_execute_empty_code_cell_sets_empty_message(self, editor):
         editor.notebook.add_cell(type=CellType.CODE, source="   ")
         editor.current_cell_index = len(editor.notebook.cells) - 1
-        with patch("notebook_lr.cli.Status"):
+        with patch("rich.status.Status"):
             editor.execute_current_cell()
         assert "empty" in editor._status_message.lower() or "Cell is empty" in editor._status_message
 
     def test_execute_with_no_cells_sets_no_cells_message(self):
         nb = Notebook.new()
         ed = NotebookEditor(nb)
-        with patch("notebook_lr.cli.Status"):
+        with patch("rich.status.Status"):
             ed.execute_current_cell()
         assert "No cells" in ed._status_message
 
     def test_execute_sets_modified_true(self, editor):
         editor.current_cell_index = 0
         assert editor.modified is False
-        with patch("notebook_lr.cli.Status"):
+        with patch("rich.status.Status"):
             editor.execute_current_cell()
         assert editor.modified is True
 
     def test_execute_error_sets_error_message(self, editor):
         editor.notebook.add_cell(type=CellType.CODE, source="raise ValueError('test error')")
         editor.current_cell_index = len(editor.notebook.cells) - 1
-        with patch("notebook_lr.cli.Status"):
+        with patch("rich.status.Status"):
             editor.execute_current_cell()
         assert "Error" in editor._status_message or "error" in editor._status_message or "red" in editor._status_message
 
     def test_execute_error_does_not_crash(self, editor):
         editor.notebook.add_cell(type=CellType.CODE, source="1/0")
         editor.current_cell_index = len(editor.notebook.cells) - 1
-        with patch("notebook_lr.cli.Status"):
+        with patch("rich.status.Status"):
             editor.execute_current_cell()
         assert editor.modified is True
 
     def test_execute_result_stored_in_cell_outputs(self, editor):
         editor.notebook.add_cell(type=CellType.CODE, source="print('output test')")
         editor.current_cell_index = len(editor.notebook.cells) - 1
-        with patch("notebook_lr.cli.Status"):
+        with patch("rich.status.Status"):
             editor.execute_current_cell()
         cell = editor.notebook.cells[editor.current_cell_index]
         assert isinstance(cell.outputs, list)
 
     def test_execute_print_captures_output(self, editor):
         editor.current_cell_index = 1  # print('hello')
-        with patch("notebook_lr.cli.Status"):
+        with patch("rich.status.Status"):
             editor.execute_current_cell()
         cell = editor.notebook.cells[1]
         assert len(cell.outputs) > 0
@@ -128,12 +148,7 @@ class TestExecuteCurrentCell:
 class TestExecuteAllCells:
     def _run_all(self, editor, monkeypatch):
         monkeypatch.setattr("notebook_lr.cli.console.input", lambda *a, **kw: "")
-        with patch("notebook_lr.cli.Progress") as MockProgress:
-            mock_progress = MagicMock()
-            MockProgress.return_value.__enter__ = MagicMock(return_value=mock_progress)
-            MockProgress.return_value.__exit__ = MagicMock(return_value=False)
-            mock_progress.add_task.return_value = MagicMock()
-            editor.execute_all_cells()
+        editor.execute_all_cells()
 
     def test_executes_all_code_cells_in_order(self, editor, monkeypatch):
         self._run_all(editor, monkeypatch)
@@ -151,12 +166,7 @@ class TestExecuteAllCells:
         nb.add_cell(type=CellType.CODE, source="z = 5")
         ed = NotebookEditor(nb)
         monkeypatch.setattr("notebook_lr.cli.console.input", lambda *a, **kw: "")
-        with patch("notebook_lr.cli.Progress") as MockProgress:
-            mock_progress = MagicMock()
-            MockProgress.return_value.__enter__ = MagicMock(return_value=mock_progress)
-            MockProgress.return_value.__exit__ = MagicMock(return_value=False)
-            mock_progress.add_task.return_value = MagicMock()
-            ed.execute_all_cells()
+        ed.execute_all_cells()
         assert ed.notebook.cells[0].execution_count is None
         assert ed.notebook.cells[1].execution_count is not None
 
@@ -167,12 +177,7 @@ class TestExecuteAllCells:
         nb.add_cell(type=CellType.CODE, source="b = 2")
         ed = NotebookEditor(nb)
         monkeypatch.setattr("notebook_lr.cli.console.input", lambda *a, **kw: "")
-        with patch("notebook_lr.cli.Progress") as MockProgress:
-            mock_progress = MagicMock()
-            MockProgress.return_value.__enter__ = MagicMock(return_value=mock_progress)
-            MockProgress.return_value.__exit__ = MagicMock(return_value=False)
-            mock_progress.add_task.return_value = MagicMock()
-            ed.execute_all_cells()
+        ed.execute_all_cells()
         assert ed.notebook.cells[2].execution_count is None
 
     def test_success_message_when_all_pass(self, editor, monkeypatch):
@@ -184,14 +189,29 @@ class TestExecuteAllCells:
         nb.add_cell(type=CellType.CODE, source="raise ValueError('oops')")
         ed = NotebookEditor(nb)
         monkeypatch.setattr("notebook_lr.cli.console.input", lambda *a, **kw: "")
-        with patch("notebook_lr.cli.Progress") as MockProgress:
-            mock_progress = MagicMock()
-            MockProgress.return_value.__enter__ = MagicMock(return_value=mock_progress)
-            MockProgress.return_value.__exit__ = MagicMock(return_value=False)
-            mock_progress.add_task.return_value = MagicMock()
-            ed.execute_all_cells()
+        ed.execute_all_cells()
         assert "error" in ed._status_message.lower() or "yellow" in ed._status_message
 
+    def test_execute_cell_silent_stores_result(self, editor):
+        cell = editor.notebook.cells[0]
+        result = editor._execute_cell_silent(cell)
+        assert result.success is True
+        assert cell.execution_count == result.execution_count
+
+    def test_fills_single_summary_table(self, editor, monkeypatch):
+        import notebook_lr.cli as cli_module
+        tables = []
+        build = cli_module._build_run_summary
+
+        def spy(rows):
+            tables.append(build(rows))
+            return tables[-1]
+
+        monkeypatch.setattr(cli_module, "_build_run_summary", spy)
+        self._run_all(editor, monkeypatch)
+        assert len(tables) == 1
+        assert tables[0].row_count == 3
+
 
 # ---------------------------------------------------------------------------
 # search_cells — matching logic
@@ -222,6 +242,33 @@ class TestSearchCells:
         ]
         assert matches == []
 
+    def test_find_matches_ignores_case(self, editor):
+        assert editor._find_matches("PRINT") == [1]
+
+    def test_find_matches_treats_term_literally(self, editor):
+        editor.notebook.add_cell(type=CellType.CODE, source="a = (1 + 2)")
+        assert editor._find_matches("(1 +") == [4]
+        assert editor._find_matches(".*") == []
+
+
+# ---------------------------------------------------------------------------
+# show_variables
+# ---------------------------------------------------------------------------
+
+class TestShowVariables:
+    def test_values_are_abbreviated(self, editor, monkeypatch):
+        editor.kernel.set_variable("big", list(range(100_000)))
+        editor.kernel.set_variable("text", "a" * 1000)
+        printed = []
+        monkeypatch.setattr("notebook_lr.cli.console.print", lambda *a, **kw: printed.extend(a))
+        monkeypatch.setattr("notebook_lr.cli.console.input", lambda *a, **kw: "")
+        editor.show_variables()
+        table = printed[-1]
+        names = list(table.columns[0].cells)
+        values = list(table.columns[2].cells)
+        assert values[names.index("big")] == "[0, 1, 2, 3, ...]"
+        assert len(values[names.index("text")]) <= 60
+
 
 # ---------------------------------------------------------------------------
 # save_notebook
@@ -261,3 +308,31 @@ class TestSaveNotebook:
         with patch("notebook_lr.cli.Prompt.ask", return_value=str(nb_file)):
             editor.save_notebook()
         assert nb_file.exists()
+
+    def test_save_with_session_writes_both_files(self, editor, tmp_path):
+        nb_file = tmp_path / "both.nblr"
+        editor.notebook.metadata["path"] = str(nb_file)
+        with patch.object(editor.kernel, "get_namespace", return_value={"x": 1}), \
+             patch.object(editor.session_manager, "save_checkpoint") as mock_checkpoint:
+            editor.save_notebook(include_session=True)
+        assert nb_file.exists()
+        mock_checkpoint.assert_called_once_with(editor.kernel, nb_file)
+
+    def test_save_with_session_uses_delta_checkpoint_when_enabled(self, editor, tmp_path):
+        nb_file = tmp_path / "delta.nblr"
+        editor.notebook.metadata["path"] = str(nb_file)
+        editor.delta_checkpoints = True
+        with patch.object(editor.kernel, "get_namespace", return_value={"x": 1}), \
+             patch.object(editor.session_manager, "save_checkpoint") as full, \
+             patch.object(editor.session_manager, "save_delta_checkpoint") as delta:
+            editor.save_notebook(include_session=True)
+        delta.assert_called_once_with(editor.kernel, nb_file)
+        full.assert_not_called()
+
+    def test_save_with_session_propagates_checkpoint_error(self, editor, tmp_path):
+        nb_file = tmp_path / "fail.nblr"
+        editor.notebook.metadata["path"] = str(nb_file)
+        with patch.object(editor.kernel, "get_namespace", return_value={"x": 1}), \
+             patch.object(editor.session_manager, "save_checkpoint", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                editor.save_notebook(include_session=True)
@@ -1,5 +1,6 @@
 import tempfile
 import time
+import pytest
 from pathlib import Path
 from notebook_lr.file_watcher import FileWatcher
 
@@ -69,3 +70,242 @@ def test_file_watcher_no_file():
     assert not watcher.has_changes()
     
     watcher.stop()
+
+
+def test_file_watcher_debounce_waits_for_quiet_period():
+    """A burst of writes is reported once, after the file stops changing."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+        f.write("initial content")
+        temp_path = f.name
+
+    try:
+        watcher = FileWatcher(temp_path, poll_interval=0.05, debounce=0.3, max_wait=5.0)
+        watcher.start()
+
+        # Keep writing faster than the debounce window
+        for i in range(4):
+            Path(temp_path).write_text(f"burst {i}")
+            time.sleep(0.1)
+            assert not watcher.has_changes()
+
+        # Once writes stop the change is reported
+        time.sleep(0.5)
+        assert watcher.has_changes()
+
+        watcher.stop()
+    finally:
+        Path(temp_path).unlink(missing_ok=True)
+
+
+def test_file_watcher_debounce_respects_max_wait():
+    """Continuous writes are still reported once max_wait has elapsed."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+        f.write("initial content")
+        temp_path = f.name
+
+    try:
+        watcher = FileWatcher(temp_path, poll_interval=0.05, debounce=10.0, max_wait=0.3)
+        watcher.start()
+
+        reported = False
+        for i in range(12):
+            Path(temp_path).write_text(f"write {i}")
+            time.sleep(0.05)
+            reported = reported or watcher.has_changes()
+
+        assert reported
+
+        watcher.stop()
+    finally:
+        Path(temp_path).unlink(missing_ok=True)
+
+
+def test_file_watcher_wakes_on_file_events():
+    """With watchdog installed, a change is seen without waiting for a poll."""
+    pytest.importorskip("watchdog")
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+        f.write("initial content")
+        temp_path = f.name
+
+    try:
+        watcher = FileWatcher(temp_path, poll_interval=30.0)
+        watcher.start()
+        assert watcher._watch_target is not None
+
+        time.sleep(0.1)
+        Path(temp_path).write_text("modified content")
+        time.sleep(0.3)
+        assert watcher.has_changes()
+
+        watcher.stop()
+    finally:
+        Path(temp_path).unlink(missing_ok=True)
+
+
+def test_same_size_change_stops_at_first_differing_block(tmp_path, monkeypatch):
+    """Only the blocks up to the first difference are hashed."""
+    import os
+    import notebook_lr.file_watcher as fw
+
+    monkeypatch.setattr(fw, "_BLOCK_SIZE", 4)
+    path = tmp_path / "nb.nblr"
+    path.write_bytes(b"aaaabbbbccccdddd")
+    watcher = FileWatcher(path)
+    assert len(watcher._last_blocks) == 4
+
+    hashed = []
+    real_iter = fw._iter_block_hashes
+
+    def counting_iter(f):
+        for digest in real_iter(f):
+            hashed.append(digest)
+            yield digest
+
+    monkeypatch.setattr(fw, "_iter_block_hashes", counting_iter)
+    path.write_bytes(b"aaaaXbbbccccdddd")
+    os.utime(path, (1, 1))
+    assert watcher._check_file()
+    assert len(hashed) == 2
+
+    hashed.clear()
+    watcher.acknowledge_changes()
+    hashed.clear()
+    os.utime(path, (2, 2))
+    assert not watcher._check_file()
+    assert len(hashed) == 4
+
+
+def test_size_change_is_detected_without_hashing(tmp_path, monkeypatch):
+    """Hashing only runs when the mtime moved but the size stayed the same."""
+    import os
+
+    path = tmp_path / "nb.nblr"
+    path.write_text("one")
+    watcher = FileWatcher(path)
+    hashes = []
+    real_differ = watcher._blocks_differ
+    monkeypatch.setattr(watcher, "_blocks_differ", lambda last: hashes.append(1) or real_differ(last))
+
+    assert not watcher._check_file()
+    path.write_text("longer")
+    os.utime(path, (1, 1))
+    assert watcher._check_file()
+    assert hashes == []
+
+    watcher.acknowledge_changes()
+    hashes.clear()
+    path.write_text("LONGER")
+    os.utime(path, (2, 2))
+    assert watcher._check_file()
+    assert hashes == [1]
+
+
+def test_file_watcher_leading_reports_first_write_immediately():
+    """With leading=True the first write is not held back by the debounce."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+        f.write("initial content")
+        temp_path = f.name
+
+    try:
+        watcher = FileWatcher(temp_path, poll_interval=0.05, debounce=1.0, max_wait=5.0, leading=True)
+        watcher.start()
+
+        time.sleep(0.1)
+        Path(temp_path).write_text("first save")
+        time.sleep(0.2)
+        assert watcher.has_changes()
+
+        # A follow-up write inside the window waits for the burst to settle
+        watcher.acknowledge_changes()
+        Path(temp_path).write_text("second save")
+        time.sleep(0.2)
+        assert not watcher.has_changes()
+
+        watcher.stop()
+    finally:
+        Path(temp_path).unlink(missing_ok=True)
+
+
+def test_watchers_share_one_observer(tmp_path):
+    """Watchers in the same directory share one observer and one watch."""
+    pytest.importorskip("watchdog")
+    from notebook_lr.file_watcher import _registry
+
+    first = tmp_path / "a.nblr"
+    second = tmp_path / "b.nblr"
+    first.write_text("a")
+    second.write_text("b")
+    watchers = [FileWatcher(first, poll_interval=30.0), FileWatcher(second, poll_interval=30.0)]
+    for watcher in watchers:
+        watcher.start()
+
+    try:
+        assert list(_registry._watches) == [str(tmp_path.resolve())]
+        first.write_text("changed")
+        time.sleep(0.3)
+        assert watchers[0].has_changes()
+        assert not watchers[1].has_changes()
+    finally:
+        for watcher in watchers:
+            watcher.stop()
+
+    assert _registry._watches == {}
+    assert _registry._observer is None
+
+
+def test_acknowledge_reads_file_outside_the_lock(tmp_path, monkeypatch):
+    """Other threads can take the lock while acknowledge is hashing the file."""
+    import threading
+
+    path = tmp_path / "nb.nblr"
+    path.write_text("content")
+    watcher = FileWatcher(path)
+    acquired = []
+
+    def take_lock():
+        if watcher._lock.acquire(timeout=1.0):
+            acquired.append(True)
+            watcher._lock.release()
+
+    def hash_from_other_thread():
+        t = threading.Thread(target=take_lock)
+        t.start()
+        t.join()
+        return "hash"
+
+    monkeypatch.setattr(watcher, "_get_block_hashes", hash_from_other_thread)
+    watcher.acknowledge_changes()
+    assert acquired == [True]
+    assert watcher._last_blocks == "hash"
+
+
+def test_atomic_rename_is_detected_without_hashing(tmp_path, monkeypatch):
+    """A same-size file renamed over the original counts as a change unhashed."""
+    import os
+
+    path = tmp_path / "nb.nblr"
+    path.write_text("same")
+    watcher = FileWatcher(path)
+    monkeypatch.setattr(watcher, "_blocks_differ", lambda last: pytest.fail("hashed"))
+
+    replacement = tmp_path / "nb.nblr.tmp"
+    replacement.write_text("SAME")
+    os.utime(replacement, (5, 5))
+    os.replace(replacement, path)
+    assert watcher._check_file()
+
+
+def test_stop_does_not_wait_out_the_poll_interval(tmp_path, monkeypatch):
+    """In polling mode stop() interrupts the wait instead of sleeping it out."""
+    from notebook_lr.file_watcher import _registry
+
+    monkeypatch.setattr(_registry, "subscribe", lambda target, callback: False)
+    path = tmp_path / "nb.nblr"
+    path.write_text("content")
+    watcher = FileWatcher(path, poll_interval=30.0)
+    watcher.start()
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    watcher.stop()
+    assert time.monotonic() - started < 0.5
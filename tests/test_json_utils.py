@@ -0,0 +1,68 @@
+"""Tests for the orjson-backed JSON helpers and their stdlib fallback."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from notebook_lr import json_utils
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request):
+    """Run each test with orjson (when installed) and with the json fallback."""
+    if request.param == "orjson":
+        if json_utils.orjson is None:
+            pytest.skip("orjson not installed")
+        yield request.param
+    else:
+        with patch.object(json_utils, "orjson", None):
+            yield request.param
+
+
+class TestDumps:
+    def test_returns_bytes(self, backend):
+        data = json_utils.dumps({"a": 1})
+        assert isinstance(data, bytes)
+        assert json.loads(data) == {"a": 1}
+
+    def test_indent_matches_stdlib(self, backend):
+        obj = {"cells": [{"id": "c1", "outputs": [], "n": None}], "meta": {}}
+        assert json_utils.dumps(obj, indent=True).decode() == json.dumps(obj, indent=2)
+
+    def test_non_ascii_round_trips(self, backend):
+        obj = {"source": "print('안녕')"}
+        assert json_utils.loads(json_utils.dumps(obj)) == obj
+
+    @pytest.mark.parametrize("indent", [False, True])
+    def test_bytes_independent_of_backend(self, indent):
+        if json_utils.orjson is None:
+            pytest.skip("orjson not installed")
+        obj = {"comments": [{"user_comment": "이게 뭐야?", "n": 1}], "meta": {}}
+        fast = json_utils.dumps(obj, indent=indent)
+        with patch.object(json_utils, "orjson", None):
+            assert json_utils.dumps(obj, indent=indent) == fast
+
+    def test_non_str_keys(self, backend):
+        assert json_utils.loads(json_utils.dumps({1: "x"})) == {"1": "x"}
+
+    def test_big_int_falls_back(self, backend):
+        assert json_utils.loads(json_utils.dumps({"n": 2**70})) == {"n": 2**70}
+
+    def test_unserializable_raises_type_error(self, backend):
+        with pytest.raises(TypeError):
+            json_utils.dumps({"x": object()})
+
+
+class TestLoads:
+    def test_accepts_str_and_bytes(self, backend):
+        assert json_utils.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+        assert json_utils.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_nan_literal(self, backend):
+        value = json_utils.loads('{"x": NaN}')["x"]
+        assert value != value
+
+    def test_malformed_raises_decode_error(self, backend):
+        with pytest.raises(json.JSONDecodeError):
+            json_utils.loads("{not json")
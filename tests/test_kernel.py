@@ -185,6 +185,20 @@ class TestDisplayObjects:
     def _execute_result_outputs(self, result):
         return [o for o in result.outputs if o.get("type") == "execute_result"]
 
+    def test_execute_result_goes_through_build_mime_bundle(self):
+        """Cell results are converted with _build_mime_bundle, not str()."""
+        from unittest.mock import patch
+        import notebook_lr.kernel as kernel_module
+
+        with patch.object(
+            kernel_module, "_build_mime_bundle", wraps=kernel_module._build_mime_bundle
+        ) as bundle:
+            result = self.kernel.execute_cell(
+                'from IPython.display import Markdown\nMarkdown("*hi*")'
+            )
+        bundle.assert_called_once()
+        assert self._execute_result_outputs(result)[0]["data"]["text/markdown"] == "*hi*"
+
     def test_html_display_object_has_html_mime_type(self):
         """HTML() should produce a text/html key in the output data dict."""
         result = self.kernel.execute_cell(
@@ -288,3 +302,52 @@ class TestExecutionResult:
 
         assert result.success is True
         assert result.execution_count == 2
+
+
+class TestBoundedOutputCapture:
+    """Cell stdout/stderr capture keeps only the tail of runaway output."""
+
+    def test_long_output_is_truncated_from_the_front(self):
+        kernel = NotebookKernel()
+        result = kernel.execute_cell("for i in range(20000):\n    print(i)")
+        text = result.outputs[0]["text"]
+        assert text.startswith("...[truncated ")
+        assert text.endswith("19999\n")
+        assert text.count("\n") == 10_001
+
+    def test_stream_limits(self):
+        from notebook_lr.kernel import _BoundedStream
+
+        stream = _BoundedStream(max_chars=10, max_lines=100)
+        stream.write("abcdef")
+        stream.write("ghijkl")
+        assert stream.getvalue() == "...[truncated 2 characters]...\ncdefghijkl"
+
+        stream = _BoundedStream(max_chars=100, max_lines=2)
+        stream.write("a\nb\nc\nd\n")
+        assert stream.getvalue().endswith("\nc\nd\n")
+        assert stream.truncated == 4
+
+    def test_stream_small_writes_after_large_one(self):
+        from notebook_lr.kernel import _BoundedStream
+
+        stream = _BoundedStream(max_chars=1000, max_lines=50)
+        expected = "x\n" * 400
+        stream.write(expected)
+        for i in range(300):
+            piece = f"{i}\n" if i % 3 else str(i)
+            stream.write(piece)
+            expected += piece
+        lines = expected.splitlines(keepends=True)
+        tail = "".join(lines[-50:])[-1000:]
+        assert stream.getvalue() == (
+            f"...[truncated {len(expected) - len(tail)} characters]...\n{tail}"
+        )
+        assert stream._chars == len(tail)
+        assert stream._lines == tail.count("\n")
+
+    def test_short_output_is_unchanged(self):
+        kernel = NotebookKernel()
+        result = kernel.execute_cell("import sys\nprint('out')\nprint('err', file=sys.stderr)")
+        assert result.outputs[0] == {"type": "stream", "name": "stdout", "text": "out\n"}
+        assert result.outputs[1] == {"type": "stream", "name": "stderr", "text": "err\n"}
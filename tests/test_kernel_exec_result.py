@@ -211,6 +211,13 @@ class TestExecutionResultDefaultFieldValues:
         assert result.error is None
         assert result.return_value is None
 
+    def test_instances_use_slots(self):
+        """Results kept in kernel history carry no per-instance __dict__."""
+        result = ExecutionResult(success=True)
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.unexpected = 1
+
 
 class TestExecutionResultWithVariousOutputTypes:
     """Tests for various output dict types stored in ExecutionResult."""
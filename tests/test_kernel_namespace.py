@@ -325,6 +325,20 @@ class TestGetDefinedNames:
         names = self.kernel.get_defined_names()
         assert "injected_name" in names
 
+    def test_get_defined_names_tracks_del_statement(self):
+        """Names removed by a cell's `del` disappear after that cell runs."""
+        self.kernel.execute_cell("gone_soon = 1")
+        self.kernel.execute_cell("del gone_soon")
+        assert "gone_soon" not in self.kernel.get_defined_names()
+        assert "gone_soon" not in self.kernel.get_namespace()
+
+    def test_get_defined_names_matches_user_ns_scan(self):
+        """The tracked names equal a full scan of user_ns, in the same order."""
+        self.kernel.execute_cell("a1 = 1\nb1 = 2")
+        self.kernel.restore_namespace({"c1": 3})
+        expected = [k for k in self.kernel.ip.user_ns if not k.startswith("_")]
+        assert self.kernel.get_defined_names() == expected
+
 
 class TestSetupNamespace:
     """Tests for _setup_namespace() and reset() interactions."""
@@ -25,6 +25,12 @@ def _add_comment(cell, user_comment="test question", status="resolved"):
 
 
 class TestGetCellComments:
+    def test_matches_model_dump(self):
+        cell = get_notebook().add_cell(source="x = 1")
+        first = _add_comment(cell, user_comment="one")
+        second = _add_comment(cell, user_comment="two", status="pending")
+        assert get_cell_comments(index=0) == [first.model_dump(), second.model_dump()]
+
     def test_returns_empty_list_when_no_comments(self):
         add_cell(source="x = 1")
         result = get_cell_comments(index=0)
@@ -185,6 +191,14 @@ class TestGetNotebookContext:
         result = get_notebook_context(index=0)
         assert result["comments"][0]["selected_text"] == "x = 1"
 
+    def test_comments_limited_to_context_fields(self):
+        cell = get_notebook().add_cell(source="x = 1")
+        _add_comment(cell, user_comment="Why?", status="pending")
+        result = get_notebook_context(index=0)
+        assert result["comments"] == [
+            {"selected_text": "x = 1", "user_comment": "Why?", "status": "pending"}
+        ]
+
     def test_raises_for_invalid_index(self):
         with pytest.raises(ValueError):
             get_notebook_context(index=999)
@@ -202,6 +216,19 @@ class TestGetNotebookContext:
         assert len(result["cell_outputs"]) == 1
         assert result["cell_outputs"][0]["text"] == "hi\n"
 
+    def test_large_outputs_are_truncated_in_preview(self):
+        cell = get_notebook().add_cell(source="x = 1")
+        cell.outputs = [
+            {"type": "stream", "name": "stdout", "text": "a" * 5000},
+            {"type": "display_data", "data": {"image/png": "b" * 9000, "text/plain": "<Figure>"}},
+        ]
+        result = get_notebook_context(index=0)
+        stream, display = result["cell_outputs"]
+        assert stream["text"].startswith("a" * 2048)
+        assert stream["text"].endswith("...<2952 truncated>")
+        assert display["data"] == {"image/png": "<9000 bytes omitted>", "text/plain": "<Figure>"}
+        assert len(cell.outputs[0]["text"]) == 5000
+
     def test_cell_outputs_capped_at_three(self):
         add_cell(source="x = 1")
         nb = get_notebook()
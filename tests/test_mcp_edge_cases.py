@@ -299,3 +299,60 @@ class TestListCells:
         # Indices should be sequential
         indices = [c.index for c in result.cells]
         assert indices == [0, 1, 2]
+
+
+# ---------------------------------------------------------------------------
+# _cell_to_output cache
+# ---------------------------------------------------------------------------
+
+class TestCellToOutputCache:
+
+    def test_unchanged_cell_reuses_model(self):
+        """Converting the same unchanged cell twice returns the cached model."""
+        from notebook_lr import Cell
+        from notebook_lr.mcp_server import _cell_to_output
+
+        cell = Cell(source="x = 1")
+        assert _cell_to_output(cell, 0) is _cell_to_output(cell, 0)
+
+    def test_assignment_or_new_index_rebuilds(self):
+        """Assigning any cell field, or moving the cell, gives a fresh model."""
+        from notebook_lr import Cell
+        from notebook_lr.mcp_server import _cell_to_output
+
+        cell = Cell(source="x = 1")
+        first = _cell_to_output(cell, 0)
+        cell.outputs = [{"type": "stream", "name": "stdout", "text": "1\n"}]
+        second = _cell_to_output(cell, 0)
+        assert second is not first
+        assert second.outputs == cell.outputs
+        assert _cell_to_output(cell, 1).index == 1
+
+
+# ---------------------------------------------------------------------------
+# _first_n_lines
+# ---------------------------------------------------------------------------
+
+class TestFirstNLines:
+
+    @pytest.mark.parametrize("source", [
+        "",
+        "one",
+        "a\nb\nc",
+        "a\nb\nc\nd\ne\nf\ng",
+        "a\nb\nc\nd\ne\n",
+        "a\r\nb\r\nc\r\nd\r\ne\r\nf",
+        "a\rb\rc\rd\re\rf",
+        "\n\n\n\n\n\n",
+    ])
+    def test_matches_splitlines(self, source):
+        """Bounded preview agrees with splitlines()[:5] for any line endings."""
+        from notebook_lr.mcp_server import _first_n_lines
+
+        assert _first_n_lines(source, 5) == "\n".join(source.splitlines()[:5])
+
+    def test_long_source(self):
+        """A long source yields just its first lines."""
+        from notebook_lr.mcp_server import _first_n_lines
+
+        assert _first_n_lines("line\n" * 10_000, 5) == "\n".join(["line"] * 5)
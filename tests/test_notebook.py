@@ -6,6 +6,7 @@ import json
 import pytest
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from notebook_lr.notebook import Notebook, Cell, CellType
 
@@ -205,6 +206,35 @@ class TestNotebook:
             assert loaded.session_state is not None
             assert loaded.session_state["user_ns"]["x"] == 42
 
+    def test_save_replaces_file_atomically(self):
+        """Saving goes through a temp file that is renamed over the target."""
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "atomic.nblr"
+            path.write_text("old contents")
+
+            nb = Notebook.new("Atomic")
+            nb.add_cell(source="x = 1")
+            with patch("notebook_lr.notebook.os.fsync") as fsync:
+                nb.save(path)
+                fsync.assert_not_called()
+
+            assert Notebook.load(path).cells[0].source == "x = 1"
+            assert sorted(p.name for p in Path(tmpdir).iterdir()) == ["atomic.nblr"]
+
+    def test_failed_save_keeps_previous_file(self):
+        """A serialization error leaves the existing notebook untouched."""
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "keep.nblr"
+            path.write_text("old contents")
+
+            nb = Notebook.new("Broken")
+            with patch("notebook_lr.notebook.os.replace", side_effect=OSError("disk full")):
+                with pytest.raises(OSError):
+                    nb.save(path)
+
+            assert path.read_text() == "old contents"
+            assert sorted(p.name for p in Path(tmpdir).iterdir()) == ["keep.nblr"]
+
     def test_modified_timestamp_updates(self):
         """Test that modified timestamp updates on changes."""
         nb = Notebook()
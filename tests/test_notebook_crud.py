@@ -5,6 +5,8 @@ Covers add_cell, insert_cell, remove_cell, get_cell, update_cell, and _touch.
 """
 
 import pytest
+from unittest.mock import patch
+
 from notebook_lr.notebook import Notebook, Cell, CellType
 
 
@@ -177,3 +179,14 @@ class TestTouch:
         old_modified = nb.metadata["modified"]
         nb._touch()
         assert nb.metadata["modified"] >= old_modified
+
+    def test_touch_formats_once_per_second(self):
+        nb = Notebook()
+        with patch("notebook_lr.notebook.time.time", return_value=1_700_000_000.5):
+            nb._touch()
+            first = nb.metadata["modified"]
+            with patch("notebook_lr.notebook.datetime") as dt:
+                nb._touch()
+                dt.fromtimestamp.assert_not_called()
+        assert nb.metadata["modified"] is first
+        assert "." not in first
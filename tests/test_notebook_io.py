@@ -164,6 +164,34 @@ class TestNotebookSerialization:
         nb = Notebook.from_dict({"cells": [], "metadata": {"name": "No Version"}})
         assert nb.version == "1.0"
 
+    def test_from_dict_empty_metadata_gets_defaults(self):
+        nb = Notebook.from_dict({"cells": [], "metadata": {}})
+        assert nb.metadata["name"] == "Untitled"
+        assert "created" in nb.metadata and "modified" in nb.metadata
+
+    def test_from_dict_cells_without_ids_get_unique_ids(self):
+        nb = Notebook.from_dict({"cells": [{"source": "a"}, {"source": "b"}]})
+        assert nb.cells[0].id.startswith("cell_")
+        assert nb.cells[0].id != nb.cells[1].id
+
+    def test_from_dict_ignores_unknown_keys(self):
+        nb = Notebook.from_dict({
+            "cells": [{"source": "a", "future_field": 1}],
+            "metadata": {"name": "X"},
+            "future_top": True,
+        })
+        assert nb.cells[0].source == "a"
+        assert "future_field" not in nb.cells[0].to_dict()
+        assert "future_top" not in nb.to_dict()
+
+    @pytest.mark.parametrize("encode", [True, False])
+    def test_from_json_matches_from_dict(self, encode):
+        original = Notebook.new("Json")
+        original.add_cell(Cell(source="x = 1", execution_count=2))
+        text = json.dumps(original.to_dict())
+        nb = Notebook.from_json(text.encode() if encode else text)
+        assert nb.to_dict() == original.to_dict()
+
     def test_to_dict_session_state_none_by_default(self):
         nb = Notebook.new("Fresh")
         d = nb.to_dict()
@@ -292,6 +320,79 @@ class TestNotebookFileIO:
             nb.save(path)
             assert path.exists()
 
+    def test_concurrent_saves_do_not_collide(self):
+        import threading
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "nb.nblr"
+            nb = Notebook.new("Concurrent")
+            nb.add_cell(type=CellType.CODE, source="x = 1")
+            errors = []
+
+            def save_many():
+                try:
+                    for _ in range(25):
+                        nb.save(path)
+                except Exception as e:  # pragma: no cover - failure path
+                    errors.append(e)
+
+            threads = [threading.Thread(target=save_many) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            assert errors == []
+            assert Notebook.load(path).cells[0].source == "x = 1"
+            assert [p.name for p in Path(tmpdir).iterdir()] == ["nb.nblr"]
+
+    def test_save_through_symlink_updates_target(self):
+        import os
+
+        with TemporaryDirectory() as tmpdir:
+            target = Path(tmpdir) / "real.nblr"
+            link = Path(tmpdir) / "link.nblr"
+            Notebook.new("Real").save(target)
+            os.symlink(target, link)
+
+            nb = Notebook.load(link)
+            nb.add_cell(type=CellType.CODE, source="x = 1")
+            nb.save(link)
+
+            assert link.is_symlink()
+            assert Notebook.load(target).cells[0].source == "x = 1"
+
+    def test_save_preserves_file_mode(self):
+        import os
+        import stat
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "private.nblr"
+            nb = Notebook.new("Private")
+            nb.save(path)
+            os.chmod(path, 0o600)
+
+            nb.add_cell(type=CellType.CODE, source="secret = 1")
+            nb.save(path)
+
+            assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    def test_save_keeps_hard_links(self):
+        import os
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "nb.nblr"
+            other = Path(tmpdir) / "other.nblr"
+            nb = Notebook.new("Linked")
+            nb.save(path)
+            os.link(path, other)
+
+            nb.add_cell(type=CellType.CODE, source="x = 2")
+            nb.save(path)
+
+            assert os.path.samefile(path, other)
+            assert Notebook.load(other).cells[0].source == "x = 2"
+
     def test_load_preserves_version(self):
         with TemporaryDirectory() as tmpdir:
             path = Path(tmpdir) / "nb.nblr"
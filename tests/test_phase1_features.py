@@ -210,17 +210,16 @@ class TestWebApiImageOutput:
     @pytest.fixture
     def web_app(self):
         """Flask test app using real launch_web() routes."""
-        from flask import Flask
         import notebook_lr.web as web_module
 
         nb = Notebook.new()
         kernel = NotebookKernel()
         captured = {}
 
-        def fake_run(self, *a, **kw):
-            captured["app"] = self
+        def fake_serve(app, *a, **kw):
+            captured["app"] = app
 
-        with patch.object(Flask, "run", fake_run), \
+        with patch.object(web_module, "_serve", fake_serve), \
              patch.object(web_module, "NotebookKernel", return_value=kernel):
             web_module.launch_web(notebook=nb)
 
@@ -147,6 +147,128 @@ def test_load_checkpoint_restores_variables_into_kernel(tmp_path):
     assert new_kernel.get_variable("b") == 20
 
 
+# ---------------------------------------------------------------------------
+# save_delta_checkpoint / load_delta_checkpoint
+# ---------------------------------------------------------------------------
+
+def test_delta_checkpoint_round_trip_preserves_data(tmp_path):
+    """save_delta_checkpoint then load_checkpoint restores variables."""
+    manager = SessionManager(sessions_dir=tmp_path)
+    kernel = NotebookKernel()
+    kernel.execute_cell("items = [1, 2, 3]")
+    kernel.execute_cell("name = 'delta'")
+    notebook_path = tmp_path / "delta.nblr"
+    manifest_path = manager.save_delta_checkpoint(kernel, notebook_path)
+
+    assert manifest_path == manager.get_manifest_path(notebook_path)
+    new_kernel = NotebookKernel()
+    new_kernel.reset()
+    info = manager.load_checkpoint(new_kernel, notebook_path)
+
+    assert info is not None
+    assert new_kernel.get_variable("items") == [1, 2, 3]
+    assert new_kernel.get_variable("name") == "delta"
+    assert new_kernel.execution_count == kernel.execution_count
+
+
+def test_delta_checkpoint_reuses_unchanged_blobs(tmp_path):
+    """Unchanged variables are not written again on the next checkpoint."""
+    manager = SessionManager(sessions_dir=tmp_path)
+    kernel = NotebookKernel()
+    kernel.execute_cell("big = list(range(1000))")
+    notebook_path = tmp_path / "reuse.nblr"
+    manager.save_delta_checkpoint(kernel, notebook_path)
+    blobs_before = {p: p.stat().st_mtime_ns for p in manager.blobs_dir.iterdir()}
+
+    kernel.execute_cell("small = 1")
+    manager.save_delta_checkpoint(kernel, notebook_path)
+    blobs_after = {p: p.stat().st_mtime_ns for p in manager.blobs_dir.iterdir()}
+
+    assert len(blobs_after) == len(blobs_before) + 1
+    for path, mtime in blobs_before.items():
+        assert blobs_after[path] == mtime
+
+
+def test_delta_checkpoint_keeps_aliases_shared(tmp_path):
+    """Names bound to the same object still share it after loading."""
+    manager = SessionManager(sessions_dir=tmp_path)
+    kernel = NotebookKernel()
+    kernel.reset()
+    kernel.execute_cell("a = [1, 2]\nb = a\nc = [1, 2]")
+    notebook_path = tmp_path / "alias.nblr"
+    manager.save_delta_checkpoint(kernel, notebook_path)
+
+    new_kernel = NotebookKernel()
+    new_kernel.reset()
+    manager.load_checkpoint(new_kernel, notebook_path)
+
+    a, b, c = (new_kernel.get_variable(n) for n in "abc")
+    assert a is b
+    assert a == c and a is not c
+
+
+def test_delta_checkpoint_prunes_unreferenced_blobs(tmp_path):
+    """Blobs of values replaced since the last checkpoint are deleted."""
+    manager = SessionManager(sessions_dir=tmp_path)
+    kernel = NotebookKernel()
+    kernel.reset()
+    other_path = tmp_path / "other.nblr"
+    kernel.execute_cell("keep = 'other notebook'")
+    manager.save_delta_checkpoint(kernel, other_path)
+    kernel.del_variable("keep")
+
+    notebook_path = tmp_path / "prune.nblr"
+    kernel.set_variable("value", 0)
+    manager.save_delta_checkpoint(kernel, notebook_path)
+    blob_count = len(list(manager.blobs_dir.iterdir()))
+    for i in range(1, 5):
+        kernel.set_variable("value", i)
+        manager.save_delta_checkpoint(kernel, notebook_path)
+
+    assert len(list(manager.blobs_dir.iterdir())) == blob_count
+    new_kernel = NotebookKernel()
+    new_kernel.reset()
+    manager.load_checkpoint(new_kernel, other_path)
+    assert new_kernel.get_variable("keep") == "other notebook"
+
+
+def test_delta_checkpoint_skips_pruning_while_another_save_runs(tmp_path):
+    """Blobs are kept while another save may still write a manifest for them."""
+    manager = SessionManager(sessions_dir=tmp_path)
+    kernel = NotebookKernel()
+    kernel.reset()
+    notebook_path = tmp_path / "busy.nblr"
+    kernel.set_variable("value", 0)
+    manager.save_delta_checkpoint(kernel, notebook_path)
+    blob_count = len(list(manager.blobs_dir.glob("*.pkl")))
+
+    with manager._blobs_lock(exclusive=False):
+        kernel.set_variable("value", 1)
+        manager.save_delta_checkpoint(kernel, notebook_path)
+        assert len(list(manager.blobs_dir.glob("*.pkl"))) == blob_count + 1
+
+    manager.save_delta_checkpoint(kernel, notebook_path)
+    assert len(list(manager.blobs_dir.glob("*.pkl"))) == blob_count
+
+
+def test_load_checkpoint_prefers_newest_format(tmp_path):
+    """A full checkpoint written after a delta checkpoint takes precedence."""
+    manager = SessionManager(sessions_dir=tmp_path)
+    kernel = NotebookKernel()
+    notebook_path = tmp_path / "newest.nblr"
+    kernel.execute_cell("value = 'delta'")
+    manager.save_delta_checkpoint(kernel, notebook_path)
+    time.sleep(0.05)
+    kernel.execute_cell("value = 'full'")
+    manager.save_checkpoint(kernel, notebook_path)
+
+    new_kernel = NotebookKernel()
+    new_kernel.reset()
+    manager.load_checkpoint(new_kernel, notebook_path)
+
+    assert new_kernel.get_variable("value") == "full"
+
+
 # ---------------------------------------------------------------------------
 # list_sessions
 # ---------------------------------------------------------------------------
@@ -199,6 +321,61 @@ def test_list_sessions_handles_corrupted_session_files_gracefully(tmp_path):
     assert "error" in corrupt
 
 
+def test_list_sessions_uses_sidecar_without_loading_files(tmp_path):
+    """Saved sessions are listed from their .meta.json sidecar, unloaded."""
+    from unittest.mock import patch
+
+    manager = SessionManager(sessions_dir=tmp_path)
+    kernel = NotebookKernel()
+    kernel.execute_cell("val = 1")
+    path = manager.save_session(kernel, name="sidecar")
+    assert (tmp_path / "sidecar.session.meta.json").exists()
+
+    with patch("dill.load", side_effect=AssertionError("loaded")):
+        sessions = manager.list_sessions()
+
+    session = next(s for s in sessions if s["name"] == "sidecar")
+    assert "error" not in session
+    assert session["path"] == str(path)
+    assert session["var_count"] >= 1
+
+
+def test_list_sessions_writes_missing_sidecar(tmp_path):
+    """A session without a sidecar is loaded once, then listed from a new one."""
+    from unittest.mock import patch
+
+    manager = SessionManager(sessions_dir=tmp_path)
+    kernel = NotebookKernel()
+    kernel.execute_cell("val = 1")
+    manager.save_session(kernel, name="old")
+    meta = tmp_path / "old.session.meta.json"
+    meta.unlink()
+
+    first = next(s for s in manager.list_sessions() if s["name"] == "old")
+    assert meta.exists()
+    with patch("dill.load", side_effect=AssertionError("loaded")):
+        second = next(s for s in manager.list_sessions() if s["name"] == "old")
+    assert second == first
+
+
+def test_delete_session_removes_sidecar(tmp_path):
+    manager = SessionManager(sessions_dir=tmp_path)
+    path = manager.save_session(NotebookKernel(), name="gone")
+    assert manager.delete_session(path)
+    assert not (tmp_path / "gone.session.meta.json").exists()
+
+
+def test_list_sessions_reloads_files_changed_after_saving(tmp_path):
+    """A session file rewritten outside save_session is re-read."""
+    manager = SessionManager(sessions_dir=tmp_path)
+    kernel = NotebookKernel()
+    path = manager.save_session(kernel, name="changed")
+    path.write_bytes(b"not valid dill data!!!!")
+
+    session = next(s for s in manager.list_sessions() if s["name"] == "changed")
+    assert "error" in session
+
+
 def test_list_sessions_returns_required_fields_for_valid_sessions(tmp_path):
     """list_sessions returns name, path, saved_at, var_count for valid sessions."""
     manager = SessionManager(sessions_dir=tmp_path)
@@ -40,6 +40,40 @@ def test_save_unpicklable_filtered_and_listed(sm, kernel, tmp_path):
     assert "bad_sock" in state["unpicklable_vars"]
 
 
+def test_save_picklable_namespace_serializes_once(sm, kernel, monkeypatch):
+    """When every user variable pickles, user values are not probed one by one."""
+    kernel.reset()  # the IPython shell is shared with earlier tests
+    a, b = [1, 2, 3], {"k": "v"}
+    kernel.set_variable("a", a)
+    kernel.set_variable("b", b)
+    probed = []
+    real_dumps = dill.dumps
+    monkeypatch.setattr(dill, "dumps", lambda obj, *args, **kw: probed.append(obj) or real_dumps(obj, *args, **kw))
+
+    path = sm.save_session(kernel, name="once")
+
+    with open(path, "rb") as f:
+        state = dill.load(f)
+    assert state["user_ns"]["a"] == [1, 2, 3]
+    assert not any(obj is a or obj is b for obj in probed)
+    assert "get_ipython" in state["unpicklable_vars"]
+
+
+def test_failed_save_keeps_existing_session(sm, kernel, monkeypatch):
+    """An error while writing leaves the previous session file intact."""
+    kernel.set_variable("x", 1)
+    path = sm.save_session(kernel, name="keep")
+    before = path.read_bytes()
+
+    monkeypatch.setattr(dill, "dump", lambda *a, **kw: (_ for _ in ()).throw(OSError("disk full")))
+    monkeypatch.setattr(dill, "dumps", lambda *a, **kw: b"")
+    with pytest.raises(OSError):
+        sm.save_session(kernel, name="keep")
+
+    assert path.read_bytes() == before
+    assert not [p for p in path.parent.iterdir() if p.name.endswith(".tmp")]
+
+
 def test_save_large_namespace(sm, kernel, tmp_path):
     """Saving a kernel with 100+ variables works correctly."""
     for i in range(120):
@@ -264,3 +298,16 @@ def multiply(a, b):
     fn = new_kernel.get_variable("multiply")
     assert fn is not None
     assert fn(4, 5) == 20
+
+
+def test_session_written_with_highest_protocol(sm, kernel):
+    """Session files use the highest pickle protocol."""
+    import pickle
+    import pickletools
+
+    kernel.set_variable("blob", b"x" * 1024)
+    path = sm.save_session(kernel, name="proto")
+
+    ops = pickletools.genops(path.read_bytes())
+    first_op, arg, _ = next(ops)
+    assert first_op.name == "PROTO" and arg == pickle.HIGHEST_PROTOCOL
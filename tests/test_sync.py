@@ -16,7 +16,6 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pytest
-from flask import Flask
 
 from notebook_lr import Notebook, Cell, CellType, NotebookKernel
 from notebook_lr.mcp_server import (
@@ -50,10 +49,10 @@ def _make_web_client(nb: Notebook):
     kernel = NotebookKernel()
     captured = {}
 
-    def fake_run(self, *a, **kw):
-        captured["app"] = self
+    def fake_serve(app, *a, **kw):
+        captured["app"] = app
 
-    with patch.object(Flask, "run", fake_run), \
+    with patch.object(web_module, "_serve", fake_serve), \
          patch.object(web_module, "NotebookKernel", return_value=kernel):
         web_module.launch_web(notebook=nb)
 
@@ -171,6 +170,39 @@ class TestMcpAutoSave:
 
         assert mtime_after_save == os.path.getmtime(path)
 
+    def test_delayed_auto_save_coalesces_burst(self, tmp_path):
+        """With a save delay, a burst of mutations is written once after the last."""
+        path = _make_notebook_file(tmp_path, ["v0"])
+
+        with patch.dict(os.environ, {"NOTEBOOK_LR_PATH": str(path)}), \
+             patch.object(mcp_module, "_AUTO_SAVE_DELAY", 0.05), \
+             patch.object(mcp_module.Notebook, "save", autospec=True,
+                          side_effect=Notebook.save) as save:
+            for i in range(5):
+                update_cell_source(index=0, source=f"v{i + 1}")
+            assert save.call_count == 0
+            # Reads must not reload the stale file over the pending edits.
+            assert list_cells().cells[0].source == "v5"
+
+            mcp_module._saver._timer.join(timeout=2.0)
+
+        assert save.call_count == 1
+        assert Notebook.load(path).cells[0].source == "v5"
+        assert mcp_module._notebook_mtime == os.path.getmtime(path)
+
+    def test_pending_save_flushed_on_explicit_flush(self, tmp_path):
+        """Flushing the saver writes a scheduled save immediately."""
+        path = _make_notebook_file(tmp_path, ["v0"])
+
+        with patch.dict(os.environ, {"NOTEBOOK_LR_PATH": str(path)}), \
+             patch.object(mcp_module, "_AUTO_SAVE_DELAY", 60.0):
+            add_cell(source="late")
+            assert len(Notebook.load(path).cells) == 1
+            mcp_module._saver.flush()
+
+        assert not mcp_module._saver.pending
+        assert Notebook.load(path).cells[1].source == "late"
+
 
 # ---------------------------------------------------------------------------
 # MCP Server – external change detection (_maybe_reload)
@@ -229,6 +261,46 @@ class TestMcpReloadOnExternalChange:
         assert new_mtime > old_mtime
         assert new_mtime == os.path.getmtime(path)
 
+    def test_burst_of_calls_stats_file_once(self, tmp_path):
+        """Calls within _STAT_CACHE_TTL of the last check skip the stat."""
+        path = _make_notebook_file(tmp_path, ["v1"])
+
+        with patch.dict(os.environ, {"NOTEBOOK_LR_PATH": str(path)}):
+            get_notebook()
+            list_cells()
+            with patch.object(mcp_module.os, "stat", side_effect=AssertionError("stat")):
+                for _ in range(5):
+                    list_cells()
+
+            nb2 = Notebook.new()
+            nb2.insert_cell(0, Cell(type=CellType.CODE, source="v2"))
+            nb2.save(path)
+            _bump_mtime(path)
+            mcp_module._last_stat_ts = float("-inf")
+
+            result = list_cells()
+
+        assert result.cells[0].source == "v2"
+
+
+    def test_reload_drops_cached_cells_of_old_notebook(self, tmp_path):
+        """Cached cell outputs do not keep the replaced notebook's cells alive."""
+        path = _make_notebook_file(tmp_path, ["v1"])
+
+        with patch.dict(os.environ, {"NOTEBOOK_LR_PATH": str(path)}):
+            old_cell = get_notebook().cells[0]
+            list_cells()
+            assert any(c is old_cell for c, _ in mcp_module._cell_output_cache.values())
+
+            nb2 = Notebook.new()
+            nb2.insert_cell(0, Cell(type=CellType.CODE, source="v2"))
+            nb2.save(path)
+            _bump_mtime(path)
+            mcp_module._last_stat_ts = float("-inf")
+            list_cells()
+
+        assert not any(c is old_cell for c, _ in mcp_module._cell_output_cache.values())
+
 
 # ---------------------------------------------------------------------------
 # MCP Server – _reset_notebook
@@ -367,6 +439,46 @@ class TestWebCheckUpdates:
         second = client.get("/api/notebook/check-updates").get_json()
         assert second["changed"] is False
 
+    def test_polls_within_ttl_share_one_stat(self, tmp_path):
+        """Back-to-back check-updates polls reuse a single stat of the file."""
+        path = _make_notebook_file(tmp_path, ["v1"])
+        nb = Notebook.load(path)
+        nb.metadata["path"] = str(path)
+        client, nb_ref, kernel = _make_web_client(nb)
+
+        with patch("notebook_lr.web.os.stat", wraps=os.stat) as mock_stat:
+            for _ in range(3):
+                assert client.get("/api/notebook/check-updates").get_json()["changed"] is False
+        assert mock_stat.call_count == 1
+
+    def test_force_detects_change_with_same_mtime(self, tmp_path):
+        """?force=1 compares file contents when an edit keeps the old mtime."""
+        path = _make_notebook_file(tmp_path, ["v1"])
+        mtime = os.path.getmtime(path)
+        nb = Notebook.load(path)
+        nb.metadata["path"] = str(path)
+        client, nb_ref, kernel = _make_web_client(nb)
+
+        nb2 = Notebook.new()
+        nb2.insert_cell(0, Cell(type=CellType.CODE, source="v2 edited elsewhere"))
+        nb2.save(path)
+        os.utime(path, (mtime, mtime))
+
+        plain = client.get("/api/notebook/check-updates").get_json()
+        assert plain["changed"] is False
+        forced = client.get("/api/notebook/check-updates?force=1").get_json()
+        assert forced["changed"] is True
+
+    def test_force_without_change_returns_no_change(self, tmp_path):
+        """?force=1 on an untouched file reports no change."""
+        path = _make_notebook_file(tmp_path, ["v1"])
+        nb = Notebook.load(path)
+        nb.metadata["path"] = str(path)
+        client, nb_ref, kernel = _make_web_client(nb)
+
+        resp = client.get("/api/notebook/check-updates?force=1").get_json()
+        assert resp["changed"] is False
+
 
 # ---------------------------------------------------------------------------
 # Web Server – auto-save on cell mutations
@@ -412,6 +524,42 @@ class TestWebAutoSave:
         assert len(saved.cells) == 1
         assert saved.cells[0].source == "keep"
 
+    def test_delayed_auto_save_coalesces_edits(self, tmp_path):
+        """With a save delay, a burst of cell edits is written to disk once."""
+        path = _make_notebook_file(tmp_path, ["v0"])
+        nb = Notebook.load(path)
+        nb.metadata["path"] = str(path)
+        client, nb_ref, kernel = _make_web_client(nb)
+
+        with patch.object(web_module, "_AUTO_SAVE_DELAY", 0.05), \
+             patch.object(Notebook, "save", autospec=True, side_effect=Notebook.save) as save:
+            for i in range(5):
+                client.post("/api/cell/update", json={"index": 0, "source": f"v{i + 1}"})
+            assert save.call_count == 0
+            deadline = time.monotonic() + 2.0
+            while save.call_count == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)
+
+        assert save.call_count == 1
+        assert Notebook.load(path).cells[0].source == "v5"
+        check = client.get("/api/notebook/check-updates").get_json()
+        assert check["changed"] is False
+
+    def test_explicit_save_replaces_pending_auto_save(self, tmp_path):
+        """POST /api/save writes immediately and drops the scheduled auto-save."""
+        path = _make_notebook_file(tmp_path, ["v0"])
+        nb = Notebook.load(path)
+        nb.metadata["path"] = str(path)
+        client, nb_ref, kernel = _make_web_client(nb)
+
+        with patch.object(web_module, "_AUTO_SAVE_DELAY", 60.0):
+            client.post("/api/cell/update", json={"index": 0, "source": "edited"})
+            assert Notebook.load(path).cells[0].source == "v0"
+            client.post("/api/save", json={})
+
+        assert Notebook.load(path).cells[0].source == "edited"
+
     def test_no_auto_save_without_path(self):
         """Mutations on a notebook without a path don't raise errors or create files."""
         nb = Notebook.new()
@@ -214,6 +214,18 @@ class TestIsMarkdown:
         # Single asterisks mid-word should not trigger bold
         assert is_markdown("price*discount") is False
 
+    def test_short_text_is_cached(self):
+        _utils._is_markdown_cached.cache_clear()
+        assert is_markdown("# cached") is True
+        assert is_markdown("# cached") is True
+        assert _utils._is_markdown_cached.cache_info().hits == 1
+
+    def test_long_text_bypasses_cache(self):
+        _utils._is_markdown_cached.cache_clear()
+        text = "x = 1\n" * 1000 + "# trailing header"
+        assert is_markdown(text) is True
+        assert _utils._is_markdown_cached.cache_info().currsize == 0
+
 
 # ---------------------------------------------------------------------------
 # truncate_text
@@ -313,3 +313,22 @@ def test_empty_dict_returns_text_with_dim_style():
     result = format_rich_output({})
     assert isinstance(result, Text)
     assert result.style == "dim"
+
+
+# ---------------------------------------------------------------------------
+# make_syntax
+# ---------------------------------------------------------------------------
+
+def test_make_syntax_reuses_lexer_and_theme():
+    """Syntax renderables built by make_syntax share one lexer and theme."""
+    first = _utils.make_syntax("x = 1")
+    second = _utils.make_syntax("y = 2", line_numbers=True)
+    assert first.lexer is second.lexer
+    assert first._theme is second._theme
+    assert "python" in type(first.lexer).__name__.lower()
+
+
+def test_make_syntax_uses_requested_lexer():
+    """make_syntax resolves the lexer by name."""
+    result = _utils.make_syntax('{"a": 1}', "json")
+    assert "json" in type(result.lexer).__name__.lower()
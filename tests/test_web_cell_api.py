@@ -1,5 +1,10 @@
 """Tests for web API cell operation endpoints."""
 
+import gzip
+import json
+import time
+from unittest.mock import patch
+
 import pytest
 from notebook_lr import Cell, CellType
 
@@ -28,6 +33,52 @@ class TestApiNotebook:
         for key in ("index", "id", "type", "source", "outputs", "execution_count", "comments"):
             assert key in c
 
+    def test_notebook_is_streamed_as_json(self, web_app):
+        client, nb, kernel = web_app
+        for i in range(3):
+            nb.insert_cell(i, Cell(type=CellType.CODE, source=f"x = {i}",
+                                   outputs=[{"type": "stream", "text": "é\n"}]))
+        resp = client.get("/api/notebook")
+        assert resp.is_streamed
+        assert resp.mimetype == "application/json"
+        data = resp.get_json()
+        assert data["version"] == nb.version
+        assert data["metadata"] == nb.metadata
+        assert [c["index"] for c in data["cells"]] == [0, 1, 2]
+        assert data["cells"][2]["outputs"] == [{"type": "stream", "text": "é\n"}]
+
+
+class TestGzipResponses:
+    def test_notebook_gzipped_when_accepted(self, web_app):
+        client, nb, kernel = web_app
+        nb.insert_cell(0, Cell(type=CellType.CODE, source="x = 1\n" * 500))
+        resp = client.get("/api/notebook", headers={"Accept-Encoding": "gzip, deflate"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        data = json.loads(gzip.decompress(resp.get_data()))
+        assert data["cells"][0]["source"] == "x = 1\n" * 500
+
+    def test_buffered_json_gzipped_above_threshold(self, web_app):
+        client, nb, kernel = web_app
+        kernel.reset()
+        resp = client.get("/api/variables", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in resp.headers  # below the size threshold
+
+        for i in range(20):
+            kernel.set_variable(f"gz_var_{i}", "x" * 150)
+        resp = client.get("/api/variables", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        names = [v["name"] for v in json.loads(gzip.decompress(resp.get_data()))["variables"]]
+        assert "gz_var_0" in names
+        kernel.reset()
+
+    def test_not_gzipped_without_accept_encoding(self, web_app):
+        client, nb, kernel = web_app
+        nb.insert_cell(0, Cell(type=CellType.CODE, source="x = 1\n" * 500))
+        resp = client.get("/api/notebook")
+        assert "Content-Encoding" not in resp.headers
+        assert resp.get_json()["cells"][0]["source"] == "x = 1\n" * 500
+
 
 class TestApiCellAdd:
     def test_add_code_cell(self, web_app):
@@ -142,6 +193,15 @@ class TestApiCellExecute:
         assert data["success"] is True
         assert "outputs" in data and "execution_count" in data
 
+    def test_output_and_error_text_split(self, web_app):
+        client, nb, kernel = web_app
+        client.post("/api/cell/add", json={"type": "code"})
+        source = "print('first')\nprint('second')\n1/0"
+        data = client.post("/api/cell/execute", json={"index": 0, "source": source}).get_json()
+        assert data["output_text"].startswith("first\nsecond")
+        assert "ZeroDivisionError" in data["error_text"]
+        assert "first" not in data["error_text"]
+
     def test_execute_with_source_override(self, web_app):
         client, nb, kernel = web_app
         client.post("/api/cell/add", json={"type": "code"})
@@ -180,6 +240,32 @@ class TestApiCellExecute:
         data = client.post("/api/cell/execute", json={"index": 0, "source": "print('hello')"}).get_json()
         assert "output_text" in data and "error_text" in data
 
+    def test_execute_runs_on_kernel_worker(self, web_app):
+        import threading
+
+        client, nb, kernel = web_app
+        client.post("/api/cell/add", json={"type": "code"})
+        threads = []
+        real_execute = kernel.execute_cell
+
+        def record(source):
+            threads.append(threading.current_thread().name)
+            return real_execute(source)
+
+        with patch.object(kernel, "execute_cell", side_effect=record):
+            client.post("/api/cell/execute", json={"index": 0, "source": "x = 1"})
+            client.post("/api/execute-all", json={})
+        assert len(threads) == 2
+        assert all(name.startswith("notebook-lr-kernel") for name in threads)
+
+    def test_execute_raw_0_omits_outputs(self, web_app):
+        client, nb, kernel = web_app
+        client.post("/api/cell/add", json={"type": "code"})
+        data = client.post("/api/cell/execute?raw=0", json={"index": 0, "source": "print('hello')"}).get_json()
+        assert "outputs" not in data
+        assert data["output_text"] == "hello"
+        assert nb.cells[0].outputs
+
 
 class TestApiExecuteAll:
     def test_execute_all_empty(self, web_app):
@@ -219,6 +305,127 @@ class TestApiExecuteAll:
         assert len(data["results"]) == 2
         assert data["results"][1]["success"] is False
 
+    def _wait_for_job(self, client, job_id):
+        results = []
+        for _ in range(500):
+            status = client.get(f"/api/execute-all/status/{job_id}?since={len(results)}").get_json()
+            results.extend(status["results"])
+            if status["done"]:
+                return results, status
+            time.sleep(0.01)
+        pytest.fail("run-all job did not finish")
+
+    def test_background_run_all_reports_results(self, web_app):
+        client, nb, kernel = web_app
+        for _ in range(3):
+            client.post("/api/cell/add", json={"type": "code"})
+        nb.cells[0].source = "bg_x = 1"
+        nb.cells[1].source = "print(bg_x + 1)"
+        nb.cells[2].source = "1/0"
+        job = client.post("/api/execute-all", json={"background": True}).get_json()
+        results, status = self._wait_for_job(client, job["job_id"])
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert results[1]["output_text"] == "2"
+        assert results[2]["success"] is False
+        assert "error" not in status
+        assert nb.cells[1].execution_count is not None
+        # A finished job is forgotten once its final status was read.
+        assert client.get(f"/api/execute-all/status/{job['job_id']}").status_code == 404
+
+    def test_unpolled_finished_jobs_expire(self, web_app, monkeypatch):
+        import notebook_lr.web as web_module
+
+        client, nb, kernel = web_app
+        monkeypatch.setattr(web_module, "_RUN_ALL_JOB_TTL", 0.0)
+        first = client.post("/api/execute-all", json={"background": True}).get_json()["job_id"]
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            # Starting another job drops finished ones past their TTL.
+            second = client.post("/api/execute-all", json={"background": True}).get_json()["job_id"]
+            if client.get(f"/api/execute-all/status/{first}").status_code == 404:
+                break
+            time.sleep(0.01)
+        else:
+            pytest.fail("finished run-all job was never expired")
+        self._wait_for_job(client, second)
+
+    def test_run_all_status_unknown_job_404(self, web_app):
+        client, nb, kernel = web_app
+        assert client.get("/api/execute-all/status/nope").status_code == 404
+
+    def _three_cells(self, client, nb):
+        for _ in range(3):
+            client.post("/api/cell/add", json={"type": "code"})
+        nb.cells[0].source = "runs = globals().get('runs', 0) + 1"
+        nb.cells[1].source = "y = runs * 10"
+        nb.cells[2].source = "print(y)"
+
+    def test_skip_unchanged_reuses_unchanged_cells(self, web_app):
+        client, nb, kernel = web_app
+        kernel.reset()
+        self._three_cells(client, nb)
+        first = client.post("/api/execute-all", json={"skip_unchanged": True}).get_json()
+        second = client.post("/api/execute-all", json={"skip_unchanged": True}).get_json()
+        assert [r.get("skipped", False) for r in first["results"]] == [False, False, False]
+        assert [r.get("skipped", False) for r in second["results"]] == [True, True, True]
+        assert second["results"][2]["output_text"] == "10"
+        assert kernel.get_variable("runs") == 1
+
+    def test_skip_unchanged_reruns_from_first_changed_cell(self, web_app):
+        client, nb, kernel = web_app
+        kernel.reset()
+        self._three_cells(client, nb)
+        client.post("/api/execute-all", json={"skip_unchanged": True})
+        nb.cells[1].source = "y = runs * 100"
+        data = client.post("/api/execute-all", json={"skip_unchanged": True}).get_json()
+        assert [r.get("skipped", False) for r in data["results"]] == [True, False, False]
+        assert data["results"][2]["output_text"] == "100"
+
+    def test_skip_unchanged_invalidated_by_other_execution(self, web_app):
+        client, nb, kernel = web_app
+        kernel.reset()
+        self._three_cells(client, nb)
+        client.post("/api/execute-all", json={"skip_unchanged": True})
+        client.post("/api/cell/execute", json={"index": 0})
+        data = client.post("/api/execute-all", json={"skip_unchanged": True}).get_json()
+        assert not any(r.get("skipped") for r in data["results"])
+        client.post("/api/clear-variables")
+        data = client.post("/api/execute-all", json={"skip_unchanged": True}).get_json()
+        assert not any(r.get("skipped") for r in data["results"])
+
+    def test_clear_during_background_run_all_invalidates_skip(self, web_app):
+        import threading
+
+        client, nb, kernel = web_app
+        kernel.reset()
+        gate = threading.Event()
+        kernel.set_variable("gate", gate)
+        for _ in range(2):
+            client.post("/api/cell/add", json={"type": "code"})
+        nb.cells[0].source = "a = 1"
+        nb.cells[1].source = "gate.wait(5)"
+        job_id = client.post("/api/execute-all", json={"background": True}).get_json()["job_id"]
+
+        cleared = threading.Thread(target=lambda: client.post("/api/clear-variables"))
+        cleared.start()
+        time.sleep(0.05)
+        gate.set()
+        cleared.join(timeout=5)
+        self._wait_for_job(client, job_id)
+
+        nb.cells[1].source = "print(a)"
+        data = client.post("/api/execute-all", json={"skip_unchanged": True}).get_json()
+        assert not any(r.get("skipped") for r in data["results"])
+        assert data["results"][1]["output_text"] == "1"
+
+    def test_execute_all_reruns_by_default(self, web_app):
+        client, nb, kernel = web_app
+        kernel.reset()
+        self._three_cells(client, nb)
+        client.post("/api/execute-all")
+        client.post("/api/execute-all")
+        assert kernel.get_variable("runs") == 2
+
 
 class TestApiNotebookInfo:
     def test_info_empty(self, web_app):
@@ -241,3 +448,76 @@ class TestApiNotebookInfo:
         client.post("/api/cell/add", json={"type": "code"})
         client.post("/api/cell/execute", json={"index": 0, "source": "x = 1"})
         assert client.get("/api/notebook-info").get_json()["executed_count"] == 1
+
+    def test_info_counts_follow_routes(self, web_app):
+        client, nb, kernel = web_app
+        info = lambda: client.get("/api/notebook-info").get_json()
+        assert info()["code_count"] == 0
+        for t in ("code", "markdown", "code"):
+            client.post("/api/cell/add", json={"type": t})
+        client.post("/api/cell/execute", json={"index": 0, "source": "x = 1"})
+        client.post("/api/cell/execute", json={"index": 0, "source": "x = 2"})
+        data = info()
+        assert (data["code_count"], data["md_count"], data["executed_count"]) == (2, 1, 1)
+
+        nb.cells[2].source = "y = 1"
+        client.post("/api/execute-all")
+        client.post("/api/cell/delete", json={"index": 0})
+        data = info()
+        assert (data["cell_count"], data["code_count"], data["executed_count"]) == (2, 1, 1)
+
+    def test_info_recounts_after_direct_changes(self, web_app):
+        client, nb, kernel = web_app
+        client.post("/api/cell/add", json={"type": "code"})
+        assert client.get("/api/notebook-info").get_json()["code_count"] == 1
+        nb.insert_cell(0, Cell(type=CellType.CODE, source="", execution_count=3))
+        client.post("/api/cell/add", json={"type": "markdown"})
+        data = client.get("/api/notebook-info").get_json()
+        assert (data["code_count"], data["md_count"], data["executed_count"]) == (2, 1, 1)
+
+
+class TestJsonProvider:
+    def test_matches_flask_default_encoding(self, web_app):
+        import datetime
+        import decimal
+        from flask import Flask
+        from flask.json.provider import DefaultJSONProvider
+        from notebook_lr.web import _make_json_provider
+
+        app = Flask(__name__)
+        provider = _make_json_provider(app)
+        if provider is None:
+            pytest.skip("orjson not installed")
+        default = DefaultJSONProvider(app)
+        obj = {
+            "b": [1, 2.5, None, True],
+            "a": {"when": datetime.date(2024, 1, 2), "amount": decimal.Decimal("1.5")},
+        }
+        assert provider.dumps(obj, separators=(",", ":")) == default.dumps(
+            obj, separators=(",", ":")
+        )
+        assert provider.loads(b'{"x": [1, 2]}') == {"x": [1, 2]}
+
+    def test_responses_compact_and_unsorted(self, web_app):
+        client, nb, kernel = web_app
+        body = client.get("/api/notebook-info").get_data(as_text=True)
+        assert body.startswith('{"name":"Untitled","cell_count":0,')
+        assert "\n" not in body.strip()
+
+    def test_malformed_body_is_bad_request(self, web_app):
+        client, nb, kernel = web_app
+        resp = client.post("/api/cell/add", data=b"{not json", content_type="application/json")
+        assert resp.status_code == 400
+        assert nb.cells == []
+
+    def test_empty_body_uses_defaults(self, web_app):
+        client, nb, kernel = web_app
+        resp = client.post("/api/cell/add", data=b"")
+        assert resp.get_json()["cell"]["type"] == "code"
+
+    def test_requests_and_responses_round_trip(self, web_app):
+        client, nb, kernel = web_app
+        client.post("/api/cell/add", json={"type": "code"})
+        client.post("/api/cell/update", json={"index": 0, "source": "print('héllo')"})
+        data = client.get("/api/notebook").get_json()
+        assert data["cells"][0]["source"] == "print('héllo')"
@@ -1,11 +1,24 @@
 """Tests for web API comment and variables endpoints."""
 
+import os
+import threading
+import time
 from unittest.mock import patch, MagicMock
 import pytest
 from notebook_lr import Cell, CellType
 from notebook_lr.notebook import Comment
 
 
+def _wait_for_comment(client, comment_id, timeout=5.0):
+    """Poll the status endpoint until the comment's AI call has finished."""
+    deadline = time.monotonic() + timeout
+    while True:
+        comment = client.get(f"/api/cell/comment/status?id={comment_id}").get_json()["comment"]
+        if comment["status"] != "loading" or time.monotonic() > deadline:
+            return comment
+        time.sleep(0.01)
+
+
 class TestCommentAdd:
     def test_add_comment_returns_ok(self, web_app):
         client, nb, kernel = web_app
@@ -14,20 +27,21 @@ class TestCommentAdd:
 
         with patch("subprocess.run") as mock_sub, \
              patch("os.path.isfile", return_value=True):
-            mock_sub.return_value = MagicMock(returncode=0, stdout="AI answer", stderr="")
+            mock_sub.return_value = MagicMock(returncode=0, stdout=b"AI answer", stderr=b"")
             resp = client.post("/api/cell/comment/add", json={
                 "cell_id": cell.id, "selected_text": "x = 1",
                 "user_comment": "What does this do?", "provider": "claude",
             })
+            data = resp.get_json()
+            _wait_for_comment(client, data["comment"]["id"])
         assert resp.status_code == 200
-        data = resp.get_json()
         assert data["ok"] is True and "comment" in data
 
     def test_add_comment_nonexistent_cell_404(self, web_app):
         client, nb, kernel = web_app
         with patch("subprocess.run") as mock_sub, \
              patch("os.path.isfile", return_value=True):
-            mock_sub.return_value = MagicMock(returncode=0, stdout="AI", stderr="")
+            mock_sub.return_value = MagicMock(returncode=0, stdout=b"AI", stderr=b"")
             resp = client.post("/api/cell/comment/add", json={
                 "cell_id": "nonexistent", "selected_text": "x", "user_comment": "?",
             })
@@ -40,11 +54,12 @@ class TestCommentAdd:
 
         with patch("subprocess.run") as mock_sub, \
              patch("os.path.isfile", return_value=True):
-            mock_sub.return_value = MagicMock(returncode=0, stdout="answer", stderr="")
+            mock_sub.return_value = MagicMock(returncode=0, stdout=b"answer", stderr=b"")
             resp = client.post("/api/cell/comment/add", json={
                 "cell_id": cell.id, "selected_text": "z",
                 "user_comment": "?", "provider": "invalid_provider",
             })
+            _wait_for_comment(client, resp.get_json()["comment"]["id"])
         assert resp.get_json()["comment"]["provider"] == "claude"
 
     def test_add_comment_resolved_status(self, web_app):
@@ -54,14 +69,238 @@ class TestCommentAdd:
 
         with patch("subprocess.run") as mock_sub, \
              patch("os.path.isfile", return_value=True):
-            mock_sub.return_value = MagicMock(returncode=0, stdout="Great explanation", stderr="")
+            mock_sub.return_value = MagicMock(returncode=0, stdout=b"Great explanation", stderr=b"")
             resp = client.post("/api/cell/comment/add", json={
                 "cell_id": cell.id, "selected_text": "a + b",
                 "user_comment": "Add?", "provider": "claude",
             })
-        data = resp.get_json()
-        assert data["comment"]["status"] == "resolved"
-        assert data["comment"]["ai_response"] == "Great explanation"
+            assert resp.get_json()["comment"]["status"] == "loading"
+            comment = _wait_for_comment(client, resp.get_json()["comment"]["id"])
+        assert comment["status"] == "resolved"
+        assert comment["ai_response"] == "Great explanation"
+        assert cell.comments[0].status == "resolved"
+
+    def test_add_comment_returns_before_ai_finishes(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="")
+        nb.insert_cell(0, cell)
+        release = threading.Event()
+
+        def slow_run(*args, **kwargs):
+            release.wait(5)
+            return MagicMock(returncode=0, stdout=b"late answer", stderr=b"")
+
+        with patch("subprocess.run", side_effect=slow_run), \
+             patch("os.path.isfile", return_value=True):
+            resp = client.post("/api/cell/comment/add", json={
+                "cell_id": cell.id, "selected_text": "a", "user_comment": "?",
+            })
+            comment_id = resp.get_json()["comment"]["id"]
+            status = client.get(f"/api/cell/comment/status?id={comment_id}").get_json()
+            assert status["comment"]["status"] == "loading"
+            release.set()
+            comment = _wait_for_comment(client, comment_id)
+        assert comment["ai_response"] == "late answer"
+
+    def test_response_saved_without_polling(self, web_app, tmp_path):
+        from notebook_lr import Notebook
+
+        client, nb, kernel = web_app
+        path = tmp_path / "nb.nblr"
+        nb.metadata["path"] = str(path)
+        cell = Cell(type=CellType.CODE, source="")
+        nb.insert_cell(0, cell)
+
+        with patch("subprocess.run") as mock_sub, \
+             patch("os.path.isfile", return_value=True):
+            mock_sub.return_value = MagicMock(returncode=0, stdout=b"saved answer", stderr=b"")
+            client.post("/api/cell/comment/add", json={
+                "cell_id": cell.id, "selected_text": "a", "user_comment": "?",
+            })
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                if path.exists() and Notebook.load(path).cells[0].comments:
+                    break
+                time.sleep(0.01)
+        comment = Notebook.load(path).cells[0].comments[0]
+        assert comment.status == "resolved"
+        assert comment.ai_response == "saved answer"
+
+    def test_concurrent_status_polls(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="")
+        nb.insert_cell(0, cell)
+        release = threading.Event()
+
+        def slow_run(*args, **kwargs):
+            release.wait(5)
+            return MagicMock(returncode=0, stdout=b"answer", stderr=b"")
+
+        with patch("subprocess.run", side_effect=slow_run), \
+             patch("os.path.isfile", return_value=True):
+            ids = [
+                client.post("/api/cell/comment/add", json={
+                    "cell_id": cell.id, "selected_text": "a", "user_comment": "?",
+                }).get_json()["comment"]["id"]
+                for _ in range(4)
+            ]
+            codes = []
+
+            def poll():
+                with client.application.test_client() as c:
+                    for cid in ids * 10:
+                        codes.append(c.get(f"/api/cell/comment/status?id={cid}").status_code)
+
+            threads = [threading.Thread(target=poll) for _ in range(6)]
+            for t in threads:
+                t.start()
+            release.set()
+            for t in threads:
+                t.join()
+            for cid in ids:
+                assert _wait_for_comment(client, cid)["status"] == "resolved"
+        assert set(codes) == {200}
+
+    def test_add_comment_error_status(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="")
+        nb.insert_cell(0, cell)
+
+        with patch("subprocess.run") as mock_sub, \
+             patch("os.path.isfile", return_value=True):
+            mock_sub.return_value = MagicMock(returncode=1, stdout=b"", stderr=b"boom")
+            resp = client.post("/api/cell/comment/add", json={
+                "cell_id": cell.id, "selected_text": "a", "user_comment": "?",
+            })
+            comment = _wait_for_comment(client, resp.get_json()["comment"]["id"])
+        assert comment["status"] == "error"
+        assert comment["ai_response"] == "Error: boom"
+
+    def test_add_comment_decodes_utf8_output(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="")
+        nb.insert_cell(0, cell)
+
+        with patch("subprocess.run") as mock_sub, \
+             patch("os.path.isfile", return_value=True):
+            mock_sub.return_value = MagicMock(
+                returncode=0, stdout="설명입니다\n".encode() + b"\xff", stderr=b"",
+            )
+            resp = client.post("/api/cell/comment/add", json={
+                "cell_id": cell.id, "selected_text": "a", "user_comment": "?",
+            })
+            comment = _wait_for_comment(client, resp.get_json()["comment"]["id"])
+        assert comment["ai_response"] == "설명입니다\n\ufffd"
+        assert "text" not in mock_sub.call_args.kwargs
+
+    def test_prompt_sent_on_stdin(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="total = sum(xs)")
+        nb.insert_cell(0, cell)
+
+        with patch("subprocess.run") as mock_sub, \
+             patch("os.path.isfile", return_value=True):
+            mock_sub.return_value = MagicMock(returncode=0, stdout=b"ok", stderr=b"")
+            resp = client.post("/api/cell/comment/add", json={
+                "cell_id": cell.id, "selected_text": "sum(xs)", "user_comment": "빠른가요?",
+            })
+            _wait_for_comment(client, resp.get_json()["comment"]["id"])
+        args, kwargs = mock_sub.call_args
+        prompt = kwargs["input"].decode()
+        assert args[0][1:] == ["-p", "--dangerously-skip-permissions"]
+        assert "```python\ntotal = sum(xs)\n```" in prompt
+        assert "사용자의 질문: 빠른가요?" in prompt
+        assert prompt.endswith("선택된 코드에 대해 교육적인 답변을 한국어로 제공해주세요.")
+
+    def test_comment_status_unknown_id_404(self, web_app):
+        client, nb, kernel = web_app
+        resp = client.get("/api/cell/comment/status?id=missing")
+        assert resp.status_code == 404
+
+
+class TestProviderEnvCache:
+    def _add(self, client, cell):
+        resp = client.post("/api/cell/comment/add", json={
+            "cell_id": cell.id, "selected_text": "x", "user_comment": "?", "provider": "glm",
+        })
+        _wait_for_comment(client, resp.get_json()["comment"]["id"])
+        return resp
+
+    def test_gt_env_loaded_once_across_comments(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="x = 1")
+        nb.insert_cell(0, cell)
+
+        def fake_run(args, **kwargs):
+            if os.path.basename(args[0]) == "claude":
+                return MagicMock(returncode=0, stdout=b"answer", stderr=b"")
+            return MagicMock(returncode=0, stdout="ANTHROPIC_AUTH_TOKEN=real-token\n", stderr="")
+
+        with patch("subprocess.run", side_effect=fake_run) as mock_sub, \
+             patch("os.path.isfile", return_value=True):
+            assert self._add(client, cell).status_code == 200
+            assert self._add(client, cell).status_code == 200
+        claude = [c for c in mock_sub.call_args_list if os.path.basename(c.args[0][0]) == "claude"]
+        assert mock_sub.call_count - len(claude) == 1
+        assert len(claude) == 2
+        assert claude[0].kwargs["env"]["ANTHROPIC_AUTH_TOKEN"] == "real-token"
+
+    def test_env_dict_reused_without_copying(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="x = 1")
+        nb.insert_cell(0, cell)
+
+        with patch("subprocess.run") as mock_sub, \
+             patch("os.environ.copy", wraps=os.environ.copy) as copy_env:
+            mock_sub.return_value = MagicMock(returncode=0, stdout=b"answer", stderr=b"")
+            for _ in range(3):
+                resp = client.post("/api/cell/comment/add", json={
+                    "cell_id": cell.id, "selected_text": "x", "user_comment": "?",
+                })
+                _wait_for_comment(client, resp.get_json()["comment"]["id"])
+        envs = [c.kwargs["env"] for c in mock_sub.call_args_list]
+        assert len(envs) == 3 and envs[0] is envs[1] is envs[2]
+        assert copy_env.call_count == 1
+        assert "ANTHROPIC_AUTH_TOKEN" not in envs[0]
+
+    def test_refresh_env_reloads_gt_env(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="x = 1")
+        nb.insert_cell(0, cell)
+
+        def fake_run(args, **kwargs):
+            if os.path.basename(args[0]) == "claude":
+                return MagicMock(returncode=0, stdout=b"answer", stderr=b"")
+            return MagicMock(returncode=0, stdout="ANTHROPIC_AUTH_TOKEN=real-token\n", stderr="")
+
+        with patch("subprocess.run", side_effect=fake_run) as mock_sub, \
+             patch("os.path.isfile", return_value=True):
+            self._add(client, cell)
+            assert client.post("/api/provider/refresh-env").get_json() == {"ok": True}
+            self._add(client, cell)
+        shells = [c for c in mock_sub.call_args_list if os.path.basename(c.args[0][0]) != "claude"]
+        assert len(shells) == 2
+
+    def test_placeholder_token_not_cached(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="x = 1")
+        nb.insert_cell(0, cell)
+
+        with patch("subprocess.run") as mock_sub, \
+             patch("os.path.isfile", return_value=True):
+            mock_sub.return_value = MagicMock(
+                returncode=0, stdout="ANTHROPIC_AUTH_TOKEN=your-z-ai-token-here\n", stderr="",
+            )
+            resp = client.post("/api/cell/comment/add", json={
+                "cell_id": cell.id, "selected_text": "x", "user_comment": "?", "provider": "glm",
+            })
+            assert resp.status_code == 400
+            mock_sub.side_effect = lambda args, **kwargs: MagicMock(
+                returncode=0, stderr=b"",
+                stdout=b"answer" if os.path.basename(args[0]) == "claude"
+                else "ANTHROPIC_AUTH_TOKEN=real-token\n",
+            )
+            assert self._add(client, cell).status_code == 200
 
 
 class TestCommentDelete:
@@ -133,6 +372,29 @@ class TestVariables:
         assert var["type"] == "int" and var["value"] == "7"
 
 
+    def test_array_values_summarized_by_shape(self, web_app):
+        client, nb, kernel = web_app
+
+        class ndarray:
+            __module__ = "numpy"
+            shape = (1000, 1000)
+
+            def __repr__(self):
+                raise AssertionError("full repr computed")
+
+        kernel.set_variable("big_array", ndarray())
+        var = next(v for v in client.get("/api/variables").get_json()["variables"] if v["name"] == "big_array")
+        kernel.del_variable("big_array")
+        assert var == {"name": "big_array", "type": "ndarray", "value": "<ndarray shape=(1000, 1000)>"}
+
+    def test_large_container_abbreviated(self, web_app):
+        client, nb, kernel = web_app
+        kernel.set_variable("many", list(range(100_000)))
+        var = next(v for v in client.get("/api/variables").get_json()["variables"] if v["name"] == "many")
+        kernel.del_variable("many")
+        assert var["value"] == "[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...]"
+
+
 class TestClearVariables:
     def test_clear_returns_ok(self, web_app):
         client, nb, kernel = web_app
@@ -146,3 +408,68 @@ class TestClearVariables:
         client.post("/api/clear-variables")
         names = [v["name"] for v in client.get("/api/variables").get_json()["variables"]]
         assert "temp_var" not in names
+
+
+class TestCommentDumpCache:
+    def test_notebook_listing_reuses_comment_dumps(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="x = 1", comments=[
+            Comment(from_line=0, from_ch=0, to_line=0, to_ch=1,
+                    selected_text="x", user_comment="why?"),
+        ])
+        nb.insert_cell(0, cell)
+
+        first = client.get("/api/notebook").get_json()["cells"][0]["comments"]
+        with patch("notebook_lr.web._COMMENTS_ADAPTER") as adapter:
+            adapter.dump_python.side_effect = AssertionError("re-dumped")
+            second = client.get("/api/notebook").get_json()["cells"][0]["comments"]
+        assert first == second
+
+    def test_listing_matches_model_dump(self, web_app):
+        client, nb, kernel = web_app
+        comments = [
+            Comment(from_line=0, from_ch=0, to_line=0, to_ch=1, selected_text="x",
+                    user_comment="why?", ai_response="because", status="resolved"),
+            Comment(from_line=1, from_ch=0, to_line=1, to_ch=3, selected_text="y",
+                    user_comment="how?", provider="kimi"),
+        ]
+        nb.insert_cell(0, Cell(type=CellType.CODE, source="x = 1\ny = 2", comments=comments))
+        listed = client.get("/api/notebook").get_json()["cells"][0]["comments"]
+        assert listed == [c.model_dump() for c in comments]
+
+    def test_add_and_delete_refresh_listing(self, web_app):
+        client, nb, kernel = web_app
+        cell = Cell(type=CellType.CODE, source="x = 1")
+        nb.insert_cell(0, cell)
+        assert client.get("/api/notebook").get_json()["cells"][0]["comments"] == []
+
+        with patch("subprocess.run") as mock_sub, \
+             patch("os.path.isfile", return_value=True):
+            mock_sub.return_value = MagicMock(returncode=0, stdout=b"answer", stderr=b"")
+            comment_id = client.post("/api/cell/comment/add", json={
+                "cell_id": cell.id, "selected_text": "x", "user_comment": "?",
+            }).get_json()["comment"]["id"]
+            _wait_for_comment(client, comment_id)
+        comments = client.get("/api/notebook").get_json()["cells"][0]["comments"]
+        assert [c["id"] for c in comments] == [comment_id]
+
+        client.post("/api/cell/comment/delete", json={"cell_id": cell.id, "comment_id": comment_id})
+        assert client.get("/api/notebook").get_json()["cells"][0]["comments"] == []
+
+
+class TestCellIdLookup:
+    def test_lookup_follows_cells_moved_outside_routes(self, web_app):
+        client, nb, kernel = web_app
+        first = Cell(type=CellType.CODE, source="a")
+        second = Cell(type=CellType.CODE, source="b")
+        nb.insert_cell(0, first)
+        nb.insert_cell(1, second)
+
+        def delete(cell_id):
+            return client.post("/api/cell/comment/delete", json={"cell_id": cell_id, "comment_id": "x"})
+
+        assert delete(second.id).status_code == 200
+        nb.cells.reverse()
+        nb.remove_cell(0)
+        assert delete(second.id).status_code == 404
+        assert delete(first.id).status_code == 200
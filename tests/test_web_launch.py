@@ -44,3 +44,55 @@ class TestFlaskLaunchConfiguration:
         source = inspect.getsource(launch_web)
         assert "notebook.html" in source
         assert "render_template" in source
+
+
+class TestStaticCaching:
+    """Static assets are linked by content hash and revalidated without reads."""
+
+    def _asset_url(self, client, name):
+        html = client.get("/").get_data(as_text=True)
+        start = html.index(f"/static/js/{name}?v=")
+        return html[start:html.index('"', start)]
+
+    def test_versioned_url_is_immutable(self, web_app):
+        client, nb, kernel = web_app
+        url = self._asset_url(client, "api.js")
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert "immutable" in resp.headers["Cache-Control"]
+        assert resp.headers["ETag"] == f'"{url.split("?v=")[1]}"'
+
+    def test_plain_url_must_revalidate(self, web_app):
+        client, nb, kernel = web_app
+        resp = client.get("/static/js/api.js")
+        assert resp.status_code == 200
+        assert resp.headers["Cache-Control"] == "no-cache"
+
+    def test_matching_etag_returns_304_without_reading(self, web_app):
+        client, nb, kernel = web_app
+        etag = client.get("/static/js/api.js").headers["ETag"]
+        with patch("flask.Flask.send_static_file", side_effect=AssertionError("file read")):
+            resp = client.get("/static/js/api.js", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["ETag"] == etag
+
+
+class TestServe:
+    """_serve picks waitress when it is installed."""
+
+    def test_falls_back_to_threaded_dev_server(self):
+        from notebook_lr.web import _serve
+        app = MagicMock()
+        with patch.dict("sys.modules", {"waitress": None}):
+            _serve(app, host="127.0.0.1", port=1234)
+        app.run.assert_called_once_with(host="127.0.0.1", port=1234, debug=False, threaded=True)
+
+    def test_uses_waitress_when_installed(self):
+        from notebook_lr.web import _serve
+        app = MagicMock()
+        waitress = MagicMock()
+        with patch.dict("sys.modules", {"waitress": waitress}):
+            _serve(app, host="127.0.0.1", port=1234)
+        app.run.assert_not_called()
+        waitress.serve.assert_called_once()
+        assert waitress.serve.call_args.kwargs["threads"] == 8
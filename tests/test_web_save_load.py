@@ -110,6 +110,15 @@ class TestApiLoad:
         assert result["cells"][0]["execution_count"] == 5
 
 
+    def test_load_parses_upload_without_temp_file(self, web_app):
+        client, nb, kernel = web_app
+        data = {"file": (io.BytesIO(_make_nblr_bytes(name="Direct")), "direct.nblr")}
+        with patch("tempfile.NamedTemporaryFile", side_effect=AssertionError("temp file")):
+            resp = client.post("/api/load", data=data, content_type="multipart/form-data")
+        assert resp.status_code == 200
+        assert resp.get_json()["metadata"]["name"] == "Direct"
+
+
 class TestSaveLoadRoundtrip:
     def test_roundtrip_preserves_source(self, web_app, tmp_path):
         client, nb, kernel = web_app